@@ -1,8 +1,9 @@
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from fastapi import HTTPException, status
+from fastapi import Header, HTTPException, status
 from pydantic import BaseModel
+import hmac
 import os
 
 # JWT 설정
@@ -43,3 +44,17 @@ def verify_token(token: str) -> TokenData:
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+def require_gateway_admin(x_gateway_admin_token: Optional[str] = Header(default=None)) -> None:
+    """게이트웨이 운영 엔드포인트 보호 (X-Gateway-Admin-Token == GATEWAY_ADMIN_TOKEN, 미설정 시 비활성화)"""
+    expected = os.getenv("GATEWAY_ADMIN_TOKEN")
+    if not expected:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Gateway admin endpoints are disabled (GATEWAY_ADMIN_TOKEN not set)",
+        )
+    if not x_gateway_admin_token or not hmac.compare_digest(x_gateway_admin_token, expected):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid gateway admin token",
+        )
@@ -0,0 +1,297 @@
+"""
+업스트림 장애 격리 (서킷 브레이커 / 재시도 예산 / 라우트별 타임아웃 / 헤지 요청)
+- 서킷 브레이커: 업스트림별 최근 window_sec 동안의 결과로 판단
+  · closed → open: 요청 수 min_requests 이상이고 오류율(연결 오류/타임아웃/502·503·504) 또는
+    느린 호출 비율이 임계값 이상
+  · 느린 호출: 라우팅 테이블 slow_ms 정책이 있는 라우트만 (응답 헤더까지 slow_ms 초과), 기본은 집계 안 함
+    (LLM 초안 생성처럼 원래 오래 걸리는 라우트가 같은 업스트림의 다른 라우트까지 차단하지 않도록)
+  · open: open_sec 동안 즉시 503 (업스트림 호출 없이 게이트웨이 연결 반환)
+  · half_open: 프로브 half_open_probes 개만 통과, 모두 성공하면 closed, 하나라도 실패하면 다시 open
+- 재시도 예산: 멱등 요청(본문 없는 GET/HEAD/OPTIONS/PUT/DELETE)만 재시도하며
+  최근 window_sec 재시도 수 ≤ max(최소 예산, 요청 수 × ratio) → 장애 시 재시도가 부하를 키우지 않음
+- 라우트별 타임아웃: 게이트웨이 경로 prefix → 초 (없으면 UPSTREAM_TIMEOUT), 라우팅 테이블의 timeout 정책
+- 헤지 요청: 지정 GET 라우트는 hedge_delay_ms 안에 응답이 없으면 같은 요청을 한 번 더 보내 먼저 온 응답 사용
+  (헤지도 재시도 예산 사용, 응답을 버퍼링하는 캐시/합치기 경로의 GET 에만 적용), 라우팅 테이블의 hedge 정책
+"""
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger("gateway.resilience")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+RETRYABLE_STATUS = (502, 503, 504)
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+
+class CircuitOpenError(Exception):
+    """브레이커가 열려 업스트림 호출을 하지 않음"""
+
+    def __init__(self, upstream: str, retry_after: float):
+        super().__init__(f"circuit open: {upstream}")
+        self.upstream = upstream
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        *,
+        window_sec: float = 10.0,
+        min_requests: int = 20,
+        error_rate: float = 0.5,
+        slow_rate: float = 0.8,
+        open_sec: float = 15.0,
+        half_open_probes: int = 3,
+    ):
+        self.name = name
+        self.window_sec = window_sec
+        self.min_requests = min_requests
+        self.error_rate = error_rate
+        self.slow_rate = slow_rate
+        self.open_sec = open_sec
+        self.half_open_probes = half_open_probes
+        self.state = CLOSED
+        self._opened_at = 0.0
+        self._half_opened_at = 0.0
+        self._probes_started = 0
+        self._probes_ok = 0
+        self._window: Deque[Tuple[float, bool, bool]] = deque()
+        self.transitions: Dict[str, int] = {OPEN: 0, HALF_OPEN: 0, CLOSED: 0}
+        self.rejected = 0
+
+    def _trim(self, now: float) -> None:
+        while self._window and self._window[0][0] < now - self.window_sec:
+            self._window.popleft()
+
+    def _set(self, state: str, now: float) -> None:
+        if state == self.state:
+            return
+        logger.warning(f"🔌 서킷 브레이커 {self.name}: {self.state} → {state}")
+        self.state = state
+        self.transitions[state] += 1
+        if state == OPEN:
+            self._opened_at = now
+        if state == HALF_OPEN:
+            self._half_opened_at = now
+            self._probes_started = 0
+            self._probes_ok = 0
+        if state == CLOSED:
+            self._window.clear()
+
+    def retry_after(self, now: Optional[float] = None) -> float:
+        now = now or time.monotonic()
+        return max(0.0, self._opened_at + self.open_sec - now)
+
+    def allow(self) -> bool:
+        """요청 통과 여부 (half_open 은 프로브 수만큼만)"""
+        now = time.monotonic()
+        if self.state == OPEN:
+            if now - self._opened_at < self.open_sec:
+                self.rejected += 1
+                return False
+            self._set(HALF_OPEN, now)
+        if self.state == HALF_OPEN:
+            if self._probes_started >= self.half_open_probes:
+                # 결과가 보고되지 않은 프로브(취소 등)로 멈추지 않도록 open_sec 마다 프로브 재개
+                if now - self._half_opened_at < self.open_sec:
+                    self.rejected += 1
+                    return False
+                self._half_opened_at = now
+                self._probes_started = self._probes_ok
+            self._probes_started += 1
+        return True
+
+    def record(self, ok: bool, elapsed_ms: float, slow_ms: Optional[float] = None) -> None:
+        """호출 결과 기록 (slow_ms: 라우트의 느린 호출 기준, None 이면 느린 호출로 세지 않음)"""
+        now = time.monotonic()
+        slow = slow_ms is not None and elapsed_ms > slow_ms
+        if self.state == HALF_OPEN:
+            if not ok or slow:
+                self._set(OPEN, now)
+            else:
+                self._probes_ok += 1
+                if self._probes_ok >= self.half_open_probes:
+                    self._set(CLOSED, now)
+            return
+        if self.state == OPEN:
+            return
+        self._window.append((now, ok, slow))
+        self._trim(now)
+        total = len(self._window)
+        if total < self.min_requests:
+            return
+        errors = sum(1 for _, o, _ in self._window if not o)
+        slows = sum(1 for _, _, s in self._window if s)
+        if errors / total >= self.error_rate or slows / total >= self.slow_rate:
+            self._set(OPEN, now)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        self._trim(now)
+        total = len(self._window)
+        errors = sum(1 for _, o, _ in self._window if not o)
+        slows = sum(1 for _, _, s in self._window if s)
+        return {
+            "state": self.state,
+            "window_requests": total,
+            "window_error_rate": round(errors / total, 3) if total else 0.0,
+            "window_slow_rate": round(slows / total, 3) if total else 0.0,
+            "retry_after_sec": round(self.retry_after(now), 1) if self.state == OPEN else 0.0,
+            "rejected": self.rejected,
+            "transitions": dict(self.transitions),
+        }
+
+
+class RetryBudget:
+    def __init__(self, *, window_sec: float = 10.0, ratio: float = 0.2, min_per_sec: float = 1.0):
+        self.window_sec = window_sec
+        self.ratio = ratio
+        self.min_retries = min_per_sec * window_sec
+        self._requests: Deque[float] = deque()
+        self._retries: Deque[float] = deque()
+        self.granted = 0
+        self.denied = 0
+
+    def _trim(self, now: float) -> None:
+        for q in (self._requests, self._retries):
+            while q and q[0] < now - self.window_sec:
+                q.popleft()
+
+    def record_request(self) -> None:
+        self._requests.append(time.monotonic())
+
+    def try_acquire(self) -> bool:
+        """재시도/헤지 1회 허용 여부 (허용 시 예산 차감)"""
+        now = time.monotonic()
+        self._trim(now)
+        if len(self._retries) < max(self.min_retries, len(self._requests) * self.ratio):
+            self._retries.append(now)
+            self.granted += 1
+            return True
+        self.denied += 1
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        self._trim(time.monotonic())
+        return {
+            "window_requests": len(self._requests),
+            "window_retries": len(self._retries),
+            "granted": self.granted,
+            "denied": self.denied,
+        }
+
+
+class Resilience:
+    def __init__(
+        self,
+        *,
+        default_timeout: float,
+        hedge_delay_ms: float,
+        max_retries: int,
+        breaker_options: Dict[str, Any],
+        budget_options: Dict[str, Any],
+    ):
+        self.default_timeout = default_timeout
+        self.hedge_delay = hedge_delay_ms / 1000
+        self.max_retries = max_retries
+        self.breaker_options = breaker_options
+        self.budget_options = budget_options
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._budgets: Dict[str, RetryBudget] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    # ---------- 정책 ----------
+    @staticmethod
+    def retryable(method: str, has_body: bool) -> bool:
+        return method.upper() in IDEMPOTENT_METHODS and not has_body
+
+    # ---------- 업스트림별 상태 ----------
+    def breaker(self, upstream: str) -> CircuitBreaker:
+        breaker = self._breakers.get(upstream)
+        if breaker is None:
+            breaker = self._breakers[upstream] = CircuitBreaker(upstream, **self.breaker_options)
+        return breaker
+
+    def budget(self, upstream: str) -> RetryBudget:
+        budget = self._budgets.get(upstream)
+        if budget is None:
+            budget = self._budgets[upstream] = RetryBudget(**self.budget_options)
+        return budget
+
+    def count(self, upstream: str, name: str) -> None:
+        counters = self._counters.setdefault(upstream, {"retries": 0, "hedges": 0, "hedge_wins": 0, "timeouts": 0})
+        counters[name] = counters.get(name, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        upstreams = {}
+        for name in sorted(set(self._breakers) | set(self._budgets) | set(self._counters)):
+            upstreams[name] = {
+                "breaker": self.breaker(name).stats(),
+                "retry_budget": self.budget(name).stats(),
+                **self._counters.get(name, {"retries": 0, "hedges": 0, "hedge_wins": 0, "timeouts": 0}),
+            }
+        return {
+            "default_timeout_sec": self.default_timeout,
+            "hedge_delay_ms": round(self.hedge_delay * 1000),
+            "max_retries": self.max_retries,
+            "upstreams": upstreams,
+        }
+
+
+def load_route_timeouts() -> Dict[str, float]:
+    """GATEWAY_ROUTE_TIMEOUTS (JSON: prefix → 초), 라우팅 테이블 기본 정책"""
+    raw = os.getenv("GATEWAY_ROUTE_TIMEOUTS")
+    if not raw:
+        return {}
+    try:
+        return {prefix: float(sec) for prefix, sec in json.loads(raw).items()}
+    except (ValueError, AttributeError) as e:
+        logger.warning(f"⚠️ GATEWAY_ROUTE_TIMEOUTS 파싱 실패, 라우트별 타임아웃 미사용: {e}")
+        return {}
+
+
+def load_hedge_routes() -> List[str]:
+    """
+    GATEWAY_HEDGE_ROUTES (쉼표 구분), 라우팅 테이블 기본 정책
+    - 끝에 $ 를 붙이면 그 경로만 (하위 경로 제외): /api/report/indicators/{id}/fields 같은 LLM 조회는 헤지하지 않음
+    """
+    raw = os.getenv(
+        "GATEWAY_HEDGE_ROUTES", "/api/assessment/kesg,/api/report/indicators$,/api/report/indicators/category"
+    )
+    return [v.strip() for v in raw.split(",") if v.strip()]
+
+
+_resilience: Optional[Resilience] = None
+
+
+def get_resilience() -> Resilience:
+    """프로세스 공유 인스턴스 (BREAKER_* / RETRY_* / GATEWAY_HEDGE_* 환경 변수로 설정)"""
+    global _resilience
+    if _resilience is None:
+        _resilience = Resilience(
+            default_timeout=float(os.getenv("UPSTREAM_TIMEOUT", "60")),
+            hedge_delay_ms=float(os.getenv("GATEWAY_HEDGE_DELAY_MS", "300")),
+            max_retries=int(os.getenv("UPSTREAM_MAX_RETRIES", "2")),
+            breaker_options={
+                "window_sec": float(os.getenv("BREAKER_WINDOW_SEC", "10")),
+                "min_requests": int(os.getenv("BREAKER_MIN_REQUESTS", "20")),
+                "error_rate": float(os.getenv("BREAKER_ERROR_RATE", "0.5")),
+                "slow_rate": float(os.getenv("BREAKER_SLOW_RATE", "0.8")),
+                "open_sec": float(os.getenv("BREAKER_OPEN_SEC", "15")),
+                "half_open_probes": int(os.getenv("BREAKER_HALF_OPEN_PROBES", "3")),
+            },
+            budget_options={
+                "window_sec": float(os.getenv("BREAKER_WINDOW_SEC", "10")),
+                "ratio": float(os.getenv("RETRY_BUDGET_RATIO", "0.2")),
+                "min_per_sec": float(os.getenv("RETRY_BUDGET_MIN_PER_SEC", "1")),
+            },
+        )
+    return _resilience
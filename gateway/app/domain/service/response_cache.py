@@ -0,0 +1,262 @@
+"""
+게이트웨이 GET 응답 캐시 (자주 조회되고 드물게 바뀌는 참조 데이터용)
+- 대상 라우트는 게이트웨이 경로 prefix 단위로 지정, 라우트별 TTL / 키에 포함할 헤더(vary)
+  (라우트 매칭은 라우팅 테이블이 담당, 캐시는 테이블이 넘겨준 규칙으로 통계/무효화 범위를 관리)
+- 키: 경로 + 정렬된 쿼리 + vary 헤더 값 (+ accept-encoding: 업스트림 바이트를 그대로 저장하므로)
+  기본 vary 는 합치기와 같은 인증 범위(authorization / cookie / x-company-name),
+  vary 에 없는 인증 헤더가 붙은 요청은 캐시를 거치지 않음 (다른 사용자에게 응답이 새지 않게)
+- 메모리 상한(바이트) LRU, 항목 크기 상한 초과 응답은 저장하지 않음
+- 업스트림 Cache-Control 준수: no-store / private 는 저장 안 함, max-age 가 TTL 보다 짧으면 max-age,
+  no-cache 는 업스트림 ETag 가 있을 때만 저장하고 매 요청 조건부 재검증
+- ETag: 업스트림 값(없으면 본문 해시로 약한 ETag 생성), If-None-Match 일치 시 304
+  만료된 항목은 업스트림 ETag 로 조건부 요청 → 304 면 본문 재사용 (revalidated)
+- 같은 prefix 로 쓰기 요청(POST/PUT/PATCH/DELETE)이 지나가면 해당 prefix 항목 무효화
+"""
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+
+from app.domain.service.single_flight import CREDENTIAL_HEADERS
+
+logger = logging.getLogger("gateway.response_cache")
+
+DEFAULT_VARY = CREDENTIAL_HEADERS
+
+# 게이트웨이 경로 기준 기본 캐시 라우트 (GATEWAY_CACHE_ROUTES 로 교체 가능, 라우팅 테이블 기본 정책)
+DEFAULT_ROUTES = (
+    {"prefix": "/api/assessment/kesg", "ttl": 300},
+    {"prefix": "/api/report/indicators", "ttl": 60},
+    {"prefix": "/api/monitoring/companies", "ttl": 60},
+    {"prefix": "/api/monitoring/assessment/companies", "ttl": 60},
+)
+
+_MAX_AGE = re.compile(r"(?:s-maxage|max-age)\s*=\s*(\d+)")
+
+
+@dataclass(frozen=True)
+class CacheRule:
+    prefix: str
+    ttl: float
+    vary: Tuple[str, ...] = DEFAULT_VARY
+
+    def matches(self, path: str) -> bool:
+        return path == self.prefix or path.startswith(self.prefix.rstrip("/") + "/")
+
+    def covers_credentials(self, headers) -> bool:
+        """요청의 인증 헤더가 모두 vary 에 포함되는지 (아니면 캐시 키가 사용자를 구분하지 못함)"""
+        return all(h in self.vary or not headers.get(h) for h in CREDENTIAL_HEADERS)
+
+
+@dataclass
+class CacheEntry:
+    status: int
+    headers: List[Tuple[str, str]]
+    body: bytes
+    etag: str
+    upstream_etag: Optional[str]
+    stored_at: float
+    expires_at: float
+    prefix: str
+    size: int = field(init=False)
+
+    def __post_init__(self):
+        self.size = len(self.body) + sum(len(k) + len(v) for k, v in self.headers) + 128
+
+    def fresh(self, now: Optional[float] = None) -> bool:
+        return (now or time.time()) < self.expires_at
+
+    def age(self) -> int:
+        return max(0, int(time.time() - self.stored_at))
+
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    """If-None-Match 비교 (약한 비교, 목록/* 지원)"""
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    wanted = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == wanted:
+            return True
+    return False
+
+
+def storable_ttl(rule: CacheRule, status: int, headers: Dict[str, str]) -> Optional[float]:
+    """업스트림 응답을 저장할 TTL (None: 저장 안 함, 0: 저장하되 매번 재검증)"""
+    if status != 200 or "set-cookie" in headers:
+        return None
+    cache_control = headers.get("cache-control", "").lower()
+    if "no-store" in cache_control or "private" in cache_control:
+        return None
+    if "no-cache" in cache_control:
+        return 0.0 if headers.get("etag") else None
+    ttl = rule.ttl
+    m = _MAX_AGE.search(cache_control)
+    if m:
+        ttl = min(ttl, float(m.group(1)))
+    return ttl
+
+
+class ResponseCache:
+    def __init__(self, rules: Sequence[CacheRule], max_bytes: int, max_entry_bytes: int):
+        self.rules: List[CacheRule] = list(rules)
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._route_stats: Dict[str, Dict[str, int]] = {}
+        self.evictions = 0
+
+    # ---------- 라우트 / 키 ----------
+    def set_rules(self, rules: Sequence[CacheRule]) -> None:
+        """라우팅 테이블 (재)적재 시 규칙 교체 (빠지거나 TTL/vary 가 바뀐 라우트 항목은 삭제)"""
+        kept = {rule.prefix: rule for rule in rules}
+        for rule in self.rules:
+            if kept.get(rule.prefix) != rule:
+                self.invalidate(rule.prefix)
+        self.rules = sorted(rules, key=lambda r: r.prefix)
+        logger.info(f"🗃️ 응답 캐시 라우트: {', '.join(f'{r.prefix}({r.ttl:g}s)' for r in self.rules) or '없음'}")
+
+    def write_prefixes(self, path: str) -> List[str]:
+        """쓰기 요청 경로가 영향을 주는 캐시 라우트 (라우트 하위 경로 또는 상위 경로)"""
+        return [
+            rule.prefix for rule in self.rules
+            if rule.matches(path) or rule.prefix.startswith(path.rstrip("/") + "/")
+        ]
+
+    @staticmethod
+    def key(rule: CacheRule, path: str, query_items: Sequence[Tuple[str, str]], headers) -> str:
+        parts = {
+            "path": path,
+            "query": sorted(query_items),
+            "vary": [headers.get(h, "") for h in rule.vary],
+            "encoding": headers.get("accept-encoding", ""),
+        }
+        return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    # ---------- 조회 / 저장 ----------
+    def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def store(
+        self,
+        key: str,
+        rule: CacheRule,
+        status: int,
+        headers: List[Tuple[str, str]],
+        body: bytes,
+        upstream_etag: Optional[str],
+        ttl: float,
+    ) -> Optional[CacheEntry]:
+        etag = upstream_etag or 'W/"%s"' % hashlib.sha256(body).hexdigest()[:20]
+        now = time.time()
+        entry = CacheEntry(
+            status=status,
+            headers=headers,
+            body=body,
+            etag=etag,
+            upstream_etag=upstream_etag,
+            stored_at=now,
+            expires_at=now + ttl,
+            prefix=rule.prefix,
+        )
+        if entry.size > self.max_entry_bytes:
+            self.record(rule, "too_large")
+            return None
+        self._remove(key)
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while self._bytes > self.max_bytes and self._entries:
+            oldest, _ = next(iter(self._entries.items()))
+            self._remove(oldest)
+            self.evictions += 1
+        self.record(rule, "stores")
+        return entry
+
+    def refresh(self, entry: CacheEntry, ttl: float) -> None:
+        """업스트림 304 재검증 성공: 본문 유지, 만료 시각만 연장"""
+        entry.stored_at = time.time()
+        entry.expires_at = entry.stored_at + ttl
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def invalidate(self, prefix: Optional[str] = None) -> int:
+        """prefix 항목 삭제 (None 이면 전체)"""
+        keys = [k for k, e in self._entries.items() if prefix is None or e.prefix == prefix]
+        for k in keys:
+            self._remove(k)
+        return len(keys)
+
+    # ---------- 통계 ----------
+    def record(self, rule: CacheRule, event: str) -> None:
+        stat = self._route_stats.setdefault(rule.prefix, {})
+        stat[event] = stat.get(event, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        routes = {}
+        for rule in self.rules:
+            stat = dict(self._route_stats.get(rule.prefix, {}))
+            hits = stat.get("hits", 0) + stat.get("revalidated", 0)
+            lookups = hits + stat.get("misses", 0)
+            routes[rule.prefix] = {
+                "ttl": rule.ttl,
+                **stat,
+                "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+            }
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+            "routes": routes,
+        }
+
+
+def load_rules() -> List[CacheRule]:
+    """GATEWAY_CACHE_ROUTES (JSON 목록) 또는 기본 라우트"""
+    raw = os.getenv("GATEWAY_CACHE_ROUTES")
+    routes = DEFAULT_ROUTES
+    if raw:
+        try:
+            routes = json.loads(raw)
+        except ValueError as e:
+            logger.warning(f"⚠️ GATEWAY_CACHE_ROUTES 파싱 실패, 기본 라우트 사용: {e}")
+    rules = []
+    for r in routes:
+        vary = tuple(h.lower() for h in r.get("vary", DEFAULT_VARY))
+        rules.append(CacheRule(prefix=r["prefix"], ttl=float(r.get("ttl", 60)), vary=vary))
+    return rules
+
+
+_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """프로세스 공유 캐시 (GATEWAY_CACHE=0 이면 None)"""
+    global _cache
+    if os.getenv("GATEWAY_CACHE", "1") != "1":
+        return None
+    if _cache is None:
+        # 대상 라우트는 라우팅 테이블 적재 시 set_rules 로 지정
+        _cache = ResponseCache(
+            [],
+            max_bytes=int(os.getenv("GATEWAY_CACHE_MAX_BYTES", str(32 * 1024 * 1024))),
+            max_entry_bytes=int(os.getenv("GATEWAY_CACHE_MAX_ENTRY_BYTES", str(1024 * 1024))),
+        )
+    return _cache
@@ -0,0 +1,297 @@
+"""
+선언형 업스트림 라우팅 테이블
+- 게이트웨이 경로 prefix → 업스트림 / 경로 재작성 / 타임아웃 / 캐시 / 합치기 / 헤지 / 스트리밍 /
+  느린 호출 기준(slow_ms, 서킷 브레이커용, 기본 없음) 정책을 한 곳에서 정의
+- 시작 시 경로 세그먼트 단위 prefix 트라이로 컴파일 → 요청마다 경로 길이에 비례하는 조회 1회 (가장 긴 prefix 우선)
+- 정책은 상위 prefix 값을 하위 prefix 가 덮어씀 (예: /api/assessment 의 타임아웃 + /api/assessment/kesg 의 캐시)
+  단 hedge: "exact" 는 prefix 경로 자체에만 적용 (하위 경로는 상위 prefix 의 hedge 값)
+- 경로 재작성: rewrite 가 게이트웨이 prefix 를 대체 (/api/assessment/x → /assessment/x),
+  prefix 자체 요청(/api/assessment)은 root=true 면 rewrite 경로로 전달, false 면 404
+- 업스트림 URL: upstreams 기본값을 {NAME}_SERVICE_URL 환경 변수가 덮어씀
+- GATEWAY_ROUTES_FILE(JSON: {"upstreams": {...}, "routes": [...]})을 기본 테이블에 병합 (같은 prefix 는 항목 단위로 덮어씀)
+  → 서비스 추가는 설정만으로 가능, POST /gateway/routes/reload 로 재시작 없이 다시 읽음 (실패 시 기존 테이블 유지)
+- 기존 환경 변수(GATEWAY_CACHE_ROUTES / GATEWAY_COALESCE_ROUTES / GATEWAY_ROUTE_TIMEOUTS / GATEWAY_HEDGE_ROUTES)는
+  기본 정책으로 계속 반영
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import json
+import logging
+import os
+import time
+
+from app.domain.service.response_cache import CacheRule, DEFAULT_VARY, load_rules as load_cache_rules
+from app.domain.service.single_flight import load_routes as load_coalesce_routes
+from app.domain.service.resilience import load_route_timeouts, load_hedge_routes
+
+logger = logging.getLogger("gateway.route_table")
+
+# 업스트림 이름 → 기본 base URL ({NAME}_SERVICE_URL 환경 변수가 우선)
+DEFAULT_UPSTREAMS = {
+    "account": "http://localhost:8001",
+    "assessment": "http://localhost:8002",
+    "chatbot": "http://localhost:8003",
+    "monitoring": "http://localhost:8004",
+    "normal": "http://localhost:8005",
+    "report": "http://localhost:8007",
+    "sharing": "http://localhost:8008",
+    "solution": "http://localhost:8009",
+}
+
+DEFAULT_ROUTES = (
+    {"prefix": "/api/account", "upstream": "account", "rewrite": "/", "root": False},
+    {"prefix": "/api/assessment", "upstream": "assessment", "rewrite": "/assessment"},
+    {"prefix": "/api/chatbot", "upstream": "chatbot", "rewrite": "/"},
+    {"prefix": "/api/report", "upstream": "report", "rewrite": "/"},
+    {"prefix": "/api/solution", "upstream": "solution", "rewrite": "/solution", "root": False},
+    {"prefix": "/api/monitoring", "upstream": "monitoring", "rewrite": "/monitoring"},
+    {"prefix": "/sharing", "upstream": "sharing", "rewrite": "/sharing"},
+    # normal-service 는 /api/normal 경로 그대로 받음
+    {"prefix": "/api/normal", "upstream": "normal", "rewrite": "/api/normal"},
+)
+
+POLICY_KEYS = ("timeout", "cache", "coalesce", "hedge", "streaming", "slow_ms")
+
+
+@dataclass(frozen=True)
+class Route:
+    prefix: str
+    upstream: str
+    base_url: str
+    rewrite: str
+    root: bool = True
+
+
+@dataclass
+class RouteMatch:
+    route: Route
+    upstream_path: str
+    timeout: Optional[float]  # None: UPSTREAM_TIMEOUT
+    cache: Optional[CacheRule]
+    coalesce: Optional[str]  # 합치기 정책을 지정한 prefix (통계 라벨)
+    hedge: bool
+    streaming: Optional[bool]  # None: GATEWAY_STREAMING
+    slow_ms: Optional[float] = None  # None: 브레이커가 느린 호출로 세지 않음
+
+    @property
+    def url(self) -> str:
+        return self.route.base_url.rstrip("/") + "/" + self.upstream_path.lstrip("/")
+
+
+class _Node:
+    __slots__ = ("children", "route", "policy", "effective", "covering")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.route: Optional[Route] = None
+        self.policy: Dict[str, Any] = {}  # 이 prefix 에 지정한 정책
+        self.effective: Dict[str, Any] = {}  # 상위 prefix 정책을 누적한 값 (컴파일 시 계산)
+        self.covering: Optional[Route] = None  # 이 노드를 덮는 가장 긴 라우트 (컴파일 시 계산)
+
+
+def _inherit(node: _Node, parent: Dict[str, Any], covering: Optional[Route]) -> None:
+    node.effective = {**parent, **node.policy}
+    node.covering = node.route or covering
+    inherited = node.effective
+    if node.policy.get("hedge") == "exact":
+        inherited = {**node.effective, "hedge": parent.get("hedge", False)}
+    for child in node.children.values():
+        _inherit(child, inherited, node.covering)
+
+
+def normalize_prefix(prefix: str) -> str:
+    if not isinstance(prefix, str) or not prefix.startswith("/"):
+        raise ValueError(f"prefix 는 '/' 로 시작해야 함: {prefix!r}")
+    return "/" + prefix.strip("/")
+
+
+def _segments(prefix: str) -> List[str]:
+    return [s for s in prefix.split("/") if s]
+
+
+def _compile_policy(prefix: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+    """항목의 정책 필드 → 트라이 노드 값 (지정한 필드만, false 는 상위 정책 해제)"""
+    policy: Dict[str, Any] = {}
+    if entry.get("timeout") is not None:
+        policy["timeout"] = float(entry["timeout"])
+    if "cache" in entry:
+        cache = entry["cache"]
+        policy["cache"] = CacheRule(
+            prefix=prefix,
+            ttl=float(cache.get("ttl", 60)),
+            vary=tuple(h.lower() for h in cache.get("vary", DEFAULT_VARY)),
+        ) if cache else None
+    if "coalesce" in entry:
+        policy["coalesce"] = prefix if entry["coalesce"] else None
+    if "hedge" in entry:
+        policy["hedge"] = "exact" if entry["hedge"] == "exact" else bool(entry["hedge"])
+    if entry.get("streaming") is not None:
+        policy["streaming"] = bool(entry["streaming"])
+    if "slow_ms" in entry:
+        policy["slow_ms"] = float(entry["slow_ms"]) if entry["slow_ms"] else None
+    return policy
+
+
+def compile_routes(upstreams: Dict[str, str], entries: Iterable[Dict[str, Any]]) -> Tuple[_Node, List[Route]]:
+    """라우트 항목 → prefix 트라이 (잘못된 항목은 ValueError)"""
+    root = _Node()
+    routes: List[Route] = []
+    for entry in entries:
+        prefix = normalize_prefix(entry["prefix"])
+        node = root
+        for segment in _segments(prefix):
+            node = node.children.setdefault(segment, _Node())
+        if entry.get("upstream"):
+            name = entry["upstream"]
+            if name not in upstreams:
+                raise ValueError(f"알 수 없는 업스트림: {name} ({prefix})")
+            node.route = Route(
+                prefix=prefix,
+                upstream=name,
+                base_url=upstreams[name],
+                rewrite=entry.get("rewrite", prefix),
+                root=bool(entry.get("root", True)),
+            )
+            routes.append(node.route)
+        node.policy.update(_compile_policy(prefix, entry))
+    _inherit(root, {}, None)
+    return root, routes
+
+
+def _legacy_entries() -> List[Dict[str, Any]]:
+    """기존 라우트별 환경 변수 → 정책 항목"""
+    entries: List[Dict[str, Any]] = []
+    for rule in load_cache_rules():
+        entries.append({"prefix": rule.prefix, "cache": {"ttl": rule.ttl, "vary": list(rule.vary)}})
+    entries += [{"prefix": prefix, "coalesce": True} for prefix in load_coalesce_routes()]
+    entries += [{"prefix": prefix, "timeout": sec} for prefix, sec in load_route_timeouts().items()]
+    entries += [
+        {"prefix": prefix.rstrip("$"), "hedge": "exact" if prefix.endswith("$") else True}
+        for prefix in load_hedge_routes()
+    ]
+    return entries
+
+
+def _merge(*sources: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """같은 prefix 항목은 필드 단위로 병합 (뒤 소스 우선)"""
+    merged: Dict[str, Dict[str, Any]] = {}
+    for source in sources:
+        for entry in source:
+            prefix = normalize_prefix(entry.get("prefix", ""))
+            merged.setdefault(prefix, {"prefix": prefix}).update({**entry, "prefix": prefix})
+    return list(merged.values())
+
+
+def _service_url(name: str, default: str) -> str:
+    return os.getenv(f"{name.upper().replace('-', '_')}_SERVICE_URL", default)
+
+
+class RouteTable:
+    def __init__(self, routes_file: Optional[str] = None):
+        self.routes_file = routes_file
+        self.upstreams: Dict[str, str] = {}
+        self.routes: List[Route] = []
+        self.entries: List[Dict[str, Any]] = []
+        self.loaded_at: Optional[float] = None
+        self.reloads = 0
+        self._root = _Node()
+
+    def _read_file(self) -> Dict[str, Any]:
+        if not self.routes_file:
+            return {}
+        with open(self.routes_file, encoding="utf-8") as f:
+            config = json.load(f)
+        if not isinstance(config, dict):
+            raise ValueError(f"라우트 설정은 JSON 객체여야 함: {self.routes_file}")
+        return config
+
+    def load(self) -> "RouteTable":
+        """기본 테이블 + 환경 변수 정책 + 설정 파일을 컴파일해 교체 (실패 시 예외, 기존 테이블 유지)"""
+        config = self._read_file()
+        defaults = {**DEFAULT_UPSTREAMS, **config.get("upstreams", {})}
+        upstreams = {name: _service_url(name, url) for name, url in defaults.items()}
+        entries = _merge(DEFAULT_ROUTES, _legacy_entries(), config.get("routes", []))
+        root, routes = compile_routes(upstreams, entries)
+        # 요청 처리 중에도 참조 교체 한 번으로 전환 (이벤트 루프 단일 스레드)
+        self._root, self.routes, self.upstreams, self.entries = root, routes, upstreams, entries
+        self.loaded_at = time.time()
+        for route in routes:
+            logger.info(f"🧭 라우트: {route.prefix} -> {route.upstream} {route.base_url.rstrip('/')}{route.rewrite}")
+        return self
+
+    def reload(self) -> "RouteTable":
+        self.load()
+        self.reloads += 1
+        logger.info(f"🔄 라우트 테이블 재적재: 라우트 {len(self.routes)}개 ({self.routes_file or '기본 테이블'})")
+        return self
+
+    def match(self, path: str) -> Optional[RouteMatch]:
+        """가장 깊이 일치한 노드의 라우트 + 누적 정책 (세그먼트 수만큼 dict 조회, 둘 다 컴파일 시 계산)"""
+        node = self._root
+        exact = True
+        for segment in path.split("/")[1:]:
+            child = node.children.get(segment)
+            if child is None:
+                exact = False
+                break
+            node = child
+        found = node.covering
+        if found is None:
+            return None
+        rest = path[len(found.prefix.rstrip("/")):]
+        if not rest:
+            if not found.root:
+                return None
+            upstream_path = found.rewrite
+        else:
+            upstream_path = found.rewrite.rstrip("/") + rest
+        policy = node.effective
+        return RouteMatch(
+            route=found,
+            upstream_path=upstream_path,
+            timeout=policy.get("timeout"),
+            cache=policy.get("cache"),
+            coalesce=policy.get("coalesce"),
+            hedge=policy.get("hedge") is True or (policy.get("hedge") == "exact" and exact),
+            streaming=policy.get("streaming"),
+            slow_ms=policy.get("slow_ms"),
+        )
+
+    def cache_rules(self) -> List[CacheRule]:
+        return self._policy_values("cache")
+
+    def coalesce_routes(self) -> List[str]:
+        return self._policy_values("coalesce")
+
+    def _policy_values(self, key: str) -> List[Any]:
+        values = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node.policy.get(key):
+                values.append(node.policy[key])
+            stack.extend(node.children.values())
+        return values
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "routes_file": self.routes_file,
+            "loaded_at": self.loaded_at,
+            "reloads": self.reloads,
+            "upstreams": self.upstreams,
+            "routes": [
+                {k: v for k, v in entry.items() if k in ("prefix", "upstream", "rewrite", "root") + POLICY_KEYS}
+                for entry in self.entries
+            ],
+        }
+
+
+_table: Optional[RouteTable] = None
+
+
+def get_route_table() -> RouteTable:
+    """프로세스 공유 테이블 (GATEWAY_ROUTES_FILE 로 설정 파일 지정)"""
+    global _table
+    if _table is None:
+        _table = RouteTable(os.getenv("GATEWAY_ROUTES_FILE") or None).load()
+    return _table
@@ -0,0 +1,113 @@
+"""
+동일 GET 요청 합치기 (single-flight)
+- 업스트림 URL + 쿼리 + 인증 범위(authorization / cookie / x-company-name) + accept / accept-encoding 이
+  같은 GET 이 진행 중이면 업스트림을 다시 호출하지 않고 첫 호출의 응답(상태/헤더/본문)을 함께 받음
+  (대시보드 로딩 시 여러 브라우저가 같은 무거운 라우트를 동시에 호출하는 경우 업스트림 호출 1회)
+- 첫 호출을 별도 Task로 실행하고 모두 shield로 대기 → 첫 요청 클라이언트가 끊겨도 나머지는 응답을 받음
+- 진행 중인 호출만 합치며 캐시가 아님 (완료 즉시 키 제거)
+- 대상 라우트는 게이트웨이 경로 prefix 로 지정 (응답을 버퍼링하므로 SSE/대용량 다운로드 라우트는 제외)
+  라우트 매칭은 라우팅 테이블의 coalesce 정책이 담당
+"""
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+import asyncio
+import hashlib
+import json
+import logging
+import os
+
+logger = logging.getLogger("gateway.single_flight")
+
+# 인증 범위 헤더 (응답 캐시 기본 vary 와 공유 → 캐시/합치기가 같은 사용자 범위에서만 응답 공유)
+CREDENTIAL_HEADERS = ("authorization", "cookie", "x-company-name")
+
+SCOPE_HEADERS = (
+    *CREDENTIAL_HEADERS,
+    "accept", "accept-encoding",
+    "if-none-match", "if-modified-since",  # 조건부 요청은 같은 검증값끼리만 (304 공유)
+)
+
+# 게이트웨이 경로 기준 기본 대상 (GATEWAY_COALESCE_ROUTES 로 교체 가능, 쉼표 구분, 라우팅 테이블 기본 정책)
+DEFAULT_ROUTES = ("/api/monitoring", "/api/assessment")
+
+
+def request_key(url: str, query_items: Sequence[Tuple[str, str]], headers) -> str:
+    """정규화된 요청 키 (쿼리 순서 무관, 인증 범위 헤더 포함)"""
+    parts = {
+        "url": url,
+        "query": sorted(query_items),
+        "scope": [headers.get(h, "") for h in SCOPE_HEADERS],
+    }
+    return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """키별 진행 중 호출 공유 (게이트웨이는 이벤트 루프 1개라 락 불필요)"""
+
+    def __init__(self, routes: Sequence[str], enabled: bool = True):
+        self.enabled = enabled
+        self.routes = sorted(r.rstrip("/") for r in routes if r)
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[str, int] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def set_routes(self, routes: Sequence[str]) -> None:
+        """라우팅 테이블 (재)적재 시 대상 라우트 교체 (통계 표시용, 진행 중 호출은 그대로 완료)"""
+        self.routes = sorted(r.rstrip("/") for r in routes if r)
+
+    def _count(self, route: str, name: str) -> None:
+        stat = self._stats.setdefault(route, {"leaders": 0, "followers": 0, "errors": 0, "max_waiters": 0})
+        stat[name] += 1
+
+    async def run(self, route: str, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """key로 진행 중인 호출이 있으면 그 결과를, 없으면 fn() 실행 결과를 반환 (route 는 통계 라벨)"""
+        if not self.enabled:
+            return await fn()
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(fn())
+            self._inflight[key] = task
+            self._waiters[key] = 1
+            task.add_done_callback(lambda t, k=key, r=route: self._forget(k, r, t))
+            self._count(route, "leaders")
+        else:
+            self._waiters[key] += 1
+            self._count(route, "followers")
+            logger.info(f"🔁 동일 GET 진행 중, 응답 공유 대기: {route} (대기 {self._waiters[key]})")
+        stat = self._stats[route]
+        stat["max_waiters"] = max(stat["max_waiters"], self._waiters[key])
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, route: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+            self._waiters.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            # 대기자가 모두 사라진 경우 'exception never retrieved' 경고 방지
+            self._count(route, "errors")
+
+    def stats(self) -> Dict[str, Any]:
+        routes = {}
+        for route in list(self.routes) + sorted(set(self._stats) - set(self.routes)):
+            stat = dict(self._stats.get(route, {"leaders": 0, "followers": 0, "errors": 0, "max_waiters": 0}))
+            total = stat["leaders"] + stat["followers"]
+            stat["coalesced_ratio"] = round(stat["followers"] / total, 3) if total else 0.0
+            routes[route] = stat
+        return {"enabled": self.enabled, "in_flight": len(self._inflight), "routes": routes}
+
+
+_single_flight: Optional[SingleFlight] = None
+
+
+def load_routes() -> List[str]:
+    """GATEWAY_COALESCE_ROUTES (쉼표 구분) 또는 기본 라우트"""
+    raw = os.getenv("GATEWAY_COALESCE_ROUTES")
+    routes = raw.split(",") if raw is not None else DEFAULT_ROUTES
+    return [r.strip() for r in routes if r.strip()]
+
+
+def get_single_flight() -> SingleFlight:
+    """프로세스 공유 인스턴스 (GATEWAY_COALESCE=0 이면 비활성화, 대상 라우트는 라우팅 테이블 적재 시 지정)"""
+    global _single_flight
+    if _single_flight is None:
+        _single_flight = SingleFlight([], enabled=os.getenv("GATEWAY_COALESCE", "1") == "1")
+    return _single_flight
@@ -0,0 +1,236 @@
+"""
+업스트림 HTTP 클라이언트 풀 (게이트웨이 프로세스당 1개)
+- 업스트림(서비스 base URL)마다 httpx.AsyncClient 1개를 앱 시작 시 생성해 재사용
+  → 요청마다 TCP/TLS 연결을 새로 맺지 않고 keep-alive 연결 재사용
+- https 업스트림은 h2 패키지가 있으면 HTTP/2 (연결 1개에 여러 요청 다중화)
+- 업스트림별 진행 중 요청 수 / 누적 요청·오류 / 풀 연결 상태 통계
+- 공유 클라이언트는 쿠키를 저장하지 않음 (한 사용자의 Set-Cookie 가 다른 사용자 요청에 붙지 않도록,
+  쿠키는 클라이언트 요청의 Cookie 헤더로만 전달)
+"""
+from contextlib import asynccontextmanager
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+import os
+import time
+
+import httpx
+
+logger = logging.getLogger("gateway.upstream_pool")
+
+# 업스트림으로 전달하면 안 되는 홉 단위 헤더 (HTTP/2 는 이 헤더가 있으면 프로토콜 오류)
+HOP_BY_HOP = {
+    "connection",
+    "keep-alive",
+    "proxy-connection",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailer",
+    "transfer-encoding",
+    "upgrade",
+}
+
+
+def _h2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+# 게이트웨이가 직접 붙이는 응답 헤더 (업스트림 값은 버림)
+GATEWAY_OWNED = {"server", "date"}
+
+
+def forward_headers(headers: Iterable[Tuple[str, str]]) -> Dict[str, str]:
+    """클라이언트 요청 헤더 → 업스트림 요청 헤더 (host, 홉 단위 헤더 제거)"""
+    out = {}
+    for k, v in headers:
+        lk = k.lower()
+        if lk == "host" or lk in HOP_BY_HOP:
+            continue
+        out[k] = v
+    return out
+
+
+def response_headers(headers: Iterable[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """업스트림 응답 헤더 → 클라이언트 응답 헤더 (중복 헤더(set-cookie) 유지, 홉 단위/CORS 헤더 제거)"""
+    out = []
+    for k, v in headers:
+        lk = k.lower()
+        if lk in HOP_BY_HOP or lk in GATEWAY_OWNED or lk.startswith("access-control-"):
+            continue
+        out.append((k, v))
+    return out
+
+
+class UpstreamPool:
+    def __init__(
+        self,
+        *,
+        timeout: float,
+        max_connections: int = 100,
+        max_keepalive: int = 20,
+        keepalive_expiry: float = 30.0,
+        connect_timeout: Optional[float] = None,
+        http2: bool = True,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout or timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2 and _h2_available()
+        if http2 and not self.http2:
+            logger.info("ℹ️ h2 패키지 없음: HTTP/1.1 로 동작")
+        # 테스트/점검용 전송 계층 교체 (httpx.MockTransport 등), 지정 시 모든 업스트림이 사용
+        self.transport = transport
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._names: Dict[str, str] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    @staticmethod
+    def _key(base_url: str) -> str:
+        return base_url.rstrip("/")
+
+    @staticmethod
+    def _no_cookies() -> CookieJar:
+        # allowed_domains=[] → 어떤 도메인의 쿠키도 저장하지 않음
+        return CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+
+    def _create(self, base_url: str) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            cookies=self._no_cookies(),
+            timeout=self.timeout,
+            limits=self.limits,
+            follow_redirects=True,
+            http2=self.http2 and base_url.startswith("https://"),
+            transport=self.transport,
+        )
+
+    def use_transport(self, transport: Optional[httpx.AsyncBaseTransport]) -> None:
+        """전송 계층 교체 (이미 만든 클라이언트는 다음 요청 때 새로 생성)"""
+        self.transport = transport
+        self._clients.clear()
+
+    def name_of(self, base_url: str) -> str:
+        key = self._key(base_url)
+        return self._names.get(key, key)
+
+    def start(self, upstreams: Dict[str, str]) -> None:
+        """앱 시작 시 업스트림별 클라이언트 생성 (name → base URL)"""
+        for name, base_url in upstreams.items():
+            key = self._key(base_url)
+            self._names.setdefault(key, name)
+            if key not in self._clients:
+                self._clients[key] = self._create(key)
+                logger.info(f"🔌 업스트림 풀 생성: {name} -> {key} (http2={self.http2 and key.startswith('https://')})")
+
+    async def close(self) -> None:
+        for key, client in list(self._clients.items()):
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"⚠️ 업스트림 풀 종료 실패: {key} - {e}")
+        self._clients.clear()
+
+    def client(self, base_url: str) -> httpx.AsyncClient:
+        """base URL 의 공유 클라이언트 (시작 시 등록되지 않은 업스트림은 첫 요청 때 생성)"""
+        key = self._key(base_url)
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            client = self._clients[key] = self._create(key)
+            self._names.setdefault(key, key)
+        return client
+
+    def _stat(self, base_url: str) -> Dict[str, Any]:
+        key = self._key(base_url)
+        stat = self._stats.get(key)
+        if stat is None:
+            stat = self._stats[key] = {"in_flight": 0, "max_in_flight": 0, "requests": 0, "errors": 0, "total_ms": 0.0}
+        return stat
+
+    def begin(self, base_url: str) -> float:
+        """요청 시작 기록 (이벤트 루프 단일 스레드라 락 불필요). 반환값은 end() 에 전달"""
+        stat = self._stat(base_url)
+        stat["in_flight"] += 1
+        stat["max_in_flight"] = max(stat["max_in_flight"], stat["in_flight"])
+        return time.perf_counter()
+
+    def end(self, base_url: str, started: float, error: bool = False) -> None:
+        """요청 종료 기록 (스트리밍 응답은 본문 전송이 끝난 뒤 호출)"""
+        stat = self._stat(base_url)
+        stat["in_flight"] -= 1
+        stat["requests"] += 1
+        stat["errors"] += int(error)
+        stat["total_ms"] += (time.perf_counter() - started) * 1000
+
+    @asynccontextmanager
+    async def track(self, base_url: str):
+        """begin/end 를 감싼 컨텍스트 (응답 본문까지 블록 안에서 읽는 경우)"""
+        started = self.begin(base_url)
+        error = False
+        try:
+            yield
+        except Exception:
+            error = True
+            raise
+        finally:
+            self.end(base_url, started, error)
+
+    @staticmethod
+    def _connections(client: httpx.AsyncClient) -> Dict[str, Any]:
+        """httpcore 연결 풀 상태 (내부 속성이므로 없으면 빈 값)"""
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", []) or [])
+        idle = sum(1 for c in connections if getattr(c, "is_idle", lambda: False)())
+        http2 = sum(1 for c in connections if "HTTP2" in type(getattr(c, "_connection", c)).__name__)
+        return {"open": len(connections), "idle": idle, "active": len(connections) - idle, "http2": http2}
+
+    def stats(self) -> Dict[str, Any]:
+        upstreams = {}
+        for key in sorted(set(self._clients) | set(self._stats)):
+            stat = dict(self._stat(key))
+            client = self._clients.get(key)
+            connections = self._connections(client) if client is not None else {"open": 0, "idle": 0, "active": 0, "http2": 0}
+            requests = stat.pop("requests")
+            total_ms = stat.pop("total_ms")
+            upstreams[self._names.get(key, key)] = {
+                "base_url": key,
+                "requests": requests,
+                "avg_ms": round(total_ms / requests, 1) if requests else 0.0,
+                **stat,
+                "connections": connections,
+                "utilization": round(connections["active"] / self.limits.max_connections, 3),
+            }
+        return {
+            "limits": {
+                "max_connections": self.limits.max_connections,
+                "max_keepalive_connections": self.limits.max_keepalive_connections,
+                "keepalive_expiry": self.limits.keepalive_expiry,
+            },
+            "http2": self.http2,
+            "upstreams": upstreams,
+        }
+
+
+_pool: Optional[UpstreamPool] = None
+
+
+def get_upstream_pool() -> UpstreamPool:
+    """프로세스 공유 풀 (UPSTREAM_* 환경 변수로 설정)"""
+    global _pool
+    if _pool is None:
+        _pool = UpstreamPool(
+            timeout=float(os.getenv("UPSTREAM_TIMEOUT", "60")),
+            connect_timeout=float(os.getenv("UPSTREAM_CONNECT_TIMEOUT", "5")),
+            max_connections=int(os.getenv("UPSTREAM_MAX_CONNECTIONS", "100")),
+            max_keepalive=int(os.getenv("UPSTREAM_MAX_KEEPALIVE", "20")),
+            keepalive_expiry=float(os.getenv("UPSTREAM_KEEPALIVE_EXPIRY", "30")),
+            http2=os.getenv("UPSTREAM_HTTP2", "1") == "1",
+        )
+    return _pool
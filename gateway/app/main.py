@@ -1,16 +1,44 @@
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.responses import Response, JSONResponse
+from starlette.responses import Response, JSONResponse, StreamingResponse
 from starlette.middleware.sessions import SessionMiddleware
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+import asyncio
 import httpx
 import os
 import logging
+import random
+import time
 from app.domain.auth.router import router as auth_router
+from app.domain.auth.utils import require_gateway_admin
+from app.domain.service.upstream_pool import get_upstream_pool, forward_headers, response_headers
+from app.domain.service.response_cache import get_response_cache, etag_matches, storable_ttl
+from app.domain.service.single_flight import get_single_flight, request_key
+from app.domain.service.resilience import get_resilience, CircuitOpenError, RETRYABLE_STATUS
+from app.domain.service.route_table import get_route_table, RouteTable, RouteMatch
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("gateway")
 
-app = FastAPI(title="MSA API Gateway", version="1.0.0")
+def _apply_routes(table: RouteTable) -> None:
+    """라우팅 테이블 (재)적재 결과를 업스트림 풀 / 캐시 / 합치기에 반영"""
+    # 업스트림별 공유 클라이언트 생성 (요청마다 연결을 새로 맺지 않도록)
+    get_upstream_pool().start(table.upstreams)
+    cache = get_response_cache()
+    if cache is not None:
+        cache.set_rules(table.cache_rules())
+    get_single_flight().set_routes(table.coalesce_routes())
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    _apply_routes(get_route_table())
+    try:
+        yield
+    finally:
+        await get_upstream_pool().close()
+
+app = FastAPI(title="MSA API Gateway", version="1.0.0", lifespan=lifespan)
 
 # Session 미들웨어 추가 (OAuth 상태 관리용)
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-here")
@@ -53,173 +81,390 @@ def cors_headers_for(request: Request):
         }
     return {}
 
-# 서비스 URL 설정
-ACCOUNT_SERVICE_URL = os.getenv("ACCOUNT_SERVICE_URL", "http://localhost:8001")
-ASSESSMENT_SERVICE_URL = os.getenv("ASSESSMENT_SERVICE_URL", "http://localhost:8002")
-CHATBOT_SERVICE_URL = os.getenv("CHATBOT_SERVICE_URL", "http://localhost:8003")
-SOLUTION_SERVICE_URL = os.getenv("SOLUTION_SERVICE_URL", "http://localhost:8009")
-NORMAL_SERVICE_URL = os.getenv("NORMAL_SERVICE_URL", "http://localhost:8005")
-MONITORING_SERVICE_URL = os.getenv("MONITORING_SERVICE_URL", "http://localhost:8004")
-TIMEOUT = float(os.getenv("UPSTREAM_TIMEOUT", "60"))
-SHARING_SERVICE_URL = os.getenv("SHARING_SERVICE_URL", "http://localhost:8008")
-REPORT_SERVICE_URL = os.getenv("REPORT_SERVICE_URL", "http://localhost:8007")
-logger.info(f"🔧 REPORT_SERVICE_URL 설정: {REPORT_SERVICE_URL}")
-logger.info(f"🔧 SOLUTION_SERVICE_URL 설정: {SOLUTION_SERVICE_URL}")
-logger.info(f"🔧 SHARING_SERVICE_URL 설정: {SHARING_SERVICE_URL}")
-logger.info(f"🔧 NORMAL_SERVICE_URL 설정: {NORMAL_SERVICE_URL}")
+# 서비스 URL / 경로 재작성은 라우팅 테이블에서 관리 ({NAME}_SERVICE_URL, GATEWAY_ROUTES_FILE)
+# 1(기본): 요청/응답 본문을 스트리밍 전달, 0: 응답 본문을 모두 받은 뒤 전달 (라우트별 streaming 정책이 우선)
+STREAMING = os.getenv("GATEWAY_STREAMING", "1") == "1"
+PROXY_METHODS = ["GET", "POST", "PUT", "PATCH", "DELETE"]
 
 @app.get("/health")
 async def health():
     logger.info("Health check requested")
     return {"status": "healthy", "service": "gateway"}
 
+@app.get("/gateway/metrics")
+async def gateway_metrics():
+    # 업스트림 풀 사용률 (진행 중 요청, 열린/유휴 연결 수) + 응답 캐시 라우트별 hit/miss
+    cache = get_response_cache()
+    return {
+        "pool": get_upstream_pool().stats(),
+        "cache": cache.stats() if cache is not None else None,
+        "coalescing": get_single_flight().stats(),
+        "resilience": get_resilience().stats(),
+    }
+
+@app.delete("/gateway/cache", dependencies=[Depends(require_gateway_admin)])
+async def gateway_cache_invalidate(prefix: Optional[str] = None):
+    # 캐시 수동 무효화 (prefix 미지정 시 전체), X-Gateway-Admin-Token 필요
+    cache = get_response_cache()
+    return {"invalidated": cache.invalidate(prefix) if cache is not None else 0}
+
+@app.get("/gateway/routes", dependencies=[Depends(require_gateway_admin)])
+async def gateway_routes():
+    # 현재 적용 중인 라우팅 테이블 (내부 업스트림 URL 포함 → X-Gateway-Admin-Token 필요)
+    return get_route_table().describe()
+
+@app.post("/gateway/routes/reload", dependencies=[Depends(require_gateway_admin)])
+async def gateway_routes_reload():
+    # GATEWAY_ROUTES_FILE 다시 읽기 (실패 시 기존 테이블 유지), X-Gateway-Admin-Token 필요
+    table = get_route_table()
+    try:
+        table.reload()
+    except Exception as e:
+        logger.error(f"❌ 라우트 테이블 재적재 실패, 기존 테이블 유지: {e}")
+        return JSONResponse(status_code=400, content={"error": "Route table reload failed", "detail": str(e)})
+    _apply_routes(table)
+    return table.describe()
+
 @app.options("/{path:path}")
 async def options_handler(path: str, request: Request):
     return Response(status_code=204, headers=cors_headers_for(request))
 
-async def _proxy(request: Request, upstream_base: str, rest: str):
-    url = upstream_base.rstrip("/") + "/" + rest.lstrip("/")
+def _gateway_error(request: Request, status_code: int, error: str, e: Exception) -> JSONResponse:
+    return JSONResponse(
+        status_code=status_code,
+        content={"error": error, "detail": str(e)},
+        headers=cors_headers_for(request),
+    )
+
+def _upstream_error(request: Request, e: Exception, url: str) -> JSONResponse:
+    """업스트림 호출 실패 → 503(서킷 열림) / 504(타임아웃) / 502(연결·프로토콜 오류) / 500"""
+    if isinstance(e, CircuitOpenError):
+        logger.warning(f"⛔ 서킷 열림, 업스트림 호출 생략: {e.upstream} {url}")
+        response = _gateway_error(request, 503, "Service Unavailable", e)
+        response.headers["Retry-After"] = str(max(1, int(e.retry_after + 0.999)))
+        return response
+    if isinstance(e, httpx.TimeoutException):
+        logger.error(f"❌ 프록시 타임아웃: {e!r} {url}")
+        return _gateway_error(request, 504, "Gateway Timeout", e)
+    if isinstance(e, httpx.HTTPError):
+        logger.error(f"❌ 프록시 HTTP 오류: {e} {url}")
+        return _gateway_error(request, 502, "Bad Gateway", e)
+    logger.error(f"❌ 프록시 일반 오류: {e} {url}")
+    return _gateway_error(request, 500, "Gateway Error", e)
+
+async def _send(
+    request: Request,
+    upstream_base: str,
+    url: str,
+    *,
+    method: str,
+    headers: Dict[str, str],
+    timeout: Optional[float] = None,
+    slow_ms: Optional[float] = None,
+    content=None,
+    has_body: bool = False,
+) -> httpx.Response:
+    """
+    업스트림 호출 (stream=True 응답 반환)
+    - 서킷 브레이커가 열려 있으면 CircuitOpenError
+    - slow_ms: 라우트의 느린 호출 기준 (None 이면 브레이커가 느린 호출로 세지 않음)
+    - 게이트웨이 경로별 타임아웃 (응답 헤더까지, 본문 스트리밍은 읽기 단위 타임아웃)
+    - 멱등 요청은 연결 오류/타임아웃/502·503·504 시 재시도 예산 안에서 재시도 (지수 백오프 + 지터)
+    """
+    resilience = get_resilience()
+    pool = get_upstream_pool()
+    name = pool.name_of(upstream_base)
+    breaker = resilience.breaker(name)
+    budget = resilience.budget(name)
+    timeout = httpx.Timeout(timeout or resilience.default_timeout, connect=pool.timeout.connect)
+    retryable = resilience.retryable(method, has_body)
+    budget.record_request()
+    attempt = 0
+    while True:
+        if not breaker.allow():
+            raise CircuitOpenError(name, breaker.retry_after())
+        client = pool.client(upstream_base)
+        upstream_request = client.build_request(
+            method, url, params=dict(request.query_params), content=content, headers=headers, timeout=timeout
+        )
+        started = time.perf_counter()
+        try:
+            try:
+                # 라우트 타임아웃은 응답 헤더까지의 전체 기한 (httpx 타임아웃은 읽기 1회 단위라 느린 업스트림을 못 끊음)
+                upstream = await asyncio.wait_for(client.send(upstream_request, stream=True), timeout.read)
+            except asyncio.TimeoutError:
+                raise httpx.ReadTimeout(
+                    f"upstream did not respond within {timeout.read:g}s", request=upstream_request
+                ) from None
+        except httpx.TransportError as e:
+            breaker.record(False, (time.perf_counter() - started) * 1000, slow_ms)
+            if isinstance(e, httpx.TimeoutException):
+                resilience.count(name, "timeouts")
+            if not (retryable and attempt < resilience.max_retries and budget.try_acquire()):
+                raise
+            logger.warning(f"🔁 업스트림 재시도 {attempt + 1}/{resilience.max_retries}: {e!r} {url}")
+        else:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if upstream.status_code not in RETRYABLE_STATUS:
+                breaker.record(True, elapsed_ms, slow_ms)
+                return upstream
+            breaker.record(False, elapsed_ms, slow_ms)
+            if not (retryable and attempt < resilience.max_retries and budget.try_acquire()):
+                return upstream
+            await upstream.aclose()
+            logger.warning(f"🔁 업스트림 재시도 {attempt + 1}/{resilience.max_retries}: {upstream.status_code} {url}")
+        attempt += 1
+        resilience.count(name, "retries")
+        await asyncio.sleep(min(1.0, 0.05 * 2 ** attempt) * random.uniform(0.5, 1.5))
+
+async def _hedged(name: str, attempt):
+    """hedge_delay 안에 끝나지 않으면 같은 요청을 한 번 더 보내 먼저 성공한 결과 사용 (나머지는 취소)"""
+    resilience = get_resilience()
+    first = asyncio.ensure_future(attempt())
+    done, _ = await asyncio.wait({first}, timeout=resilience.hedge_delay)
+    if done or not resilience.budget(name).try_acquire():
+        return await first
+    resilience.count(name, "hedges")
+    second = asyncio.ensure_future(attempt())
+    pending = {first, second}
+    error: Optional[BaseException] = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is second:
+                        resilience.count(name, "hedge_wins")
+                    return task.result()
+                error = error or task.exception()
+        raise error
+    finally:
+        for task in (first, second):
+            if not task.done():
+                task.cancel()
+
+async def _proxy(request: Request, match: RouteMatch):
+    url = match.url
     logger.info(f"🔗 프록시 요청: {request.method} {request.url.path} -> {url}")
-    logger.info(f"📝 상세 정보: upstream_base={upstream_base}, rest={rest}")
-    logger.info(f"🌐 전체 URL: {url}")
-    logger.info(f"🔧 환경변수: RAILWAY_ENVIRONMENT={os.getenv('RAILWAY_ENVIRONMENT')}")
-    logger.info(f"🔧 환경변수: REPORT_SERVICE_URL={os.getenv('REPORT_SERVICE_URL')}")
+    logger.info(f"📝 상세 정보: route={match.route.prefix}, upstream={match.route.upstream}, path={match.upstream_path}")
+
+    cache = get_response_cache()
+    if cache is not None and request.method == "GET" and match.cache is not None:
+        if match.cache.covers_credentials(request.headers):
+            return await _proxy_cached(request, match, cache, match.cache)
+        cache.record(match.cache, "bypassed_credentials")
+
+    # 동일 GET 합치기 (SSE 요청은 스트리밍 유지)
+    if (
+        request.method == "GET"
+        and match.coalesce is not None
+        and get_single_flight().enabled
+        and "text/event-stream" not in request.headers.get("accept", "")
+    ):
+        return await _proxy_coalesced(request, match)
 
-    headers = dict(request.headers)
-    headers.pop("host", None)
-    body = await request.body()
-    params = dict(request.query_params)
+    response = await _proxy_stream(request, match)
+    # 캐시 라우트에 쓰기 요청이 성공하면 해당 라우트 캐시 무효화
+    if cache is not None and request.method != "GET" and response.status_code < 400:
+        for prefix in cache.write_prefixes(request.url.path):
+            dropped = cache.invalidate(prefix)
+            if dropped:
+                logger.info(f"🧹 캐시 무효화: {prefix} ({dropped}개) ← {request.method} {request.url.path}")
+    return response
 
+async def _proxy_stream(request: Request, match: RouteMatch):
+    upstream_base, url = match.route.base_url, match.url
+    streaming = STREAMING if match.streaming is None else match.streaming
+    headers = forward_headers(request.headers.items())
+    # 요청 본문: 있으면 스트림 그대로 전달 (업로드를 게이트웨이 메모리에 모으지 않음)
+    has_body = "content-length" in request.headers or "transfer-encoding" in request.headers
+    content = request.stream() if has_body else None
+
+    pool = get_upstream_pool()
+    started = pool.begin(upstream_base)
     try:
-        async with httpx.AsyncClient(
-            timeout=TIMEOUT, 
-            follow_redirects=True,
-            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
-        ) as client:
-            upstream = await client.request(
-                request.method, url, params=params, content=body, headers=headers
-            )
-            logger.info(f"✅ 프록시 응답: {upstream.status_code} {url}")
-    except httpx.HTTPError as e:
-        logger.error(f"❌ 프록시 HTTP 오류: {e} {url}")
-        logger.error(f"❌ HTTP 오류 상세: status_code={getattr(e, 'response', {}).get('status_code', 'N/A')}")
-        logger.error(f"❌ HTTP 오류 내용: {getattr(e, 'response', {}).get('text', 'N/A')}")
-        return JSONResponse(
-            status_code=502,
-            content={"error": "Bad Gateway", "detail": str(e)},
-            headers=cors_headers_for(request),
+        upstream = await _send(
+            request,
+            upstream_base,
+            url,
+            method=request.method,
+            headers=headers,
+            timeout=match.timeout,
+            slow_ms=match.slow_ms,
+            content=content,
+            has_body=has_body,
         )
+        logger.info(f"✅ 프록시 응답: {upstream.status_code} {url}")
     except Exception as e:
-        logger.error(f"❌ 프록시 일반 오류: {e} {url}")
-        return JSONResponse(
-            status_code=500,
-            content={"error": "Gateway Error", "detail": str(e)},
-            headers=cors_headers_for(request),
-        )
+        pool.end(upstream_base, started, error=True)
+        return _upstream_error(request, e, url)
 
-    passthrough = {}
-    for k, v in upstream.headers.items():
-        lk = k.lower()
-        if lk in ("content-type", "set-cookie", "cache-control"):
-            passthrough[k] = v
+    # 응답 본문은 업스트림 바이트 그대로(aiter_raw: content-encoding 유지) 전달
+    if not streaming:
+        try:
+            raw = b"".join([chunk async for chunk in upstream.aiter_raw()])
+        except httpx.HTTPError as e:
+            pool.end(upstream_base, started, error=True)
+            logger.error(f"❌ 프록시 응답 본문 수신 오류: {e} {url}")
+            return _gateway_error(request, 502, "Bad Gateway", e)
+        finally:
+            await upstream.aclose()
+        pool.end(upstream_base, started)
+        response = Response(content=raw, status_code=upstream.status_code)
+    else:
+        async def body():
+            # 청크가 도착하는 대로 전송 (SSE / chunked 응답 버퍼링 없음)
+            error = False
+            try:
+                async for chunk in upstream.aiter_raw():
+                    yield chunk
+            except Exception as e:
+                error = True
+                logger.error(f"❌ 프록시 스트림 중단: {e} {url}")
+                raise
+            finally:
+                await upstream.aclose()
+                pool.end(upstream_base, started, error)
 
-    passthrough.update(cors_headers_for(request))
+        response = StreamingResponse(body(), status_code=upstream.status_code)
 
-    return Response(
-        content=upstream.content,
-        status_code=upstream.status_code,
-        headers=passthrough,
-        media_type=upstream.headers.get("content-type"),
-    )
+    # 상태/헤더 보존 (set-cookie 같은 중복 헤더 포함), CORS 헤더는 게이트웨이 값 사용
+    for k, v in response_headers(upstream.headers.multi_items()):
+        if k.lower() == "content-length" and not streaming:
+            continue  # Response 가 계산한 값 사용
+        response.headers.append(k, v)
+    for k, v in cors_headers_for(request).items():
+        response.headers[k] = v
+    return response
 
-@app.api_route("/api/account/{path:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
-async def account_any(path: str, request: Request):
-    return await _proxy(request, ACCOUNT_SERVICE_URL, path)
-    
-@app.api_route("/api/assessment", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
-async def assessment_root(request: Request):
-    return await _proxy(request, ASSESSMENT_SERVICE_URL, "/assessment")
-
-@app.api_route("/api/assessment/{path:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
-async def assessment_any(path: str, request: Request):
-    return await _proxy(request, ASSESSMENT_SERVICE_URL, f"/assessment/{path}")
-
-@app.api_route("/api/chatbot", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
-async def chatbot_root(request: Request):
-    return await _proxy(request, CHATBOT_SERVICE_URL, "/")
-
-@app.api_route("/api/chatbot/{path:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
-async def chatbot_any(path: str, request: Request):
-    return await _proxy(request, CHATBOT_SERVICE_URL, path)
-
-@app.api_route("/api/report", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
-async def report_root(request: Request):
-    return await _proxy(request, REPORT_SERVICE_URL, "/")
-
-@app.api_route("/api/report/{path:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
-async def report_any(path: str, request: Request):
-    logger.info(f"📡 Report Service 요청: {request.method} {request.url.path}")
-    logger.info(f"🔗 Report Service URL: {REPORT_SERVICE_URL}")
-    logger.info(f"📝 Path: {path}")
-    return await _proxy(request, REPORT_SERVICE_URL, path)
-
-# ---- solution-service 프록시 ----
-@app.api_route("/api/solution/{path:path}", methods=["GET","POST","PUT","PATCH","DELETE"])
-async def solution_any(path: str, request: Request):
-    return await _proxy(request, SOLUTION_SERVICE_URL, f"/solution/{path}")
-
-# ---- monitoring-service 프록시 ----
-@app.api_route("/api/monitoring", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
-async def monitoring_root(request: Request):
-    logger.info(f"🔍 monitoring-service 프록시 요청: {request.method} /api/monitoring")
-    try:
-        response = await _proxy(request, MONITORING_SERVICE_URL, "/monitoring")
-        logger.info(f"✅ monitoring-service 프록시 성공: {response.status_code}")
-        return response
-    except Exception as e:
-        logger.error(f"❌ monitoring-service 프록시 실패: {e}")
-        return JSONResponse(
-            status_code=500,
-            content={"error": "Monitoring service proxy failed", "detail": str(e)}
+async def _fetch(
+    request: Request,
+    match: RouteMatch,
+    extra_headers: Optional[Dict[str, str]] = None,
+    keep_conditional: bool = False,
+):
+    """GET 업스트림 응답을 본문(원본 바이트)까지 받아 (응답, 본문) 반환 — 캐시/합치기 경로용"""
+    upstream_base, url = match.route.base_url, match.url
+    headers = forward_headers(request.headers.items())
+    if not keep_conditional:
+        # 캐시 경로: 조건부 요청은 게이트웨이 캐시가 직접 판단 (클라이언트 ETag 는 게이트웨이가 발급한 값일 수 있음)
+        for name in [k for k in headers if k.lower() in ("if-none-match", "if-modified-since")]:
+            headers.pop(name)
+    headers.update(extra_headers or {})
+
+    async def attempt():
+        upstream = await _send(
+            request, upstream_base, url, method="GET", headers=headers, timeout=match.timeout, slow_ms=match.slow_ms
         )
+        try:
+            raw = b"".join([chunk async for chunk in upstream.aiter_raw()])
+        finally:
+            await upstream.aclose()
+        return upstream, raw
+
+    pool = get_upstream_pool()
+    async with pool.track(upstream_base):
+        if match.hedge:
+            upstream, raw = await _hedged(pool.name_of(upstream_base), attempt)
+        else:
+            upstream, raw = await attempt()
+    logger.info(f"✅ 프록시 응답: {upstream.status_code} {url}")
+    return upstream, raw
+
+def _cached_response(request: Request, entry, state: str) -> Response:
+    """캐시 항목 응답 (If-None-Match 일치 시 304)"""
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        response = Response(status_code=304)
+        for k, v in entry.headers:
+            if k.lower() == "cache-control":
+                response.headers.append(k, v)
+    else:
+        response = Response(content=entry.body, status_code=entry.status)
+        for k, v in entry.headers:
+            if k.lower() not in ("content-length", "etag"):
+                response.headers.append(k, v)
+    response.headers["ETag"] = entry.etag
+    response.headers["Age"] = str(entry.age())
+    response.headers["X-Cache"] = state
+    for k, v in cors_headers_for(request).items():
+        response.headers[k] = v
+    return response
+
+async def _proxy_cached(request: Request, match: RouteMatch, cache, rule):
+    url = match.url
+    key = cache.key(rule, request.url.path, request.query_params.multi_items(), request.headers)
+    entry = cache.get(key)
+    client_no_cache = "no-cache" in request.headers.get("cache-control", "").lower()
+    if entry is not None and entry.fresh() and not client_no_cache:
+        cache.record(rule, "hits")
+        return _cached_response(request, entry, "HIT")
+
+    # 만료된 항목은 업스트림 ETag 로 재검증 (304 면 본문 재사용)
+    extra = {"If-None-Match": entry.upstream_etag} if entry is not None and entry.upstream_etag else None
+
+    async def load():
+        upstream, raw = await _fetch(request, match, extra)
+        if upstream.status_code == 304 and entry is not None:
+            cache.refresh(entry, storable_ttl(rule, 200, upstream.headers) or 0.0)
+            return "revalidated", entry, None
+        headers = response_headers(upstream.headers.multi_items())
+        ttl = storable_ttl(rule, upstream.status_code, upstream.headers)
+        if ttl is None:
+            cache.record(rule, "not_storable")
+            return "misses", None, (upstream.status_code, headers, raw)
+        stored = cache.store(key, rule, upstream.status_code, headers, raw, upstream.headers.get("etag"), ttl)
+        return "misses", stored, (upstream.status_code, headers, raw)
 
-@app.api_route("/api/monitoring/{path:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
-async def monitoring_any(path: str, request: Request):
-    logger.info(f"🔍 monitoring-service 프록시 요청: {request.method} /api/monitoring/{path}")
     try:
-        response = await _proxy(request, MONITORING_SERVICE_URL, f"/monitoring/{path}")
-        logger.info(f"✅ monitoring-service 프록시 성공: {path} - {response.status_code}")
-        return response
+        # 캐시 미스/재검증이 동시에 몰려도 업스트림 호출과 저장은 1회 (대기자는 결과 공유)
+        outcome, stored, passthrough = await get_single_flight().run(rule.prefix, f"cache:{key}:{extra}", load)
     except Exception as e:
-        logger.error(f"❌ monitoring-service 프록시 실패: {path} - {e}")
-        return JSONResponse(
-            status_code=500,
-            content={"error": "Monitoring service proxy failed", "detail": str(e)}
-        )
+        if entry is not None:
+            cache.record(rule, "stale_on_error")
+            logger.warning(f"⚠️ 업스트림 오류, 만료된 캐시 응답 사용: {e} {url}")
+            return _cached_response(request, entry, "STALE")
+        return _upstream_error(request, e, url)
 
-# Sharing service 라우팅
-@app.api_route("/sharing", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
-async def sharing_root(request: Request):
-    return await _proxy(request, SHARING_SERVICE_URL, "/sharing")
+    cache.record(rule, outcome)
+    if stored is not None:
+        return _cached_response(request, stored, "REVALIDATED" if outcome == "revalidated" else "MISS")
+    response = _buffered_response(request, *passthrough)
+    response.headers["X-Cache"] = "MISS"
+    return response
 
-@app.api_route("/sharing/{path:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
-async def sharing_any(path: str, request: Request):
-    return await _proxy(request, SHARING_SERVICE_URL, f"/sharing/{path}")
+def _buffered_response(request: Request, status_code: int, headers, raw: bytes) -> Response:
+    response = Response(content=raw, status_code=status_code)
+    for k, v in headers:
+        if k.lower() != "content-length":
+            response.headers.append(k, v)
+    for k, v in cors_headers_for(request).items():
+        response.headers[k] = v
+    return response
 
-# Normal service 라우팅
-@app.api_route("/api/normal", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
-async def normal_root(request: Request):
-    # upstream도 /api/normal 로 보내야 normal-service가 매칭됩니다.
-    return await _proxy(request, NORMAL_SERVICE_URL, "/api/normal")
-
-@app.api_route("/api/normal/{path:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
-async def normal_any(path: str, request: Request):
-    return await _proxy(request, NORMAL_SERVICE_URL, f"/api/normal/{path}")
+async def _proxy_coalesced(request: Request, match: RouteMatch):
+    """동일 GET 이 진행 중이면 그 응답을 공유 (각 대기자는 같은 상태/헤더/본문으로 개별 응답)"""
+    url = match.url
+    key = request_key(url, request.query_params.multi_items(), request.headers)
+    try:
+        upstream, raw = await get_single_flight().run(
+            match.coalesce, key, lambda: _fetch(request, match, keep_conditional=True)
+        )
+    except Exception as e:
+        return _upstream_error(request, e, url)
+    return _buffered_response(request, upstream.status_code, response_headers(upstream.headers.multi_items()), raw)
 
-# Auth 라우터를 두 경로에 마운트
+# Auth 라우터를 두 경로에 마운트 (아래 공통 프록시 라우트보다 먼저 등록)
 app.include_router(auth_router, prefix="/api/auth")  # 프론트엔드 API 요청용
 app.include_router(auth_router, prefix="/auth")      # Google 콜백용
 
+# ---- 업스트림 프록시 (라우팅 테이블 기반 공통 핸들러) ----
+@app.api_route("/{path:path}", methods=PROXY_METHODS)
+async def proxy_any(path: str, request: Request):
+    match = get_route_table().match(request.url.path)
+    if match is None:
+        return JSONResponse(status_code=404, content={"detail": "Not Found"}, headers=cors_headers_for(request))
+    return await _proxy(request, match)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("PORT", "8080")))
\ No newline at end of file
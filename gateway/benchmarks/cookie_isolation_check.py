@@ -0,0 +1,104 @@
+"""
+게이트웨이 공유 업스트림 클라이언트 쿠키 격리 점검 (스텁 업스트림, 네트워크 없이)
+
+UpstreamPool 의 전송 계층을 httpx.MockTransport 스텁으로 교체하고 게이트웨이 앱을 그대로 호출해
+- set_cookie_passthrough: 업스트림 로그인 응답의 Set-Cookie 는 클라이언트에게 그대로 전달
+- anonymous_isolated: 이후 Cookie 헤더 없는 (다른 사용자) 요청에 그 쿠키가 붙어 업스트림으로 가지 않음
+- own_cookie_forwarded: 클라이언트가 보낸 Cookie 헤더는 그대로 전달
+- cache_per_cookie: 캐시 라우트(기본 vary)에서 쿠키가 다른 사용자는 서로의 캐시 응답을 받지 않음
+- cache_bypass_unvaried: vary 에 cookie 가 없는 캐시 라우트는 쿠키 요청을 캐시하지 않음
+을 검증하고 결과 JSON 을 출력 (실패 항목이 있으면 종료 코드 1)
+
+사용 예:
+    python benchmarks/cookie_isolation_check.py
+"""
+import json
+import os
+import sys
+import tempfile
+from typing import Any, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+_routes_file = os.path.join(tempfile.mkdtemp(), "routes.json")
+with open(_routes_file, "w", encoding="utf-8") as f:
+    json.dump({"routes": [{"prefix": "/api/report/catalog", "cache": {"ttl": 60, "vary": ["authorization"]}}]}, f)
+
+os.environ.update({
+    "MONITORING_SERVICE_URL": "http://stub-monitoring",
+    "REPORT_SERVICE_URL": "http://stub-report",
+    "GATEWAY_CACHE": "1",
+    "GATEWAY_COALESCE": "0",
+    "GATEWAY_ROUTES_FILE": _routes_file,
+})
+
+import httpx  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.domain.service.upstream_pool import get_upstream_pool  # noqa: E402
+
+
+class StubUpstream:
+    """/monitoring/login 은 세션 쿠키 발급, 나머지는 받은 Cookie 헤더 기록 (본문에 그대로 반환)"""
+
+    def __init__(self):
+        self.cookies: List[Optional[str]] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.cookies.append(request.headers.get("cookie"))
+        headers = {"content-type": "application/json"}
+        if request.url.path == "/monitoring/login":
+            headers["set-cookie"] = "session=alice-secret; Path=/; HttpOnly"
+        body = json.dumps({"cookie": request.headers.get("cookie")}).encode("utf-8")
+        return httpx.Response(200, headers=headers, stream=httpx.ByteStream(body))
+
+
+def run() -> Dict[str, Any]:
+    stub = StubUpstream()
+    checks: Dict[str, Any] = {}
+    with TestClient(app) as client:
+        get_upstream_pool().use_transport(httpx.MockTransport(stub))
+
+        r = client.post("/api/monitoring/login", json={})
+        checks["set_cookie_passthrough"] = {
+            "ok": "alice-secret" in r.headers.get("set-cookie", ""),
+            "set_cookie": r.headers.get("set-cookie"),
+        }
+
+        client.cookies.clear()  # 다른 (익명) 사용자
+        client.get("/api/monitoring/reports")
+        client.get("/api/monitoring/reports")
+        anonymous = stub.cookies[-2:]
+        checks["anonymous_isolated"] = {"ok": anonymous == [None, None], "upstream_cookies": anonymous}
+
+        client.get("/api/monitoring/reports", headers={"cookie": "session=bob"})
+        checks["own_cookie_forwarded"] = {"ok": stub.cookies[-1] == "session=bob", "upstream_cookie": stub.cookies[-1]}
+
+        seen = {}
+        for user in ("alice", "bob", "alice"):
+            r = client.get("/api/report/indicators", headers={"cookie": f"session={user}"})
+            seen.setdefault(user, []).append((r.json().get("cookie"), r.headers.get("x-cache")))
+        checks["cache_per_cookie"] = {
+            "ok": seen["alice"] == [("session=alice", "MISS"), ("session=alice", "HIT")]
+                  and seen["bob"] == [("session=bob", "MISS")],
+            "responses": seen,
+        }
+
+        calls = len(stub.cookies)
+        bodies = [
+            client.get("/api/report/catalog", headers={"cookie": f"session={user}"}).json().get("cookie")
+            for user in ("alice", "bob")
+        ]
+        checks["cache_bypass_unvaried"] = {
+            "ok": bodies == ["session=alice", "session=bob"] and len(stub.cookies) - calls == 2,
+            "bodies": bodies,
+        }
+    return {"checks": checks, "ok": all(c["ok"] for c in checks.values())}
+
+
+if __name__ == "__main__":
+    result = run()
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    sys.exit(0 if result["ok"] else 1)
@@ -0,0 +1,174 @@
+"""
+게이트웨이 장애 격리 점검 (스텁 업스트림, 네트워크 없이)
+
+UpstreamPool 의 전송 계층을 httpx.MockTransport 스텁으로 교체하고 게이트웨이 앱을 그대로 호출해
+- retry: 멱등 GET 이 503 한 번 뒤 성공 → 200, 재시도 1회
+- no_retry_post: POST 는 503 그대로 전달 (재시도 없음)
+- route_timeout: 라우트 타임아웃(0.2s) 초과 → 504
+- breaker: 계속 실패하는 업스트림 → open 후 업스트림 호출 없이 503(Retry-After), open_sec 뒤 half_open 프로브 → closed
+- hedge: 첫 시도가 느리면 hedge_delay 뒤 두 번째 요청이 먼저 응답
+- slow_policy: slow_ms 정책이 없는 느린 라우트(LLM 초안 등)는 브레이커를 열지 않고,
+  slow_ms 정책이 있는 라우트의 느린 호출은 브레이커를 엶
+을 검증하고 결과 JSON 을 출력 (실패 항목이 있으면 종료 코드 1)
+
+사용 예:
+    python benchmarks/resilience_check.py
+    python benchmarks/resilience_check.py --out /tmp/resilience.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+# 앱 import 전에 정책 설정 (점검이 빨리 끝나도록 작은 값)
+os.environ.update({
+    "MONITORING_SERVICE_URL": "http://stub-monitoring",
+    "ASSESSMENT_SERVICE_URL": "http://stub-assessment",
+    "SHARING_SERVICE_URL": "http://stub-sharing",
+    "GATEWAY_CACHE": "0",
+    "GATEWAY_COALESCE_ROUTES": "/api/assessment",
+    "GATEWAY_HEDGE_ROUTES": "/api/assessment/kesg",
+    "GATEWAY_HEDGE_DELAY_MS": "100",
+    "GATEWAY_ROUTE_TIMEOUTS": json.dumps({"/api/solution/slow": 0.2}),
+    "UPSTREAM_MAX_RETRIES": "2",
+    "BREAKER_MIN_REQUESTS": "5",
+    "BREAKER_OPEN_SEC": "1",
+    "BREAKER_HALF_OPEN_PROBES": "2",
+})
+_routes_file = os.path.join(tempfile.mkdtemp(), "routes.json")
+with open(_routes_file, "w", encoding="utf-8") as _f:
+    json.dump({"routes": [{"prefix": "/api/report/fast", "slow_ms": 20}]}, _f)
+os.environ["GATEWAY_ROUTES_FILE"] = _routes_file
+
+import httpx  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.domain.service.upstream_pool import get_upstream_pool  # noqa: E402
+from app.domain.service.resilience import get_resilience  # noqa: E402
+
+
+def _json(status: int, payload: Any) -> httpx.Response:
+    # 실제 전송 계층처럼 읽지 않은 스트림으로 반환 (content=/json= 은 이미 읽은 응답이 됨)
+    body = json.dumps(payload).encode("utf-8")
+    return httpx.Response(status, headers={"content-type": "application/json"}, stream=httpx.ByteStream(body))
+
+
+class StubUpstreams:
+    """경로별 시나리오 응답 + 호출 수 기록"""
+
+    def __init__(self):
+        self.calls: Dict[str, int] = {}
+        self.sharing_healthy = False
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        n = self.calls[path] = self.calls.get(path, 0) + 1
+        if path == "/monitoring/flaky":
+            return _json(503 if n == 1 else 200, {"call": n})
+        if path == "/monitoring/write":
+            return _json(503, {"call": n})
+        if path == "/solution/slow":
+            await asyncio.sleep(2.0)
+            return _json(200, {"call": n})
+        if path.startswith("/sharing"):
+            return _json(200 if self.sharing_healthy else 503, {"call": n})
+        if path in ("/draft", "/fast/x"):
+            await asyncio.sleep(0.05)
+            return _json(200, {"call": n})
+        if path == "/assessment/kesg":
+            if n == 1:
+                await asyncio.sleep(1.0)
+            return _json(200, {"call": n})
+        return _json(404, {"detail": "Not Found"})
+
+
+def run() -> Dict[str, Any]:
+    stub = StubUpstreams()
+    get_upstream_pool().use_transport(httpx.MockTransport(stub))
+    checks: Dict[str, Any] = {}
+    with TestClient(app) as client:
+        get_upstream_pool().use_transport(httpx.MockTransport(stub))  # lifespan 에서 만든 클라이언트 교체
+
+        r = client.get("/api/monitoring/flaky")
+        checks["retry"] = {"ok": r.status_code == 200 and stub.calls["/monitoring/flaky"] == 2,
+                           "status": r.status_code, "upstream_calls": stub.calls["/monitoring/flaky"]}
+
+        r = client.post("/api/monitoring/write", json={})
+        checks["no_retry_post"] = {"ok": r.status_code == 503 and stub.calls["/monitoring/write"] == 1,
+                                   "status": r.status_code, "upstream_calls": stub.calls["/monitoring/write"]}
+
+        started = time.perf_counter()
+        r = client.get("/api/solution/slow")
+        elapsed = time.perf_counter() - started
+        # 타임아웃도 재시도 대상 → (1 + 재시도) × 0.2s + 백오프, 업스트림 응답(2s)보다 먼저 504
+        # (앞 점검의 실패가 브레이커를 열지 않도록 다른 업스트림 사용)
+        checks["route_timeout"] = {"ok": r.status_code == 504 and elapsed < 1.5,
+                                   "status": r.status_code, "elapsed_sec": round(elapsed, 3)}
+
+        statuses = [client.get(f"/sharing/item/{i}").status_code for i in range(12)]
+        calls_before = sum(v for k, v in stub.calls.items() if k.startswith("/sharing"))
+        r = client.get("/sharing/item/x")
+        calls_after = sum(v for k, v in stub.calls.items() if k.startswith("/sharing"))
+        breaker = get_resilience().breaker("sharing")
+        opened = {
+            "ok": r.status_code == 503 and "retry-after" in r.headers and calls_after == calls_before
+                  and breaker.state == "open",
+            "statuses": statuses,
+            "rejected_status": r.status_code,
+            "retry_after": r.headers.get("retry-after"),
+        }
+        stub.sharing_healthy = True
+        time.sleep(1.1)
+        recovered = [client.get(f"/sharing/item/ok{i}").status_code for i in range(3)]
+        checks["breaker"] = {
+            **opened,
+            "ok": opened["ok"] and recovered == [200, 200, 200] and breaker.state == "closed",
+            "after_open_sec": recovered,
+            "state": breaker.state,
+        }
+
+        started = time.perf_counter()
+        r = client.get("/api/assessment/kesg")
+        elapsed = time.perf_counter() - started
+        counters = get_resilience().stats()["upstreams"].get("assessment", {})
+        checks["hedge"] = {"ok": r.status_code == 200 and elapsed < 0.6 and counters.get("hedge_wins") == 1,
+                           "status": r.status_code, "elapsed_sec": round(elapsed, 3), "body": r.json()}
+
+        # chatbot: 정책 없는 느린 호출 / report: slow_ms=20 라우트의 느린 호출 (둘 다 50ms, BREAKER_MIN_REQUESTS=5)
+        unflagged = [client.post("/api/chatbot/draft", json={}).status_code for _ in range(6)]
+        flagged = [client.get("/api/report/fast/x").status_code for _ in range(6)]
+        checks["slow_policy"] = {
+            "ok": unflagged == [200] * 6 and get_resilience().breaker("chatbot").state == "closed"
+                  and get_resilience().breaker("report").state == "open",
+            "unflagged_statuses": unflagged,
+            "flagged_statuses": flagged,
+            "chatbot_state": get_resilience().breaker("chatbot").state,
+            "report_state": get_resilience().breaker("report").state,
+        }
+
+        metrics = client.get("/gateway/metrics").json()["resilience"]
+    return {"checks": checks, "resilience": metrics, "ok": all(c["ok"] for c in checks.values())}
+
+
+def main(args) -> int:
+    result = run()
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    return 0 if result["ok"] else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="게이트웨이 서킷 브레이커/재시도/타임아웃/헤지 점검 (스텁 업스트림)")
+    parser.add_argument("--out", default=None, help="결과 JSON 저장 경로")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,176 @@
+"""
+라우팅 테이블 점검 + prefix 조회 벤치마크 (네트워크 없이)
+- rewrites: 기본 테이블이 기존 서비스별 핸들러와 같은 업스트림 경로로 재작성하는지 + 기본 헤지 범위
+- config_reload: 설정 파일만으로 서비스 추가 → 재적재 반영, 잘못된 설정은 거부하고 기존 테이블 유지
+- lookup: 라우트 N개에서 트라이 조회 vs 선형 prefix 탐색(가장 긴 prefix) 평균 시간
+결과 JSON 출력 (점검 실패 시 종료 코드 1)
+
+사용 예:
+    python benchmarks/route_match.py
+    python benchmarks/route_match.py --routes 2000 --iterations 50000 --out /tmp/route_match.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from app.domain.service.route_table import RouteTable, compile_routes  # noqa: E402
+
+# 게이트웨이 경로 → (업스트림, 업스트림 경로), None 은 404 (기존 @app.api_route 핸들러 기준)
+EXPECTED = {
+    "/api/account/login": ("account", "/login"),
+    "/api/account/": ("account", "/"),
+    "/api/account": None,
+    "/api/assessment": ("assessment", "/assessment"),
+    "/api/assessment/kesg/1": ("assessment", "/assessment/kesg/1"),
+    "/api/chatbot": ("chatbot", "/"),
+    "/api/chatbot/chat": ("chatbot", "/chat"),
+    "/api/report": ("report", "/"),
+    "/api/report/indicators/KBZ-001": ("report", "/indicators/KBZ-001"),
+    "/api/solution/generate": ("solution", "/solution/generate"),
+    "/api/solution": None,
+    "/api/monitoring": ("monitoring", "/monitoring"),
+    "/api/monitoring/companies": ("monitoring", "/monitoring/companies"),
+    "/sharing": ("sharing", "/sharing"),
+    "/sharing/requests/3": ("sharing", "/sharing/requests/3"),
+    "/api/normal": ("normal", "/api/normal"),
+    "/api/normal/products": ("normal", "/api/normal/products"),
+    "/api/unknown/x": None,
+    "/api/assessmentx": None,
+}
+
+# 기본 헤지 정책: 카탈로그 조회만, 지표별 RAG/LLM 조회(하위 경로)는 제외
+HEDGE_EXPECTED = {
+    "/api/report/indicators": True,
+    "/api/report/indicators/category/환경": True,
+    "/api/report/indicators/KBZ-001/fields": False,
+    "/api/report/indicators/KBZ-001/input-fields-only": False,
+    "/api/assessment/kesg/1": True,
+}
+
+
+def check_rewrites() -> Dict[str, Any]:
+    table = RouteTable().load()
+    mismatches = {}
+    for path, expected in EXPECTED.items():
+        match = table.match(path)
+        got = (match.route.upstream, match.upstream_path) if match else None
+        if got != (tuple(expected) if expected else None):
+            mismatches[path] = {"expected": expected, "got": got}
+    for path, expected in HEDGE_EXPECTED.items():
+        match = table.match(path)
+        if match is None or match.hedge != expected:
+            mismatches[path] = {"expected_hedge": expected, "got_hedge": match.hedge if match else None}
+    kesg = table.match("/api/assessment/kesg")
+    return {
+        "ok": not mismatches,
+        "paths": len(EXPECTED) + len(HEDGE_EXPECTED),
+        "mismatches": mismatches,
+        "kesg_policy": {
+            "cache_ttl": kesg.cache.ttl if kesg and kesg.cache else None,
+            "coalesce": kesg.coalesce if kesg else None,
+            "hedge": kesg.hedge if kesg else None,
+        },
+    }
+
+
+def check_config_reload() -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "routes.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"routes": []}, f)
+        table = RouteTable(path).load()
+        before = table.match("/api/esg/scores")
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "upstreams": {"esg": "http://localhost:8010"},
+                "routes": [
+                    {"prefix": "/api/esg", "upstream": "esg", "rewrite": "/esg", "timeout": 5, "streaming": False},
+                    {"prefix": "/api/esg/catalog", "cache": {"ttl": 120}},
+                ],
+            }, f)
+        table.reload()
+        added = table.match("/api/esg/catalog/1")
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"routes": [{"prefix": "/api/broken", "upstream": "nowhere"}]}, f)
+        try:
+            table.reload()
+            rejected = False
+        except ValueError:
+            rejected = True
+        kept = table.match("/api/esg/catalog/1")
+
+    return {
+        "ok": before is None and added is not None and added.url == "http://localhost:8010/esg/catalog/1"
+              and added.timeout == 5 and added.streaming is False and added.cache is not None
+              and rejected and kept is not None,
+        "added_url": added.url if added else None,
+        "invalid_rejected": rejected,
+        "kept_after_invalid": kept is not None,
+    }
+
+
+def _linear(prefixes: List[str], path: str) -> Optional[str]:
+    best = None
+    for prefix in prefixes:
+        if (path == prefix or path.startswith(prefix + "/")) and (best is None or len(prefix) > len(best)):
+            best = prefix
+    return best
+
+
+def bench_lookup(n_routes: int, iterations: int) -> Dict[str, Any]:
+    rng = random.Random(7)
+    prefixes = [f"/api/svc{i}/{rng.choice(['v1', 'v2'])}" for i in range(n_routes)]
+    entries = [{"prefix": p, "upstream": "svc"} for p in prefixes]
+    trie = RouteTable()
+    trie._root, trie.routes = compile_routes({"svc": "http://svc"}, entries)
+    paths = [p + f"/items/{rng.randint(1, 999)}" for p in rng.choices(prefixes, k=1000)]
+
+    started = time.perf_counter()
+    for i in range(iterations):
+        trie.match(paths[i % len(paths)])
+    trie_ns = (time.perf_counter() - started) / iterations * 1e9
+
+    linear_iterations = max(1, iterations // 10)
+    started = time.perf_counter()
+    for i in range(linear_iterations):
+        _linear(prefixes, paths[i % len(paths)])
+    linear_ns = (time.perf_counter() - started) / linear_iterations * 1e9
+    return {
+        "routes": n_routes,
+        "trie_ns_per_lookup": round(trie_ns),
+        "linear_ns_per_lookup": round(linear_ns),
+        "speedup": round(linear_ns / trie_ns, 1) if trie_ns else None,
+    }
+
+
+def main(args) -> int:
+    checks = {"rewrites": check_rewrites(), "config_reload": check_config_reload()}
+    result = {
+        "checks": checks,
+        "lookup": [bench_lookup(n, args.iterations) for n in (10, args.routes)],
+        "ok": all(c["ok"] for c in checks.values()),
+    }
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    return 0 if result["ok"] else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="게이트웨이 라우팅 테이블 점검 / prefix 조회 벤치마크")
+    parser.add_argument("--routes", type=int, default=500, help="조회 벤치마크 라우트 수")
+    parser.add_argument("--iterations", type=int, default=20000, help="조회 반복 횟수")
+    parser.add_argument("--out", default=None, help="결과 JSON 저장 경로")
+    sys.exit(main(parser.parse_args()))
@@ -1,8 +1,11 @@
 """
 Report Controller - ESG 매뉴얼 기반 보고서 API 엔드포인트 처리 (세션-안전 리팩토링)
 """
-from typing import Dict, Any, Optional
-from fastapi import HTTPException
+from typing import Dict, Any, Optional, AsyncIterator
+from fastapi import HTTPException, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+import json
 import logging
 
 from eripotter_common.database import get_session
@@ -11,17 +14,35 @@ from ..model.report_model import (
     ReportCreateRequest, ReportCreateResponse,
     ReportGetRequest, ReportGetResponse,
     ReportUpdateRequest, ReportUpdateResponse,
+    ReportPatchRequest, ReportPatchResponse,
     ReportDeleteRequest, ReportDeleteResponse,
+    ReportRevisionListResponse, ReportRevisionResponse, ReportRevisionDiffResponse,
     ReportListResponse, ReportCompleteRequest, ReportCompleteResponse,
-    IndicatorListResponse, IndicatorInputFieldResponse, IndicatorDraftResponse
+    ReportPageResponse,
+    IndicatorListResponse, IndicatorInputFieldResponse, IndicatorDraftResponse,
+    BulkDraftRequest, BulkDraftJobResponse, BulkDraftJobListResponse,
+    ManualIngestRequest, ManualIngestJobResponse
 )
 from ..service.report_service import ReportService
+from ..service.bulk_draft_service import BulkDraftService
+from ..service.db_utils import threadpool_session
+from ..service.single_flight import get_single_flight, request_key
+from ..service.indicator_catalog import etag_matches
 
 logger = logging.getLogger(__name__)
 
 
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    """Server-Sent Events 프레임 직렬화"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
 class ReportController:
-    """ESG 매뉴얼 기반 보고서 API 컨트롤러"""
+    """
+    ESG 매뉴얼 기반 보고서 API 컨트롤러
+    - CRUD/목록: 동기 (라우터가 def 핸들러로 threadpool에서 실행)
+    - RAG/LLM: async (세션 진입/종료와 DB 조회는 threadpool, 검색/LLM은 await)
+    """
 
     def __init__(self):
         # 서비스는 요청 단위로 세션을 열어 생성 (여기서는 보관하지 않음)
@@ -60,6 +81,41 @@ class ReportController:
             logger.error(f"보고서 업데이트 API 오류: {e}")
             raise HTTPException(status_code=500, detail=f"보고서 업데이트 중 오류가 발생했습니다: {str(e)}")
 
+    def patch_report(self, request: ReportPatchRequest) -> ReportPatchResponse:
+        try:
+            with get_session() as db:
+                service = ReportService(db)
+                return service.patch_report(request)
+        except Exception as e:
+            logger.error(f"보고서 부분 업데이트 API 오류: {e}")
+            raise HTTPException(status_code=500, detail=f"보고서 부분 업데이트 중 오류가 발생했습니다: {str(e)}")
+
+    def list_report_revisions(self, topic: str, company_name: str) -> ReportRevisionListResponse:
+        try:
+            with get_session() as db:
+                return ReportService(db).list_report_revisions(topic, company_name)
+        except Exception as e:
+            logger.error(f"리비전 목록 조회 API 오류: {e}")
+            raise HTTPException(status_code=500, detail=f"리비전 목록 조회 중 오류가 발생했습니다: {str(e)}")
+
+    def get_report_revision(self, topic: str, company_name: str, revision: int) -> ReportRevisionResponse:
+        try:
+            with get_session() as db:
+                return ReportService(db).get_report_revision(topic, company_name, revision)
+        except Exception as e:
+            logger.error(f"리비전 복원 API 오류: {e}")
+            raise HTTPException(status_code=500, detail=f"리비전 복원 중 오류가 발생했습니다: {str(e)}")
+
+    def diff_report_revisions(
+        self, topic: str, company_name: str, revision: int, against: Optional[int] = None
+    ) -> ReportRevisionDiffResponse:
+        try:
+            with get_session() as db:
+                return ReportService(db).diff_report_revisions(topic, company_name, revision, against)
+        except Exception as e:
+            logger.error(f"리비전 비교 API 오류: {e}")
+            raise HTTPException(status_code=500, detail=f"리비전 비교 중 오류가 발생했습니다: {str(e)}")
+
     def delete_report(self, topic: str, company_name: str) -> ReportDeleteResponse:
         try:
             with get_session() as db:
@@ -98,6 +154,23 @@ class ReportController:
             logger.error(f"보고서 완료 처리 API 오류: {e}")
             raise HTTPException(status_code=500, detail=f"보고서 완료 처리 중 오류가 발생했습니다: {str(e)}")
 
+    def list_reports_page(
+        self,
+        company_name: str,
+        report_type: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        include_counts: bool = False,
+    ) -> ReportPageResponse:
+        try:
+            with get_session() as db:
+                service = ReportService(db)
+                return service.list_reports_page(company_name, report_type, status, limit, cursor, include_counts)
+        except Exception as e:
+            logger.error(f"보고서 목록 페이지 조회 API 오류: {e}")
+            raise HTTPException(status_code=500, detail=f"보고서 목록 조회 중 오류가 발생했습니다: {str(e)}")
+
     def get_report_status(self, company_name: str) -> Dict[str, str]:
         try:
             with get_session() as db:
@@ -107,30 +180,38 @@ class ReportController:
             logger.error(f"보고서 상태 조회 API 오류: {e}")
             raise HTTPException(status_code=500, detail=f"보고서 상태 조회 중 오류가 발생했습니다: {str(e)}")
 
+    # ===== 동일 요청 단일 실행 =====
+    async def _single_flight(self, key: str, method: str, *args, model=None):
+        """같은 키의 호출이 진행 중이면 그 결과를 공유 (DB 세션/검색/LLM 비용 1회)"""
+        async def call():
+            async with threadpool_session() as db:
+                return await getattr(ReportService(db), method)(*args)
+        return await get_single_flight().run(key, call, model)
+
     # ===== ESG 매뉴얼 기반 지표 =====
-    def get_indicator_summary(self, indicator_id: str) -> str:
+    async def get_indicator_summary(self, indicator_id: str) -> str:
         try:
-            with get_session() as db:
-                service = ReportService(db)
-                return service.get_indicator_summary(indicator_id)
+            return await self._single_flight(
+                request_key("summary", indicator_id), "get_indicator_summary", indicator_id
+            )
         except Exception as e:
             logger.error(f"지표 요약 API 오류: {e}")
             raise HTTPException(status_code=500, detail=f"지표 요약 생성 중 오류가 발생했습니다: {str(e)}")
 
-    def generate_input_fields(self, indicator_id: str) -> Dict[str, Any]:
+    async def generate_input_fields(self, indicator_id: str) -> Dict[str, Any]:
         try:
-            with get_session() as db:
-                service = ReportService(db)
-                return service.generate_input_fields(indicator_id)
+            return await self._single_flight(
+                request_key("input-fields", indicator_id), "generate_input_fields", indicator_id
+            )
         except Exception as e:
             logger.error(f"입력 필드 생성 API 오류: {e}")
             raise HTTPException(status_code=500, detail=f"입력 필드 생성 중 오류가 발생했습니다: {str(e)}")
 
-    def generate_indicator_draft(self, indicator_id: str, company_name: str, inputs: Dict[str, Any]) -> str:
+    async def generate_indicator_draft(self, indicator_id: str, company_name: str, inputs: Dict[str, Any]) -> str:
         try:
-            with get_session() as db:
-                service = ReportService(db)
-                return service.generate_indicator_draft(indicator_id, company_name, inputs)
+            return await self._single_flight(
+                request_key("draft", indicator_id, company_name, inputs), "generate_indicator_draft", indicator_id, company_name, inputs
+            )
         except Exception as e:
             logger.error(f"지표 초안 생성 API 오류: {e}")
             raise HTTPException(status_code=500, detail=f"지표 초안 생성 중 오류가 발생했습니다: {str(e)}")
@@ -144,6 +225,15 @@ class ReportController:
             logger.error(f"지표 데이터 저장 API 오류: {e}")
             raise HTTPException(status_code=500, detail=f"지표 데이터 저장 중 오류가 발생했습니다: {str(e)}")
 
+    def patch_indicator_data(self, indicator_id: str, company_name: str, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            with get_session() as db:
+                service = ReportService(db)
+                return service.patch_indicator_data(indicator_id, company_name, inputs)
+        except Exception as e:
+            logger.error(f"지표 데이터 부분 저장 API 오류: {e}")
+            raise HTTPException(status_code=500, detail=f"지표 데이터 부분 저장 중 오류가 발생했습니다: {str(e)}")
+
     def get_indicator_data(self, indicator_id: str, company_name: str) -> Dict[str, Any]:
         try:
             with get_session() as db:
@@ -154,79 +244,220 @@ class ReportController:
             raise HTTPException(status_code=500, detail=f"지표 데이터 조회 중 오류가 발생했습니다: {str(e)}")
 
     # ===== 지표 관리 =====
-    def get_all_indicators(self) -> IndicatorListResponse:
+    def _catalog_response(self, if_none_match: Optional[str], build):
+        """카탈로그 ETag가 If-None-Match와 같으면 304, 아니면 본문 + ETag (프론트는 항상 재검증)"""
+        with get_session() as db:
+            service = ReportService(db)
+            catalog = service.indicator_catalog()
+            if catalog is None:
+                return build(service, None)
+            headers = {"ETag": catalog.etag, "Cache-Control": "no-cache"}
+            if etag_matches(if_none_match, catalog.etag):
+                return Response(status_code=304, headers=headers)
+            result = build(service, catalog)
+        if not result.success:
+            return result
+        return JSONResponse(content=result.model_dump(mode="json"), headers=headers)
+
+    def get_all_indicators(self, if_none_match: Optional[str] = None):
         try:
-            with get_session() as db:
-                service = ReportService(db)
-                return service.get_all_indicators()
+            return self._catalog_response(if_none_match, lambda service, catalog: service.get_all_indicators(catalog))
         except Exception as e:
             logger.error(f"지표 목록 조회 API 오류: {e}")
             raise HTTPException(status_code=500, detail=f"지표 목록 조회 중 오류가 발생했습니다: {str(e)}")
 
-    def get_indicators_by_category(self, category: str) -> IndicatorListResponse:
+    def get_indicators_by_category(self, category: str, if_none_match: Optional[str] = None):
         try:
-            with get_session() as db:
-                service = ReportService(db)
-                return service.get_indicators_by_category(category)
+            return self._catalog_response(
+                if_none_match, lambda service, catalog: service.get_indicators_by_category(category, catalog)
+            )
         except Exception as e:
             logger.error(f"카테고리별 지표 조회 API 오류: {e}")
             raise HTTPException(status_code=500, detail=f"카테고리별 지표 조회 중 오류가 발생했습니다: {str(e)}")
 
-    def get_indicator_with_recommended_fields(self, indicator_id: str) -> IndicatorInputFieldResponse:
+    def refresh_indicator_catalog(self) -> Dict[str, Any]:
         try:
             with get_session() as db:
-                service = ReportService(db)
-                return service.get_indicator_with_recommended_fields(indicator_id)
+                return ReportService(db).refresh_indicator_catalog()
+        except Exception as e:
+            logger.error(f"지표 카탈로그 재로드 API 오류: {e}")
+            raise HTTPException(status_code=500, detail=f"지표 카탈로그 재로드 중 오류가 발생했습니다: {str(e)}")
+
+    async def get_indicator_with_recommended_fields(self, indicator_id: str) -> IndicatorInputFieldResponse:
+        try:
+            return await self._single_flight(
+                request_key("indicator-fields", indicator_id), "get_indicator_with_recommended_fields", indicator_id, model=IndicatorInputFieldResponse
+            )
         except Exception as e:
             logger.error(f"지표 정보 조회 API 오류: {e}")
             raise HTTPException(status_code=500, detail=f"지표 정보 조회 중 오류가 발생했습니다: {str(e)}")
 
-    def generate_enhanced_draft(self, indicator_id: str, company_name: str, inputs: Dict[str, Any]) -> IndicatorDraftResponse:
+    async def generate_enhanced_draft(self, indicator_id: str, company_name: str, inputs: Dict[str, Any]) -> IndicatorDraftResponse:
         try:
-            with get_session() as db:
-                service = ReportService(db)
-                return service.generate_enhanced_draft(indicator_id, company_name, inputs)
+            return await self._single_flight(
+                request_key("enhanced-draft", indicator_id, company_name, inputs), "generate_enhanced_draft", indicator_id, company_name, inputs, model=IndicatorDraftResponse
+            )
         except Exception as e:
             logger.error(f"향상된 초안 생성 API 오류: {e}")
             raise HTTPException(status_code=500, detail=f"향상된 초안 생성 중 오류가 발생했습니다: {str(e)}")
 
     # ===== 개별 지표 처리 메서드 (새로 추가) =====
-    def process_single_indicator(self, indicator_id: str, company_name: str, inputs: Dict[str, Any]) -> IndicatorDraftResponse:
+    async def process_single_indicator(self, indicator_id: str, company_name: str, inputs: Dict[str, Any]) -> IndicatorDraftResponse:
         """
         개별 지표 처리: 입력필드 생성 → 초안 생성 (한 번에 처리)
         """
         try:
-            with get_session() as db:
-                service = ReportService(db)
-                return service.process_single_indicator(indicator_id, company_name, inputs)
+            return await self._single_flight(
+                request_key("process", indicator_id, company_name, inputs), "process_single_indicator", indicator_id, company_name, inputs, model=IndicatorDraftResponse
+            )
         except Exception as e:
             logger.error(f"개별 지표 처리 API 오류: {e}")
             raise HTTPException(status_code=500, detail=f"개별 지표 처리 중 오류가 발생했습니다: {str(e)}")
 
-    def generate_input_fields_only(self, indicator_id: str) -> Dict[str, Any]:
+    async def generate_input_fields_only(self, indicator_id: str) -> Dict[str, Any]:
         """
         개별 지표의 입력필드만 생성 (RAG 기반)
         """
         try:
-            with get_session() as db:
-                service = ReportService(db)
-                return service.generate_input_fields_only(indicator_id)
+            return await self._single_flight(
+                request_key("input-fields-only", indicator_id), "generate_input_fields_only", indicator_id
+            )
         except Exception as e:
             logger.error(f"입력필드 생성 API 오류: {e}")
             raise HTTPException(status_code=500, detail=f"입력필드 생성 중 오류가 발생했습니다: {str(e)}")
 
-    def generate_indicator_draft_only(self, indicator_id: str, company_name: str, inputs: Dict[str, Any]) -> IndicatorDraftResponse:
+    async def generate_indicator_draft_only(self, indicator_id: str, company_name: str, inputs: Dict[str, Any]) -> IndicatorDraftResponse:
         """
         개별 지표의 초안만 생성 (입력된 데이터 기반)
         """
         try:
-            with get_session() as db:
-                service = ReportService(db)
-                return service.generate_indicator_draft_only(indicator_id, company_name, inputs)
+            return await self._single_flight(
+                request_key("draft-only", indicator_id, company_name, inputs), "generate_indicator_draft_only", indicator_id, company_name, inputs, model=IndicatorDraftResponse
+            )
         except Exception as e:
             logger.error(f"지표 초안 생성 API 오류: {e}")
             raise HTTPException(status_code=500, detail=f"지표 초안 생성 중 오류가 발생했습니다: {str(e)}")
 
+    # ===== 초안 스트리밍 (SSE) =====
+
+    def stream_indicator_draft(
+        self, indicator_id: str, company_name: str, inputs: Dict[str, Any], require_indicator: bool = False
+    ) -> StreamingResponse:
+        """
+        초안 생성 SSE 스트리밍
+        - start 이벤트를 즉시 보내 TTFB를 생성 시간과 분리
+        - DB 세션은 검색/프롬프트 구성 단계에서만 사용하고 LLM 스트리밍 전에 반환
+        """
+        async def events() -> AsyncIterator[str]:
+            yield _sse("start", {"indicator_id": indicator_id, "company_name": company_name})
+            try:
+                async with threadpool_session() as db:
+                    service = ReportService(db)
+                    prepared = await service.prepare_indicator_draft(
+                        indicator_id, company_name, inputs, require_indicator=require_indicator
+                    )
+                if prepared.get("chunk_ids"):
+                    yield _sse("retrieval", {"chunk_ids": prepared["chunk_ids"], "retrieval_ms": prepared.get("retrieval_ms")})
+                async for ev in service.stream_indicator_draft(prepared):
+                    yield _sse(ev["event"], ev["data"])
+            except Exception as e:
+                logger.error(f"지표 초안 스트리밍 API 오류: {e}")
+                yield _sse("error", {"message": f"지표 초안 생성 중 오류가 발생했습니다: {str(e)}"})
+
+        return StreamingResponse(
+            events(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    # ===== 일괄 초안 생성 잡 =====
+    async def start_bulk_draft_job(self, request: BulkDraftRequest) -> BulkDraftJobResponse:
+        if not request.indicator_ids and not request.category:
+            raise HTTPException(status_code=400, detail="indicator_ids 또는 category 중 하나는 필요합니다.")
+        try:
+            bulk = BulkDraftService()
+            indicator_ids = await run_in_threadpool(bulk.resolve_indicator_ids, request.indicator_ids, request.category)
+            if not indicator_ids:
+                raise HTTPException(status_code=404, detail="초안을 생성할 지표가 없습니다.")
+            job = bulk.submit(
+                request.company_name, indicator_ids, inputs=request.inputs,
+                concurrency=request.concurrency, rate_per_minute=request.rate_per_minute,
+            )
+            return BulkDraftJobResponse(
+                success=True, message=f"{len(indicator_ids)}개 지표의 초안 생성 잡을 시작했습니다.",
+                **job.snapshot()
+            )
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"일괄 초안 잡 생성 API 오류: {e}")
+            raise HTTPException(status_code=500, detail=f"일괄 초안 잡 생성 중 오류가 발생했습니다: {str(e)}")
+
+    def get_bulk_draft_job(self, job_id: str) -> BulkDraftJobResponse:
+        job = BulkDraftService().get_job(job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail=f"잡 {job_id}를 찾을 수 없습니다.")
+        return BulkDraftJobResponse(success=True, message="", **job.snapshot())
+
+    def list_bulk_draft_jobs(self, company_name: Optional[str] = None) -> BulkDraftJobListResponse:
+        jobs = [
+            BulkDraftJobResponse(success=True, message="", **job.snapshot())
+            for job in BulkDraftService().list_jobs(company_name)
+        ]
+        return BulkDraftJobListResponse(
+            success=True, message=f"{len(jobs)}개의 잡을 조회했습니다.",
+            jobs=jobs, total_count=len(jobs)
+        )
+
+    # ===== RAG 진단 =====
+    def get_embedding_stats(self) -> Dict[str, Any]:
+        """임베딩 마이크로 배처 통계 (임베더가 아직 로드되지 않았으면 빈 값)"""
+        from ..service.rag_utils import embedding_stats
+        return {"success": True, "embedders": embedding_stats()}
+
+    def get_llm_stats(self) -> Dict[str, Any]:
+        """공유 LLM 클라이언트 대기/모델 시간, 재시도 통계 + 동일 요청 공유(single-flight) 통계"""
+        from ..service.llm_client import llm_stats
+        return {"success": True, "llm": llm_stats(), "single_flight": get_single_flight().stats()}
+
+
+    # ===== ESG 매뉴얼 색인 =====
+    def start_manual_ingest(self, request: ManualIngestRequest) -> ManualIngestJobResponse:
+        from ..service.manual_ingest import start_ingest_job
+        try:
+            job = start_ingest_job(
+                request.source_path, request.collection_name,
+                force=request.force, embed_batch=request.embed_batch,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except FileNotFoundError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        except RuntimeError as e:
+            raise HTTPException(status_code=409, detail=str(e))
+        return ManualIngestJobResponse(success=True, message="색인을 시작했습니다.", **job.snapshot())
+
+    def get_manual_ingest_job(self, job_id: str) -> ManualIngestJobResponse:
+        from ..service.manual_ingest import get_ingest_job
+        job = get_ingest_job(job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail=f"색인 잡 {job_id}를 찾을 수 없습니다.")
+        return ManualIngestJobResponse(success=True, message="", **job.snapshot())
+
+
+    # ===== 로컬 벡터 미러 =====
+    def get_vector_mirror_status(self) -> Dict[str, Any]:
+        from ..service.vector_mirror import mirror_enabled, mirror_status
+        return {"success": True, "enabled": mirror_enabled(), "mirrors": mirror_status()}
+
+    def sync_vector_mirror(self, collection_name: str) -> Dict[str, Any]:
+        from ..service.vector_mirror import get_vector_mirror
+        mirror = get_vector_mirror(collection_name)
+        if mirror is None:
+            raise HTTPException(status_code=404, detail=f"'{collection_name}' 미러가 비활성화되어 있습니다. (VECTOR_MIRROR=1)")
+        rebuilt = mirror.sync()
+        return {"success": mirror.last_error is None, "rebuilt": rebuilt, "mirror": mirror.status()}
+
 
 def get_report_controller() -> ReportController:
     return ReportController()
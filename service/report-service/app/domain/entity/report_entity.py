@@ -1,7 +1,7 @@
 """
 Report Entity - 보고서 및 지표 데이터베이스 모델
 """
-from sqlalchemy import Column, String, DateTime, Text, Integer, JSON, UniqueConstraint, Index
+from sqlalchemy import Column, String, DateTime, Text, Integer, JSON, LargeBinary, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.sql import func
 from eripotter_common.database.base import Base
 
@@ -32,6 +32,29 @@ class Report(Base):
         from_attributes = True
 
 
+class ReportRevision(Base):
+    """보고서 본문 리비전 (직전 리비전 대비 delta, 주기적 전체 스냅샷 - revision_codec 참고)"""
+    __tablename__ = "report_revision"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    report_id = Column(Integer, ForeignKey("report.id", ondelete="CASCADE"), nullable=False)
+    revision = Column(Integer, nullable=False)                  # 보고서별 1부터 증가
+    kind = Column(String, nullable=False)                       # snapshot, delta
+    data = Column(LargeBinary, nullable=False)                  # zlib 압축 본문 또는 delta
+    content_hash = Column(String(64), nullable=False)           # 복원 본문 sha256
+    content_length = Column(Integer, nullable=False)            # 복원 본문 길이 (문자)
+    source = Column(String, nullable=True)                      # create, update, draft, patch
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("report_id", "revision", name="uq_report_revision"),
+    )
+
+    class Config:
+        from_attributes = True
+
+
 class Indicator(Base):
     __tablename__ = "indicator"
 
@@ -1,8 +1,8 @@
 """
 Report Models - 보고서 관련 API 요청/응답 모델
 """
-from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Dict, Any, Optional
+from pydantic import BaseModel, Field, ConfigDict, model_validator
+from typing import List, Dict, Any, Optional, Literal
 from datetime import datetime
 
 # 기본 응답 모델
@@ -57,6 +57,67 @@ class ReportUpdateResponse(BaseResponse):
     report_id: int
     updated_at: datetime
 
+# 보고서 부분 업데이트(PATCH) 요청/응답
+class ReportContentEdit(BaseModel):
+    op: Literal["append", "replace"] = Field("append", description="append: 끝에 추가, replace: [start, end) 치환")
+    text: str = Field("", description="추가/치환할 텍스트")
+    start: Optional[int] = Field(None, ge=0, description="치환 시작 위치 (문자 단위, 0부터)")
+    end: Optional[int] = Field(None, ge=0, description="치환 끝 위치 (미포함, 생략 시 start 위치에 삽입)")
+
+    @model_validator(mode="after")
+    def _check_range(self):
+        if self.op == "replace":
+            if self.start is None:
+                raise ValueError("replace 편집에는 start가 필요합니다.")
+            if self.end is not None and self.end < self.start:
+                raise ValueError("end는 start보다 작을 수 없습니다.")
+        return self
+
+class ReportPatchRequest(BaseModel):
+    topic: str = Field(..., description="지표 ID")
+    company_name: str = Field(..., description="회사명")
+    title: Optional[str] = Field(None, description="보고서 제목")
+    status: Optional[str] = Field(None, description="상태")
+    metadata_patch: Optional[Dict[str, Any]] = Field(None, description="메타데이터 RFC 7396 merge patch (null 값은 키 삭제)")
+    content_edits: List[ReportContentEdit] = Field(default_factory=list, max_length=100, description="본문 편집 (순서대로 적용)")
+
+class ReportPatchResponse(BaseResponse):
+    report_id: int
+    updated_at: Optional[datetime]
+    content_length: int = 0
+
+# 보고서 본문 리비전
+class ReportRevisionInfo(BaseModel):
+    revision: int
+    kind: str
+    source: Optional[str] = None
+    content_length: int
+    stored_bytes: int
+    created_at: Optional[datetime] = None
+
+class ReportRevisionListResponse(BaseResponse):
+    topic: str
+    company_name: str
+    revisions: List[ReportRevisionInfo]
+    total_count: int
+    stored_bytes: int = 0
+
+class ReportRevisionResponse(BaseResponse):
+    topic: str
+    company_name: str
+    revision: int
+    kind: Optional[str] = None
+    source: Optional[str] = None
+    content: Optional[str] = None
+    content_length: int = 0
+    created_at: Optional[datetime] = None
+    applied_deltas: int = 0
+
+class ReportRevisionDiffResponse(BaseResponse):
+    revision: int
+    against: int
+    diff: str = ""
+
 # 보고서 삭제 요청/응답
 class ReportDeleteRequest(BaseModel):
     topic: str = Field(..., description="지표 ID")
@@ -70,6 +131,24 @@ class ReportListResponse(BaseResponse):
     reports: List[ReportGetResponse]
     total_count: int
 
+# 보고서 목록 페이지 (keyset 페이지네이션, content/metadata 제외)
+class ReportSummary(BaseModel):
+    id: int
+    topic: str
+    company_name: str
+    report_type: str
+    title: Optional[str] = None
+    status: str
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+class ReportPageResponse(BaseResponse):
+    reports: List[ReportSummary]
+    next_cursor: Optional[str] = Field(None, description="다음 페이지 요청 시 cursor 로 전달 (없으면 마지막 페이지)")
+    has_more: bool = False
+    status_counts: Optional[Dict[str, int]] = Field(None, description="include_counts=true 일 때 상태별 보고서 수")
+    total_count: Optional[int] = Field(None, description="include_counts=true 일 때 전체 보고서 수")
+
 # 보고서 완료 처리 요청/응답
 class ReportCompleteRequest(BaseModel):
     topic: str = Field(..., description="지표 ID")
@@ -89,6 +168,10 @@ class IndicatorSaveRequest(BaseModel):
     company_name: str
     inputs: Dict[str, Any] = Field(default_factory=dict)
 
+class IndicatorPatchRequest(BaseModel):
+    company_name: str
+    inputs: Dict[str, Any] = Field(default_factory=dict, description="변경된 입력값만 (null 은 삭제)")
+
 
 # ===== 지표 관리 모델 =====
 
@@ -119,3 +202,70 @@ class IndicatorDraftResponse(BaseResponse):
     company_name: str
     draft_content: str
     generated_at: datetime
+
+
+# ===== 일괄 초안 생성 잡 =====
+
+class BulkDraftRequest(BaseModel):
+    company_name: str
+    indicator_ids: Optional[List[str]] = Field(None, description="초안을 생성할 지표 ID 목록")
+    category: Optional[str] = Field(None, description="indicator_ids 미지정 시 카테고리 전체 지표 사용")
+    inputs: Dict[str, Dict[str, Any]] = Field(default_factory=dict, description="지표별 입력값 (미지정 시 저장된 입력값 사용)")
+    concurrency: Optional[int] = Field(None, ge=1, description="동시 처리 지표 수")
+    rate_per_minute: Optional[float] = Field(None, gt=0, description="분당 LLM 호출 상한")
+
+class BulkDraftItemStatus(BaseModel):
+    indicator_id: str
+    status: str                                  # pending, retrieving, drafting, saved, skipped, failed
+    report_id: Optional[int] = None
+    chunk_ids: List[str] = Field(default_factory=list)
+    draft_chars: Optional[int] = None
+    rate_wait_ms: Optional[float] = None
+    llm_ms: Optional[float] = None
+    duration_ms: Optional[float] = None
+    error: Optional[str] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+class BulkDraftJobResponse(BaseResponse):
+    job_id: str
+    company_name: str
+    status: str                                  # pending, running, completed, partial, failed
+    total: int
+    completed: int
+    failed: int
+    skipped: int
+    in_progress: int
+    progress: float
+    concurrency: int
+    rate_per_minute: float
+    elapsed_seconds: Optional[float] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    items: List[BulkDraftItemStatus] = Field(default_factory=list)
+
+class BulkDraftJobListResponse(BaseResponse):
+    jobs: List[BulkDraftJobResponse]
+    total_count: int
+
+
+# ===== ESG 매뉴얼 색인 잡 =====
+
+class ManualIngestRequest(BaseModel):
+    source_path: str = Field(..., description="DOC_ROOT 기준 청크 파일(.jsonl/.json) 또는 디렉토리 경로")
+    collection_name: str = Field(
+        "esg_manual", pattern=r"^[A-Za-z0-9_-]+$", description="Qdrant 컬렉션 이름 (체크포인트 파일명으로도 사용)"
+    )
+    force: bool = Field(False, description="content_hash 비교 없이 전체 재색인")
+    embed_batch: Optional[int] = Field(None, ge=1, description="임베딩 배치 크기")
+
+class ManualIngestJobResponse(BaseResponse):
+    job_id: str
+    collection_name: str
+    source_path: str
+    status: str                                  # running, completed, failed
+    stats: Dict[str, Any] = Field(default_factory=dict)
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
@@ -2,13 +2,15 @@
 Report Repository - Report 엔터티 CRUD/조회
 - Entity의 예약어 충돌을 피하기 위해, 파이썬 속성명은 meta(컬럼명은 "metadata")
 - (topic, company_name) 유니크 제약 기반의 안전한 생성/업데이트
+- 부분 업데이트(patch_report)는 DB 함수(statement/report_patch_functions.sql)로 서버에서 병합
 """
 from __future__ import annotations
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import select, update, and_
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select, update, and_, func, literal, literal_column, cast, tuple_, Integer, JSON
+from sqlalchemy.dialects.postgresql import JSONB, aggregate_order_by
+from sqlalchemy.exc import IntegrityError, DBAPIError
 from datetime import datetime
 
 from ..entity.report_entity import Report, Indicator
@@ -108,6 +110,65 @@ class ReportRepository:
         self.db.refresh(obj)
         return obj
 
+    def patch_report(
+        self,
+        *,
+        topic: str,
+        company_name: str,
+        metadata_patch: Optional[Dict[str, Any]] = None,
+        content_edits: Optional[List[Dict[str, Any]]] = None,
+        title: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        부분 업데이트 (UPDATE 1회, 본문/메타데이터를 읽어오지 않음)
+        - metadata: RFC 7396 merge patch 를 jsonb_merge_patch 로 DB에서 병합 (null 값은 키 삭제)
+        - content: 편집 목록을 순서대로 report_content_splice 로 적용
+          {"start": None} → 끝에 추가, {"start": s, "end": e} → [s, e) 치환 (문자 단위)
+        - 범위가 본문 길이를 벗어나면 ValueError (아무것도 반영하지 않음)
+        - 반환: {"id", "updated_at", "content_length"} / 보고서 없으면 None
+        """
+        values: Dict[Any, Any] = {}
+        if title is not None:
+            values[Report.title] = title
+        if status is not None:
+            values[Report.status] = status
+        if metadata_patch is not None:
+            values[Report.meta] = cast(
+                func.jsonb_merge_patch(cast(Report.meta, JSONB), literal(metadata_patch, JSONB), type_=JSONB),
+                JSON,
+            )
+        if content_edits:
+            content = Report.content
+            for edit in content_edits:
+                content = func.report_content_splice(
+                    content,
+                    literal(edit.get("start"), Integer),
+                    literal(edit.get("end"), Integer),
+                    literal(edit.get("text") or ""),
+                )
+            values[Report.content] = content
+        if not values:
+            raise ValueError("변경할 항목이 없습니다.")
+
+        stmt = (
+            update(Report)
+            .where(and_(Report.topic == topic, Report.company_name == company_name))
+            .values(values)
+            .returning(Report.id, Report.updated_at, func.char_length(func.coalesce(Report.content, "")))
+        )
+        try:
+            row = self.db.execute(stmt).first()
+            self.db.commit()
+        except DBAPIError as e:
+            self.db.rollback()
+            if getattr(e.orig, "pgcode", None) == "22023":
+                raise ValueError(str(e.orig).strip().splitlines()[0]) from e
+            raise
+        if row is None:
+            return None
+        return {"id": row[0], "updated_at": row[1], "content_length": row[2]}
+
     def delete_report(self, topic: str, company_name: str) -> bool:
         obj = self._get_by_topic_company(topic, company_name)
         if not obj:
@@ -133,6 +194,47 @@ class ReportRepository:
         )
         return list(self.db.scalars(stmt).all())
 
+    def list_report_summaries(
+        self,
+        company_name: str,
+        *,
+        report_type: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 50,
+        after: Optional[Tuple[datetime, int]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        목록 화면용 keyset 페이지 조회 (content/metadata 제외)
+        - 정렬: updated_at DESC, id DESC (ix_report_company_updated)
+        - after=(updated_at, id): 이전 페이지 마지막 행 이후부터
+        - 다음 페이지 존재 여부 판단을 위해 limit+1 행까지 반환
+        """
+        conditions = [Report.company_name == company_name]
+        if report_type:
+            conditions.append(Report.report_type == report_type)
+        if status:
+            conditions.append(Report.status == status)
+        if after is not None:
+            conditions.append(tuple_(Report.updated_at, Report.id) < tuple_(literal(after[0], Report.updated_at.type), literal(after[1])))
+        stmt = (
+            select(
+                Report.id, Report.topic, Report.company_name, Report.report_type,
+                Report.title, Report.status, Report.created_at, Report.updated_at,
+            )
+            .where(and_(*conditions))
+            .order_by(Report.updated_at.desc(), Report.id.desc())
+            .limit(limit + 1)
+        )
+        return [dict(row._mapping) for row in self.db.execute(stmt)]
+
+    def count_reports_by_status(self, company_name: str, report_type: Optional[str] = None) -> Dict[str, int]:
+        """상태별 보고서 수 (GROUP BY 1회)"""
+        conditions = [Report.company_name == company_name]
+        if report_type:
+            conditions.append(Report.report_type == report_type)
+        stmt = select(Report.status, func.count(Report.id)).where(and_(*conditions)).group_by(Report.status)
+        return {status: count for status, count in self.db.execute(stmt)}
+
     def complete_report(self, topic: str, company_name: str) -> bool:
         obj = self._get_by_topic_company(topic, company_name)
         if not obj:
@@ -211,6 +313,18 @@ class ReportRepository:
         
         return indicators
     
+    def get_indicator_catalog_version(self) -> str:
+        """지표 카탈로그 버전 (kbz 행 수 / 최대 id / 내용 md5) - 카탈로그 캐시 변경 감지용"""
+        from ..entity.report_entity import KBZIndicator
+        row_text = func.concat_ws("|", KBZIndicator.id, KBZIndicator.category, KBZIndicator.title, KBZIndicator.sub_title)
+        stmt = select(
+            func.count(KBZIndicator.id),
+            func.max(KBZIndicator.id),
+            func.md5(func.string_agg(row_text, aggregate_order_by(literal_column("','"), KBZIndicator.id))),
+        )
+        count, max_id, digest = self.db.execute(stmt).one()
+        return f"{count}:{max_id or 0}:{digest or ''}"
+
     def get_indicator_by_id(self, indicator_id: str) -> Optional[Indicator]:
         """지표 ID로 지표 조회 (KBZ 테이블에서 조회)"""
         from ..entity.report_entity import KBZIndicator
@@ -0,0 +1,91 @@
+"""
+Report Revision Repository - 보고서 본문 리비전 저장/조회
+- 복원에 필요한 행만 조회: 대상 리비전 이하의 마지막 스냅샷 ~ 대상 리비전
+- 목록 조회는 data 컬럼을 읽지 않고 저장 크기(length)만 계산
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func, and_
+from sqlalchemy.exc import IntegrityError
+
+from ..entity.report_entity import ReportRevision
+
+
+class ReportRevisionRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_chain(self, report_id: int, revision: Optional[int] = None) -> List[ReportRevision]:
+        """revision(기본: 최신) 복원용 체인 (마지막 스냅샷부터 오름차순)"""
+        if revision is None:
+            revision = self.db.scalar(
+                select(func.max(ReportRevision.revision)).where(ReportRevision.report_id == report_id)
+            )
+            if revision is None:
+                return []
+        snapshot = (
+            select(func.max(ReportRevision.revision))
+            .where(and_(
+                ReportRevision.report_id == report_id,
+                ReportRevision.kind == "snapshot",
+                ReportRevision.revision <= revision,
+            ))
+            .scalar_subquery()
+        )
+        stmt = (
+            select(ReportRevision)
+            .where(and_(
+                ReportRevision.report_id == report_id,
+                ReportRevision.revision <= revision,
+                ReportRevision.revision >= snapshot,
+            ))
+            .order_by(ReportRevision.revision)
+        )
+        return list(self.db.scalars(stmt).all())
+
+    def add_revision(
+        self,
+        *,
+        report_id: int,
+        revision: int,
+        kind: str,
+        data: bytes,
+        content_hash: str,
+        content_length: int,
+        source: Optional[str] = None,
+    ) -> Optional[ReportRevision]:
+        """리비전 추가 (같은 번호가 동시에 저장되면 None)"""
+        obj = ReportRevision(
+            report_id=report_id,
+            revision=revision,
+            kind=kind,
+            data=data,
+            content_hash=content_hash,
+            content_length=content_length,
+            source=source,
+        )
+        self.db.add(obj)
+        try:
+            self.db.commit()
+        except IntegrityError:
+            self.db.rollback()
+            return None
+        return obj
+
+    def list_revisions(self, report_id: int) -> List[Dict[str, Any]]:
+        """리비전 목록 (최신순, data 제외)"""
+        stmt = (
+            select(
+                ReportRevision.revision,
+                ReportRevision.kind,
+                ReportRevision.source,
+                ReportRevision.content_length,
+                func.length(ReportRevision.data).label("stored_bytes"),
+                ReportRevision.created_at,
+            )
+            .where(ReportRevision.report_id == report_id)
+            .order_by(ReportRevision.revision.desc())
+        )
+        return [dict(row._mapping) for row in self.db.execute(stmt)]
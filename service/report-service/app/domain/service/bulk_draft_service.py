@@ -0,0 +1,245 @@
+"""
+Bulk Draft Service - 회사 단위 지표 초안 일괄 생성 잡
+- 지표별 작업(검색 → LLM 초안 → 저장)을 동시성 제한(Semaphore) + 속도 제한(TokenBucket) 하에서 병렬 실행
+- 검색/LLM은 이벤트 루프에서 await, DB 작업만 threadpool (지표당 스레드를 점유하지 않음)
+- 지표마다 DB 세션을 짧게 열고 닫음 (LLM 호출 중에는 세션을 점유하지 않음)
+- 잡 상태는 프로세스 메모리에 보관 (재시작 시 사라짐)
+- 지표 오류가 있으면 잡 상태는 partial (일부 저장) / failed (저장 0건)
+- LLM_BACKEND=stub 으로 OpenAI 없이 처리량 측정 가능
+"""
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime
+from uuid import uuid4
+import asyncio
+import logging
+import os
+import threading
+import time
+
+from starlette.concurrency import run_in_threadpool
+
+from eripotter_common.database import get_session
+from .db_utils import threadpool_session
+from .report_service import ReportService
+from .llm_client import get_llm_client
+from .throttle import TokenBucket
+from .instrumentation import span
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = int(os.getenv("BULK_DRAFT_CONCURRENCY", "4"))
+MAX_CONCURRENCY = int(os.getenv("BULK_DRAFT_MAX_CONCURRENCY", "16"))
+DEFAULT_RATE_PER_MINUTE = float(os.getenv("BULK_DRAFT_RATE_PER_MINUTE", "60"))
+MAX_JOBS_KEPT = int(os.getenv("BULK_DRAFT_MAX_JOBS", "100"))
+FINISHED_STATUSES = ("completed", "partial", "failed")
+
+
+class BulkDraftJob:
+    """일괄 초안 생성 잡 상태"""
+
+    def __init__(
+        self,
+        company_name: str,
+        indicator_ids: List[str],
+        inputs: Dict[str, Dict[str, Any]],
+        concurrency: int,
+        rate_per_minute: float,
+    ):
+        self.job_id = uuid4().hex
+        self.company_name = company_name
+        self.indicator_ids = indicator_ids
+        self.inputs = inputs
+        self.concurrency = concurrency
+        self.rate_per_minute = rate_per_minute
+        self.status = "pending"          # pending, running, completed, partial, failed
+        self.created_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.items: Dict[str, Dict[str, Any]] = {
+            i: {"indicator_id": i, "status": "pending"} for i in indicator_ids
+        }
+        self._lock = threading.Lock()
+
+    def update_item(self, indicator_id: str, **fields):
+        with self._lock:
+            self.items[indicator_id].update(fields)
+
+    def final_status(self) -> str:
+        """지표 결과로 잡 상태 결정: 오류 없음 completed / 일부 오류 partial / 저장 0건 + 오류 failed"""
+        with self._lock:
+            statuses = [item["status"] for item in self.items.values()]
+        if "failed" not in statuses:
+            return "completed"
+        return "partial" if "saved" in statuses else "failed"
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            items = [dict(self.items[i]) for i in self.indicator_ids]
+        counts: Dict[str, int] = {}
+        for item in items:
+            counts[item["status"]] = counts.get(item["status"], 0) + 1
+        done = counts.get("saved", 0) + counts.get("failed", 0) + counts.get("skipped", 0)
+        elapsed = None
+        if self.started_at:
+            elapsed = ((self.finished_at or datetime.now()) - self.started_at).total_seconds()
+        return {
+            "job_id": self.job_id,
+            "company_name": self.company_name,
+            "status": self.status,
+            "total": len(items),
+            "completed": counts.get("saved", 0),
+            "failed": counts.get("failed", 0),
+            "skipped": counts.get("skipped", 0),
+            "in_progress": len(items) - done - counts.get("pending", 0),
+            "progress": round(done / len(items), 4) if items else 1.0,
+            "concurrency": self.concurrency,
+            "rate_per_minute": self.rate_per_minute,
+            "elapsed_seconds": round(elapsed, 3) if elapsed is not None else None,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "items": items,
+        }
+
+
+class BulkDraftService:
+    """일괄 초안 생성 잡 실행기 (프로세스 단위 잡 레지스트리)"""
+
+    _jobs: Dict[str, BulkDraftJob] = {}
+    _tasks: Dict[str, asyncio.Task] = {}
+
+    # ---------- 잡 생성/조회 ----------
+    def resolve_indicator_ids(self, indicator_ids: Optional[List[str]], category: Optional[str]) -> List[str]:
+        """명시된 지표 목록 또는 카테고리의 전체 지표 ID (순서 유지, 중복 제거)"""
+        if indicator_ids:
+            return list(dict.fromkeys(i for i in indicator_ids if i))
+        if not category:
+            return []
+        with get_session() as db:
+            service = ReportService(db)
+            indicators = service.report_repository.get_indicators_by_category(category)
+            return list(dict.fromkeys(ind.indicator_id for ind in indicators))
+
+    def submit(
+        self,
+        company_name: str,
+        indicator_ids: List[str],
+        inputs: Optional[Dict[str, Dict[str, Any]]] = None,
+        concurrency: Optional[int] = None,
+        rate_per_minute: Optional[float] = None,
+    ) -> BulkDraftJob:
+        """잡 등록 후 현재 이벤트 루프에서 백그라운드 실행"""
+        job = BulkDraftJob(
+            company_name=company_name,
+            indicator_ids=indicator_ids,
+            inputs=inputs or {},
+            concurrency=max(1, min(concurrency or DEFAULT_CONCURRENCY, MAX_CONCURRENCY)),
+            rate_per_minute=rate_per_minute or DEFAULT_RATE_PER_MINUTE,
+        )
+        self._register(job)
+        self._tasks[job.job_id] = asyncio.get_running_loop().create_task(self.run(job))
+        logger.info(
+            f"🗂️ 일괄 초안 잡 등록: {job.job_id} (회사={company_name}, 지표 {len(indicator_ids)}개, "
+            f"동시성={job.concurrency}, 분당={job.rate_per_minute})"
+        )
+        return job
+
+    def get_job(self, job_id: str) -> Optional[BulkDraftJob]:
+        return self._jobs.get(job_id)
+
+    def list_jobs(self, company_name: Optional[str] = None) -> List[BulkDraftJob]:
+        jobs = [j for j in self._jobs.values() if not company_name or j.company_name == company_name]
+        return sorted(jobs, key=lambda j: j.created_at, reverse=True)
+
+    def _register(self, job: BulkDraftJob):
+        self._jobs[job.job_id] = job
+        # 오래된 완료 잡부터 정리
+        finished = [j for j in self.list_jobs() if j.status in FINISHED_STATUSES]
+        while len(self._jobs) > MAX_JOBS_KEPT and finished:
+            old = finished.pop()
+            self._jobs.pop(old.job_id, None)
+            self._tasks.pop(old.job_id, None)
+
+    # ---------- 실행 ----------
+    async def run(self, job: BulkDraftJob):
+        job.status = "running"
+        job.started_at = datetime.now()
+        semaphore = asyncio.Semaphore(job.concurrency)
+        bucket = TokenBucket(rate_per_sec=job.rate_per_minute / 60.0, capacity=job.concurrency)
+
+        async def worker(indicator_id: str):
+            async with semaphore:
+                await self._process_indicator(job, indicator_id, bucket)
+
+        try:
+            await asyncio.gather(*(worker(i) for i in job.indicator_ids))
+            job.status = job.final_status()
+        except Exception:
+            logger.exception(f"일괄 초안 잡 실패: {job.job_id}")
+            job.status = "failed"
+        finally:
+            job.finished_at = datetime.now()
+            snap = job.snapshot()
+            logger.info(
+                f"✅ 일괄 초안 잡 종료: {job.job_id} status={job.status} "
+                f"saved={snap['completed']} failed={snap['failed']} skipped={snap['skipped']} "
+                f"({snap['elapsed_seconds']}s)"
+            )
+
+    async def _prepare(self, job: BulkDraftJob, indicator_id: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """입력값 결정 + RAG 검색/프롬프트 구성 → (inputs, prompt)"""
+        async with threadpool_session() as db:
+            service = ReportService(db)
+            inputs = job.inputs.get(indicator_id)
+            if inputs is None:
+                existing = await run_in_threadpool(service.report_repository.get_report, indicator_id, job.company_name)
+                inputs = ((getattr(existing, "meta", None) or {}).get("inputs") or {}) if existing else {}
+            inputs = service._coerce_field_schema_to_values(inputs)
+            prompt = await service._build_draft_messages(indicator_id, job.company_name, inputs)
+        return inputs, prompt
+
+    async def _save(self, job: BulkDraftJob, indicator_id: str, draft: str, inputs: Dict[str, Any]) -> Optional[int]:
+        """초안 저장 (threadpool) → 보고서 ID"""
+        def save() -> Optional[int]:
+            with get_session() as db:
+                saved = ReportService(db).save_indicator_draft(indicator_id, job.company_name, draft, inputs)
+                return getattr(saved, "id", None)
+
+        return await run_in_threadpool(save)
+
+    async def _process_indicator(self, job: BulkDraftJob, indicator_id: str, bucket: TokenBucket):
+        """지표 1개 처리: 검색/프롬프트 → 속도 제한 → LLM → 저장"""
+        started = time.perf_counter()
+        job.update_item(indicator_id, status="retrieving", started_at=datetime.now())
+        try:
+            inputs, prompt = await self._prepare(job, indicator_id)
+
+            if not prompt["messages"]:
+                job.update_item(
+                    indicator_id, status="skipped", finished_at=datetime.now(),
+                    error="RAG 검색 결과가 없습니다.",
+                    duration_ms=round((time.perf_counter() - started) * 1000, 1),
+                )
+                return
+
+            waited = await bucket.acquire_async()
+            job.update_item(indicator_id, status="drafting", rate_wait_ms=round(waited * 1000, 1))
+            llm_started = time.perf_counter()
+            with span("llm"):
+                resp = await get_llm_client(temperature=0.3, max_tokens=3000).ainvoke(prompt["messages"])
+            draft = resp.content.strip()
+            llm_ms = round((time.perf_counter() - llm_started) * 1000, 1)
+
+            report_id = await self._save(job, indicator_id, draft, inputs)
+
+            job.update_item(
+                indicator_id, status="saved", finished_at=datetime.now(),
+                report_id=report_id, chunk_ids=prompt["chunk_ids"], draft_chars=len(draft),
+                llm_ms=llm_ms, duration_ms=round((time.perf_counter() - started) * 1000, 1),
+            )
+        except Exception as e:
+            logger.exception(f"일괄 초안 지표 처리 실패: {job.job_id} / {indicator_id}")
+            job.update_item(
+                indicator_id, status="failed", finished_at=datetime.now(), error=str(e),
+                duration_ms=round((time.perf_counter() - started) * 1000, 1),
+            )
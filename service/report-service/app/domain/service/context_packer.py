@@ -0,0 +1,198 @@
+"""
+프롬프트 컨텍스트 패커 (토큰 예산 기반)
+- 검색 청크 중복 제거(chunk_id 동일 / 내용 포함 / n-gram 유사도) → 점수순 정렬
+- 예산 안에서 청크를 채우고, 넘치는 청크는 잘라내거나(trim) 제외
+- 표 HTML은 원문 삽입이 원칙이라 자르지 않고, 남은 예산에 들어가는 것만 포함
+- 제외/축약 내역은 dropped 로 기록 (로그 및 스트리밍 메타데이터에 노출)
+
+경로별 예산(토큰): REPORT_CONTEXT_BUDGET_SUMMARY / _INPUT_FIELDS / _DRAFT
+"""
+from typing import List, Dict, Any, Optional, Set
+import logging
+import os
+
+from .token_utils import count_tokens
+from .table_store import get_table_store
+from .instrumentation import span
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGETS = {
+    "summary": 1500,
+    "input_fields": 4000,
+    "draft": 8000,
+}
+
+
+def _shingles(text: str, n: int = 5) -> Set[str]:
+    s = " ".join(text.split())
+    if len(s) <= n:
+        return {s} if s else set()
+    return {s[i:i + n] for i in range(len(s) - n + 1)}
+
+
+def _trim_to_tokens(text: str, max_tokens: int) -> str:
+    """max_tokens 이하가 되도록 뒤쪽을 잘라냄 (가능하면 줄 단위)"""
+    tokens = count_tokens(text)
+    if tokens <= max_tokens:
+        return text
+    cut = int(len(text) * max_tokens / max(tokens, 1))
+    while cut > 0:
+        candidate = text[:cut]
+        newline = candidate.rfind("\n")
+        if newline > cut // 2:
+            candidate = candidate[:newline]
+        if count_tokens(candidate) <= max_tokens:
+            return candidate.rstrip()
+        cut = int(cut * 0.9)
+    return ""
+
+
+class PackedContext:
+    """패킹 결과"""
+
+    def __init__(self, budget: int):
+        self.budget = budget
+        self.documents: List[Dict[str, Any]] = []   # 포함된 청크 (content는 trim 반영)
+        self.tables: List[str] = []                 # 포함된 표 HTML
+        self.table_paths: List[str] = []
+        self.used_tokens = 0
+        self.dropped: List[Dict[str, Any]] = []
+
+    @property
+    def chunks(self) -> List[str]:
+        return [d.get("content", "") for d in self.documents]
+
+    @property
+    def chunk_ids(self) -> List[str]:
+        return [d.get("chunk_id", "") for d in self.documents]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "budget_tokens": self.budget,
+            "context_tokens": self.used_tokens,
+            "chunks": len(self.documents),
+            "tables": len(self.tables),
+            "dropped": self.dropped,
+        }
+
+
+class ContextPacker:
+    """검색 결과를 토큰 예산에 맞춰 프롬프트 컨텍스트로 구성"""
+
+    def __init__(
+        self,
+        budget_tokens: int,
+        table_share: float = 0.5,
+        min_chunk_tokens: int = 80,
+        similarity_threshold: float = 0.8,
+    ):
+        self.budget = budget_tokens
+        self.table_share = table_share
+        self.min_chunk_tokens = min_chunk_tokens
+        self.similarity_threshold = similarity_threshold
+
+    @classmethod
+    def for_path(cls, path: str) -> "ContextPacker":
+        """summary | input_fields | draft 경로별 예산으로 생성"""
+        budget = int(os.getenv(f"REPORT_CONTEXT_BUDGET_{path.upper()}", DEFAULT_BUDGETS[path]))
+        return cls(budget_tokens=budget)
+
+    def _dedupe(self, docs: List[Dict[str, Any]], packed: PackedContext) -> List[Dict[str, Any]]:
+        ordered = sorted(docs, key=lambda d: d.get("score", 0.0), reverse=True)
+        kept: List[Dict[str, Any]] = []
+        kept_shingles: List[Set[str]] = []
+        seen_ids: Set[str] = set()
+        for doc in ordered:
+            chunk_id = doc.get("chunk_id", "")
+            content = (doc.get("content") or "").strip()
+            if not content or (chunk_id and chunk_id in seen_ids):
+                packed.dropped.append({"kind": "chunk", "id": chunk_id, "reason": "duplicate"})
+                continue
+            sh = _shingles(content)
+            duplicate_of = None
+            for prev, prev_sh in zip(kept, kept_shingles):
+                prev_content = prev.get("content", "")
+                if content in prev_content:
+                    duplicate_of = prev
+                    break
+                if sh and prev_sh and len(sh & prev_sh) / len(sh | prev_sh) >= self.similarity_threshold:
+                    duplicate_of = prev
+                    break
+            if duplicate_of is not None:
+                packed.dropped.append({
+                    "kind": "chunk", "id": chunk_id, "reason": "duplicate",
+                    "duplicate_of": duplicate_of.get("chunk_id", ""),
+                })
+                continue
+            if chunk_id:
+                seen_ids.add(chunk_id)
+            kept.append(doc)
+            kept_shingles.append(sh)
+        return kept
+
+    def pack(self, docs: List[Dict[str, Any]], include_tables: bool = False) -> PackedContext:
+        packed = PackedContext(self.budget)
+        candidates = self._dedupe(docs or [], packed)
+
+        has_tables = include_tables and any(d.get("tables") for d in candidates)
+        chunk_budget = int(self.budget * (1 - self.table_share)) if has_tables else self.budget
+
+        # 1) 청크: 점수순으로 채우고, 넘치면 trim 또는 제외
+        for doc in candidates:
+            content = doc.get("content", "")
+            tokens = count_tokens(content)
+            remaining = chunk_budget - packed.used_tokens
+            if tokens <= remaining:
+                packed.documents.append(doc)
+                packed.used_tokens += tokens
+                continue
+            if remaining >= self.min_chunk_tokens:
+                trimmed = _trim_to_tokens(content, remaining)
+                if trimmed:
+                    trimmed_tokens = count_tokens(trimmed)
+                    packed.documents.append({**doc, "content": trimmed})
+                    packed.used_tokens += trimmed_tokens
+                    packed.dropped.append({
+                        "kind": "chunk", "id": doc.get("chunk_id", ""), "reason": "trimmed",
+                        "tokens": tokens - trimmed_tokens,
+                    })
+                    continue
+            packed.dropped.append({"kind": "chunk", "id": doc.get("chunk_id", ""), "reason": "budget", "tokens": tokens})
+
+        # 2) 표: 포함된 청크의 표만, 청크 순서대로 남은 전체 예산 안에서 원문 그대로
+        if include_tables:
+            with span("tables"):
+                store = get_table_store()
+                seen_paths: Set[str] = set()
+                for doc in packed.documents:
+                    for path in doc.get("tables", []) or []:
+                        if path in seen_paths:
+                            continue
+                        seen_paths.add(path)
+                        html = store.get(path)
+                        if html is None:
+                            packed.dropped.append({"kind": "table", "id": path, "reason": "missing"})
+                            continue
+                        tokens = store.token_count(path) or count_tokens(html)
+                        if packed.used_tokens + tokens > self.budget:
+                            packed.dropped.append({"kind": "table", "id": path, "reason": "budget", "tokens": tokens})
+                            continue
+                        packed.tables.append(html)
+                        packed.table_paths.append(path)
+                        packed.used_tokens += tokens
+            kept_ids = {id(d) for d in packed.documents}
+            for doc in candidates:
+                if id(doc) in kept_ids:
+                    continue
+                for path in doc.get("tables", []) or []:
+                    if path not in seen_paths:
+                        seen_paths.add(path)
+                        packed.dropped.append({"kind": "table", "id": path, "reason": "parent_dropped"})
+
+        if packed.dropped:
+            logger.info(
+                f"✂️ 컨텍스트 패킹: {packed.used_tokens}/{self.budget} 토큰, "
+                f"청크 {len(packed.documents)}개/표 {len(packed.tables)}개 포함, 제외·축약 {len(packed.dropped)}건"
+            )
+        return packed
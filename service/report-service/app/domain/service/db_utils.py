@@ -0,0 +1,27 @@
+"""
+DB 세션 유틸 (async 경로용)
+- eripotter_common.database.get_session 은 동기 contextmanager (종료 시 commit/close)
+- async 핸들러에서는 진입/종료를 threadpool에서 실행해 이벤트 루프를 막지 않음
+"""
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+import sys
+
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from eripotter_common.database import get_session
+
+
+@asynccontextmanager
+async def threadpool_session() -> AsyncIterator[Session]:
+    """async with threadpool_session() as db: ... (세션 사용 쿼리도 run_in_threadpool로 호출할 것)"""
+    cm = get_session()
+    db = await run_in_threadpool(cm.__enter__)
+    try:
+        yield db
+    except BaseException:
+        if not await run_in_threadpool(cm.__exit__, *sys.exc_info()):
+            raise
+    else:
+        await run_in_threadpool(cm.__exit__, None, None, None)
@@ -0,0 +1,175 @@
+"""
+임베딩 마이크로 배처 (요청 간 배치)
+- 동시에 들어온 encode 요청을 짧은 창(EMBED_BATCH_WINDOW_MS) 동안 모아 한 번의 배치 forward로 처리
+- 전용 워커 스레드 1개가 임베더를 호출하므로 이벤트 루프/threadpool을 점유하지 않음
+- 동기 encode()와 비동기 aencode() 모두 같은 큐를 사용 (bulk 작업과 API 요청도 함께 배치됨)
+- 배치 크기/대기 시간/encode 시간 통계 제공 (stats)
+
+환경변수: EMBED_BATCH_WINDOW_MS(기본 5), EMBED_BATCH_MAX(기본 32), EMBED_BATCHING=0 이면 배칭 없이 직접 호출
+"""
+from typing import Callable, Dict, List, Any, Optional, Tuple
+from collections import deque
+from concurrent.futures import Future
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+EncodeFn = Callable[[List[str]], List[List[float]]]
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class EmbeddingBatcher:
+    """encode_fn 앞단의 요청 간 배처 (스레드 안전)"""
+
+    def __init__(self, encode_fn: EncodeFn, window_ms: float = 5.0, max_batch: int = 32, stats_window: int = 1000):
+        self.encode_fn = encode_fn
+        self.window = max(0.0, window_ms) / 1000
+        self.max_batch = max(1, max_batch)
+        self._queue: "queue.Queue[Tuple[List[str], Future, float]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._texts = 0
+        self._requests = 0
+        self._max_seen = 0
+        self._batch_sizes: deque = deque(maxlen=stats_window)
+        self._wait_ms: deque = deque(maxlen=stats_window)
+        self._encode_ms: deque = deque(maxlen=stats_window)
+
+    # ---------- 호출 ----------
+    def submit(self, texts: List[str]) -> Future:
+        """texts 임베딩을 큐에 넣고 Future 반환 (결과: List[List[float]])"""
+        self._ensure_worker()
+        fut: Future = Future()
+        self._queue.put((list(texts), fut, time.perf_counter()))
+        return fut
+
+    def encode(self, texts: List[str]) -> List[List[float]]:
+        """동기 호출 (threadpool/배치 작업용)"""
+        return self.submit(texts).result()
+
+    async def aencode(self, texts: List[str]) -> List[List[float]]:
+        """비동기 호출 (이벤트 루프에서 대기만 하고 계산은 워커 스레드)"""
+        return await asyncio.wrap_future(self.submit(texts))
+
+    # ---------- 워커 ----------
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._start_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                self._worker.start()
+
+    def _collect(self) -> List[Tuple[List[str], Future, float]]:
+        """첫 요청을 기다린 뒤 창이 닫히거나 max_batch가 찰 때까지 추가 요청 수집"""
+        pending = [self._queue.get()]
+        size = len(pending[0][0])
+        deadline = time.perf_counter() + self.window
+        while size < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            pending.append(item)
+            size += len(item[0])
+        return pending
+
+    def _run(self):
+        while True:
+            pending = self._collect()
+            texts = [t for item in pending for t in item[0]]
+            started = time.perf_counter()
+            try:
+                vectors = self.encode_fn(texts) if texts else []
+                if len(vectors) != len(texts):
+                    raise RuntimeError(f"임베딩 개수 불일치: 입력 {len(texts)}개, 출력 {len(vectors)}개")
+            except Exception as e:
+                logger.error(f"❌ 배치 임베딩 실패 ({len(texts)}개): {e}")
+                for _, fut, _ in pending:
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+            encode_ms = (time.perf_counter() - started) * 1000
+
+            offset = 0
+            for item_texts, fut, _ in pending:
+                n = len(item_texts)
+                if not fut.done():
+                    fut.set_result(vectors[offset:offset + n])
+                offset += n
+            self._record(pending, len(texts), started, encode_ms)
+
+    def _record(self, pending, batch_size: int, started: float, encode_ms: float):
+        with self._stats_lock:
+            self._batches += 1
+            self._texts += batch_size
+            self._requests += len(pending)
+            self._max_seen = max(self._max_seen, batch_size)
+            self._batch_sizes.append(batch_size)
+            self._encode_ms.append(encode_ms)
+            for _, _, enqueued in pending:
+                self._wait_ms.append((started - enqueued) * 1000)
+
+    # ---------- 통계 ----------
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            sizes = list(self._batch_sizes)
+            waits = list(self._wait_ms)
+            encodes = list(self._encode_ms)
+            return {
+                "window_ms": round(self.window * 1000, 3),
+                "max_batch": self.max_batch,
+                "queue_depth": self._queue.qsize(),
+                "batches": self._batches,
+                "requests": self._requests,
+                "texts": self._texts,
+                "batch_size_avg": round(sum(sizes) / len(sizes), 2) if sizes else 0.0,
+                "batch_size_max": self._max_seen,
+                "wait_ms_p50": round(_percentile(waits, 50), 2),
+                "wait_ms_p95": round(_percentile(waits, 95), 2),
+                "encode_ms_p50": round(_percentile(encodes, 50), 2),
+                "encode_ms_p95": round(_percentile(encodes, 95), 2),
+            }
+
+
+class DirectEncoder:
+    """배칭 비활성화(EMBED_BATCHING=0) 시 같은 인터페이스로 직접 호출"""
+
+    def __init__(self, encode_fn: EncodeFn):
+        self.encode_fn = encode_fn
+
+    def encode(self, texts: List[str]) -> List[List[float]]:
+        return self.encode_fn(texts)
+
+    async def aencode(self, texts: List[str]) -> List[List[float]]:
+        from starlette.concurrency import run_in_threadpool
+        return await run_in_threadpool(self.encode_fn, texts)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"batching": False}
+
+
+def build_encoder(encode_fn: EncodeFn):
+    """환경변수 설정에 따라 EmbeddingBatcher 또는 DirectEncoder 생성"""
+    if os.getenv("EMBED_BATCHING", "1") == "0":
+        return DirectEncoder(encode_fn)
+    return EmbeddingBatcher(
+        encode_fn,
+        window_ms=float(os.getenv("EMBED_BATCH_WINDOW_MS", "5")),
+        max_batch=int(os.getenv("EMBED_BATCH_MAX", "32")),
+    )
@@ -0,0 +1,164 @@
+"""
+지표 카탈로그 인메모리 캐시 (kbz 테이블)
+- 시작 시 전체 로드(preload), 이후 지표 목록/카테고리별 목록/ID 조회를 DB 없이 메모리에서 반환
+- indicator_id / category 인덱스 (ID 정확 일치 실패 시 기존 LIKE 'id%' 와 같은 접두어 매칭)
+- 갱신: INDICATOR_CATALOG_CHECK_SEC 마다 DB 버전(행 수/최대 id/내용 md5)만 조회해 바뀌었을 때,
+  또는 INDICATOR_CATALOG_TTL_SEC 경과, 또는 invalidate() (관리자 refresh API) 시 재로드
+  재로드 중에는 다른 요청이 기다리지 않고 기존 스냅샷을 반환
+- ETag: 지표 내용 해시 (레플리카 간 동일, 생성 시각 필드는 제외하므로 weak ETag)
+"""
+from typing import Any, Dict, List, Optional
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogSnapshot:
+    """한 번 로드한 지표 목록과 인덱스 (불변)"""
+
+    def __init__(self, indicators: List[Any], version: Optional[str]):
+        self.indicators = indicators
+        self.version = version
+        self.loaded_at = datetime.now()
+        self.loaded_mono = time.monotonic()
+        self.by_id: Dict[str, Any] = {}
+        self.by_category: Dict[str, List[Any]] = {}
+        for ind in indicators:
+            self.by_id.setdefault(ind.indicator_id, ind)
+            self.by_category.setdefault(ind.category, []).append(ind)
+        raw = json.dumps(
+            [[ind.indicator_id, ind.title, ind.category, ind.subcategory, ind.description, ind.status]
+             for ind in indicators],
+            ensure_ascii=False,
+        )
+        self.etag = f'W/"{hashlib.sha256(raw.encode("utf-8")).hexdigest()[:20]}"'
+
+    def get(self, indicator_id: str) -> Optional[Any]:
+        found = self.by_id.get(indicator_id)
+        if found is not None:
+            return found
+        return next((ind for ind in self.indicators if ind.indicator_id.startswith(indicator_id)), None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "count": len(self.indicators),
+            "categories": len(self.by_category),
+            "version": self.version,
+            "etag": self.etag,
+            "loaded_at": self.loaded_at.isoformat(),
+        }
+
+
+class IndicatorCatalog:
+    """지표 카탈로그 캐시 (스레드 안전, 한 번에 한 스레드만 버전 확인/재로드)"""
+
+    def __init__(self, ttl_sec: float = 3600, check_sec: float = 30):
+        self.ttl_sec = ttl_sec
+        self.check_sec = check_sec
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._next_check = 0.0
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._stats = {"loads": 0, "version_checks": 0, "load_errors": 0}
+
+    def snapshot(self, repository) -> CatalogSnapshot:
+        """현재 스냅샷 (확인 주기가 지났으면 버전 확인 후 필요 시 재로드)"""
+        snap = self._snapshot
+        if snap is not None and time.monotonic() < self._next_check:
+            return snap
+        # 다른 스레드가 확인/재로드 중이면 기존 스냅샷으로 응답
+        if not self._lock.acquire(blocking=snap is None):
+            return snap
+        try:
+            snap = self._snapshot
+            now = time.monotonic()
+            if snap is not None and now < self._next_check:
+                return snap
+            try:
+                return self._refresh(repository, snap, now)
+            except Exception as e:
+                self._stats["load_errors"] += 1
+                if snap is None:
+                    raise
+                logger.warning(f"⚠️ 지표 카탈로그 갱신 실패, 기존 스냅샷 사용: {e}")
+                self._next_check = now + self.check_sec
+                return snap
+        finally:
+            self._lock.release()
+
+    def _refresh(self, repository, snap: Optional[CatalogSnapshot], now: float) -> CatalogSnapshot:
+        version = None
+        if hasattr(repository, "get_indicator_catalog_version"):
+            self._stats["version_checks"] += 1
+            try:
+                version = repository.get_indicator_catalog_version()
+            except Exception as e:
+                logger.debug(f"지표 카탈로그 버전 조회 실패 (TTL로만 갱신): {e}")
+        stale = (
+            snap is None
+            or self._dirty
+            or now - snap.loaded_mono >= self.ttl_sec
+            or (version is not None and version != snap.version)
+        )
+        if stale:
+            started = time.perf_counter()
+            snap = CatalogSnapshot(list(repository.get_all_indicators()), version)
+            self._snapshot = snap
+            self._dirty = False
+            self._stats["loads"] += 1
+            logger.info(
+                f"📚 지표 카탈로그 로드: {len(snap.indicators)}개, {len(snap.by_category)}개 카테고리 "
+                f"({(time.perf_counter() - started) * 1000:.1f}ms, etag={snap.etag})"
+            )
+        self._next_check = now + self.check_sec
+        return snap
+
+    def invalidate(self):
+        """다음 조회 시 재로드"""
+        self._dirty = True
+        self._next_check = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        snap = self._snapshot
+        return {
+            **self._stats,
+            "ttl_sec": self.ttl_sec,
+            "check_sec": self.check_sec,
+            "snapshot": snap.stats() if snap is not None else None,
+        }
+
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    """If-None-Match 비교 (weak 비교, 쉼표 목록/* 지원)"""
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if (tag[2:] if tag.startswith("W/") else tag) == opaque:
+            return True
+    return False
+
+
+_catalog: Optional[IndicatorCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_indicator_catalog() -> IndicatorCatalog:
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = IndicatorCatalog(
+                    ttl_sec=float(os.getenv("INDICATOR_CATALOG_TTL_SEC", "3600")),
+                    check_sec=float(os.getenv("INDICATOR_CATALOG_CHECK_SEC", "30")),
+                )
+    return _catalog
@@ -0,0 +1,141 @@
+"""
+RAG 파이프라인 단계별 타이밍 계측
+- span("stage") 으로 구간 측정 → (1) 요청별 수집(contextvars) → Server-Timing 헤더
+                                  (2) Prometheus 히스토그램 report_stage_seconds{stage}
+- 단계 이름: db, embed, qdrant, mirror, lexical, tables, prompt, llm (llm_queue: 공유 LLM 클라이언트 대기)
+- threadpool(run_in_threadpool)로 넘어간 코드도 같은 요청의 span 목록에 기록됨 (contextvars 전파)
+- prometheus-client 미설치 시 히스토그램만 생략 (헤더는 그대로 동작)
+
+청크 단위 상세 로그는 RAG_DEBUG_SAMPLE_RATE(0~1, 기본 0) 비율의 요청에서만 DEBUG로 출력
+"""
+from typing import Dict, List, Optional, Tuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+import logging
+import os
+import random
+import time
+
+try:
+    from prometheus_client import Counter, Histogram, CONTENT_TYPE_LATEST, generate_latest
+    _STAGE_SECONDS = Histogram(
+        "report_stage_seconds",
+        "report-service RAG pipeline stage duration",
+        ["stage"],
+        buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+    )
+    _REQUEST_SECONDS = Histogram(
+        "report_request_seconds",
+        "report-service request duration until response headers",
+        ["method", "route", "status"],
+        buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+    )
+    _LLM_QUEUE_SECONDS = Histogram(
+        "report_llm_queue_seconds",
+        "time waiting for the shared LLM client (concurrency slot + rate limit)",
+        buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+    )
+    _LLM_MODEL_SECONDS = Histogram(
+        "report_llm_model_seconds",
+        "LLM call duration excluding queue time (including retries)",
+        ["outcome"],
+        buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120),
+    )
+    _LLM_RETRIES = Counter(
+        "report_llm_retries_total",
+        "LLM call retries by reason",
+        ["reason"],
+    )
+    PROMETHEUS_AVAILABLE = True
+except ImportError:  # pragma: no cover - 선택 의존성
+    _STAGE_SECONDS = None
+    _REQUEST_SECONDS = None
+    _LLM_QUEUE_SECONDS = None
+    _LLM_MODEL_SECONDS = None
+    _LLM_RETRIES = None
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+    generate_latest = None
+    PROMETHEUS_AVAILABLE = False
+
+_spans: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("report_spans", default=None)
+_debug_sampled: ContextVar[bool] = ContextVar("report_debug_sampled", default=False)
+
+
+def start_request() -> List[Tuple[str, float]]:
+    """요청 시작 시 span 목록 생성 및 디버그 샘플링 여부 결정"""
+    spans: List[Tuple[str, float]] = []
+    _spans.set(spans)
+    rate = float(os.getenv("RAG_DEBUG_SAMPLE_RATE", "0"))
+    _debug_sampled.set(rate > 0 and random.random() < rate)
+    return spans
+
+
+def record(stage: str, seconds: float):
+    spans = _spans.get()
+    if spans is not None:
+        spans.append((stage, seconds))
+    if _STAGE_SECONDS is not None:
+        _STAGE_SECONDS.labels(stage=stage).observe(seconds)
+
+
+@contextmanager
+def span(stage: str):
+    """with span("qdrant"): ...  (async 함수 안에서 await를 감싸도 됨)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - started)
+
+
+def observe_request(method: str, route: str, status: int, seconds: float):
+    if _REQUEST_SECONDS is not None:
+        _REQUEST_SECONDS.labels(method=method, route=route, status=str(status)).observe(seconds)
+
+
+def observe_llm(queue_seconds: float, model_seconds: float, outcome: str):
+    if _LLM_QUEUE_SECONDS is not None:
+        _LLM_QUEUE_SECONDS.observe(queue_seconds)
+        _LLM_MODEL_SECONDS.labels(outcome=outcome).observe(model_seconds)
+
+
+def count_llm_retry(reason: str):
+    if _LLM_RETRIES is not None:
+        _LLM_RETRIES.labels(reason=reason).inc()
+
+
+def server_timing(spans: List[Tuple[str, float]], total_seconds: Optional[float] = None) -> str:
+    """같은 단계는 합산: 'db;dur=1.2, qdrant;dur=35.0;desc="x2", total;dur=80.1'"""
+    totals: Dict[str, float] = {}
+    counts: Dict[str, int] = {}
+    for stage, seconds in spans:
+        totals[stage] = totals.get(stage, 0.0) + seconds
+        counts[stage] = counts.get(stage, 0) + 1
+    parts = []
+    for stage, seconds in totals.items():
+        part = f"{stage};dur={seconds * 1000:.1f}"
+        if counts[stage] > 1:
+            part += f';desc="x{counts[stage]}"'
+        parts.append(part)
+    if total_seconds is not None:
+        parts.append(f"total;dur={total_seconds * 1000:.1f}")
+    return ", ".join(parts)
+
+
+def stage_timings() -> Dict[str, float]:
+    """현재 요청에서 지금까지 기록된 단계별 합계(ms)"""
+    totals: Dict[str, float] = {}
+    for stage, seconds in _spans.get() or []:
+        totals[stage] = totals.get(stage, 0.0) + seconds
+    return {stage: round(seconds * 1000, 1) for stage, seconds in totals.items()}
+
+
+def debug_sampled(logger: logging.Logger) -> bool:
+    """이번 요청에서 청크 단위 상세 로그를 남길지 (DEBUG 레벨 + 샘플링 당첨)"""
+    return _debug_sampled.get() and logger.isEnabledFor(logging.DEBUG)
+
+
+def metrics_payload() -> Tuple[bytes, str]:
+    if generate_latest is None:
+        return b"# prometheus-client not installed\n", CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
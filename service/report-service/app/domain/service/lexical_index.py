@@ -0,0 +1,154 @@
+"""
+ESG 매뉴얼 로컬 어휘(lexical) 검색 인덱스
+- esg_manual 컬렉션 payload(title + content)를 scroll로 1회 읽어 BM25 역색인 구성
+- 한국어 지표명(띄어쓰기/조사 변형)에 강하도록 단어 단위가 아닌 문자 bigram 토큰 사용
+- 벡터 검색 결과와 Reciprocal Rank Fusion(RRF)으로 결합
+- LEXICAL_INDEX_TTL_SEC(기본 3600초) 경과 시 다음 조회에서 재구성
+"""
+from typing import List, Dict, Any, Optional, Tuple
+from collections import Counter, defaultdict
+import logging
+import math
+import os
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"[0-9a-zA-Z가-힣]+")
+
+
+def tokenize(text: str, n: int = 2) -> List[str]:
+    """소문자화 후 단어별 문자 n-gram (n보다 짧은 단어는 단어 그대로)"""
+    tokens: List[str] = []
+    for word in _WORD_RE.findall((text or "").lower()):
+        if len(word) <= n:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + n] for i in range(len(word) - n + 1))
+    return tokens
+
+
+class LexicalIndex:
+    """문자 n-gram BM25 역색인 (읽기 전용, 재구성 시 통째 교체)"""
+
+    def __init__(self, docs: List[Dict[str, Any]], k1: float = 1.2, b: float = 0.75, title_boost: int = 2):
+        self.k1 = k1
+        self.b = b
+        self.docs = docs
+        self.postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self.doc_len: List[int] = []
+        for doc_idx, doc in enumerate(docs):
+            text = " ".join([doc.get("title", "") or ""] * title_boost + [doc.get("content", "") or ""])
+            tf = Counter(tokenize(text))
+            self.doc_len.append(sum(tf.values()))
+            for term, freq in tf.items():
+                self.postings[term].append((doc_idx, freq))
+        self.avg_len = (sum(self.doc_len) / len(self.doc_len)) if self.doc_len else 0.0
+        n = len(docs)
+        self.idf = {
+            term: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5))
+            for term, p in self.postings.items()
+        }
+        self.built_at = time.time()
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """BM25 점수 상위 limit개 payload 반환 (score = BM25 점수)"""
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = self.idf[term]
+            for doc_idx, freq in postings:
+                norm = self.k1 * (1 - self.b + self.b * self.doc_len[doc_idx] / (self.avg_len or 1))
+                scores[doc_idx] += idf * freq * (self.k1 + 1) / (freq + norm)
+        top = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:limit]
+        return [{**self.docs[i], "score": s} for i, s in top]
+
+
+def load_payloads(qdrant_client, collection_name: str, batch: int = 256) -> List[Dict[str, Any]]:
+    """컬렉션 전체 payload를 scroll로 수집 (벡터 제외)"""
+    docs: List[Dict[str, Any]] = []
+    offset = None
+    while True:
+        points, offset = qdrant_client.scroll(
+            collection_name=collection_name,
+            limit=batch,
+            offset=offset,
+            with_payload=True,
+            with_vectors=False,
+        )
+        docs.extend(dict(p.payload or {}) for p in points)
+        if offset is None:
+            break
+    return docs
+
+
+def reciprocal_rank_fusion(
+    result_lists: List[Tuple[str, List[Dict[str, Any]]]], k: int = 60, key: str = "chunk_id"
+) -> List[Dict[str, Any]]:
+    """
+    여러 검색 결과를 RRF로 결합: score = Σ 1 / (k + rank)
+    result_lists: [(소스 이름, 결과 목록), ...] - 소스별 원점수는 '{소스}_score' 로 보존
+    """
+    fused: Dict[str, Dict[str, Any]] = {}
+    for source, results in result_lists:
+        for rank, r in enumerate(results, 1):
+            doc_key = r.get(key) or r.get("text_id") or r.get("content", "")[:200]
+            if not doc_key:
+                continue
+            entry = fused.get(doc_key)
+            if entry is None:
+                entry = {**r, "score": 0.0}
+                fused[doc_key] = entry
+            entry["score"] += 1.0 / (k + rank)
+            entry[f"{source}_score"] = r.get("score", 0.0)
+    return sorted(fused.values(), key=lambda x: x["score"], reverse=True)
+
+
+_indexes: Dict[str, LexicalIndex] = {}
+_failed_at: Dict[str, float] = {}
+_index_lock = threading.Lock()
+_RETRY_AFTER_FAILURE_SEC = 60.0
+
+
+def get_lexical_index(qdrant_client, collection_name: str) -> Optional[LexicalIndex]:
+    """프로세스 단위 인덱스 (최초 조회 또는 TTL 만료 시 구성, 실패 시 None)"""
+    ttl = float(os.getenv("LEXICAL_INDEX_TTL_SEC", "3600"))
+    index = _indexes.get(collection_name)
+    if index is not None and time.time() - index.built_at < ttl:
+        return index
+    if time.time() - _failed_at.get(collection_name, 0.0) < _RETRY_AFTER_FAILURE_SEC:
+        return index
+    with _index_lock:
+        index = _indexes.get(collection_name)
+        if index is not None and time.time() - index.built_at < ttl:
+            return index
+        try:
+            started = time.perf_counter()
+            docs = load_payloads(qdrant_client, collection_name)
+            index = LexicalIndex(docs)
+            _indexes[collection_name] = index
+            logger.info(
+                f"✅ 어휘 인덱스 구성: '{collection_name}' {len(index)}개 청크, "
+                f"{len(index.postings)}개 토큰 ({(time.perf_counter() - started) * 1000:.0f}ms)"
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ 어휘 인덱스 구성 실패: {e}")
+            _failed_at[collection_name] = time.time()
+            # 이전 인덱스가 있으면 만료되었더라도 계속 사용
+            index = _indexes.get(collection_name)
+    return index
+
+
+def invalidate_lexical_index(collection_name: str):
+    """색인 변경 후 다음 조회에서 인덱스를 다시 구성하도록 표시 (구성 전까지는 이전 인덱스 사용)"""
+    index = _indexes.get(collection_name)
+    if index is not None:
+        index.built_at = 0.0
+    _failed_at.pop(collection_name, None)
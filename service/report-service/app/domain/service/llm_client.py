@@ -0,0 +1,403 @@
+"""
+공유 LLM 클라이언트 (프로세스 단위)
+- ChatOpenAI는 설정(모델/temperature/max_tokens)별로 1회만 생성, HTTP 커넥션 풀(httpx)은 전체가 공유
+- 전역 동시 호출 제한(LLM_MAX_CONCURRENCY) + 토큰 버킷 속도 제한(LLM_RATE_PER_MINUTE)
+- 429/5xx/타임아웃/연결 오류는 지수 백오프 + full jitter 로 재시도 (Retry-After 헤더 우선)
+- 호출별 타임아웃(LLM_TIMEOUT_SEC), 스트리밍은 첫 토큰 전 실패만 재시도
+- 대기 시간(queue: 슬롯 + 속도 제한)과 모델 시간(model)을 분리해 통계/Prometheus로 기록
+- 프록시 환경변수는 os.environ을 건드리지 않고 httpx trust_env=False 로 무시
+
+교체: LLM_BACKEND=stub → StubChatModel (프로세스 내),
+      OPENAI_BASE_URL=http://localhost:8900/v1 → 로컬 스텁 서버 (benchmarks/stub_openai_server.py)
+"""
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+from collections import deque
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+
+from .throttle import TokenBucket
+from .instrumentation import record, observe_llm, count_llm_retry
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class ConcurrencyLimiter:
+    """
+    스레드/이벤트 루프를 가리지 않는 세마포어
+    (일괄 잡, API 요청, threadpool의 동기 호출이 같은 한도를 공유)
+    """
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self._active = 0
+        self._lock = threading.Lock()
+        self._waiters: Deque[Tuple[Any, Any]] = deque()  # (loop, future) 또는 (None, threading.Event)
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def acquire(self):
+        with self._lock:
+            if self._active < self.limit and not self._waiters:
+                self._active += 1
+                return
+            event = threading.Event()
+            self._waiters.append((None, event))
+        event.wait()
+
+    async def acquire_async(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._active < self.limit and not self._waiters:
+                self._active += 1
+                return
+            fut = loop.create_future()
+            waiter = (loop, fut)
+            self._waiters.append(waiter)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            with self._lock:
+                try:
+                    self._waiters.remove(waiter)
+                    granted = False
+                except ValueError:
+                    granted = fut.done() and not fut.cancelled()
+            if granted:
+                self.release()
+            raise
+
+    def release(self):
+        with self._lock:
+            if not self._waiters:
+                self._active -= 1
+                return
+            loop, waiter = self._waiters.popleft()
+        # 슬롯을 그대로 다음 대기자에게 넘김 (_active 유지)
+        if loop is None:
+            waiter.set()
+        else:
+            loop.call_soon_threadsafe(self._grant, waiter)
+
+    def _grant(self, fut):
+        if fut.done():  # 대기자가 그 사이 취소됨 → 다음 대기자에게
+            self.release()
+        else:
+            fut.set_result(None)
+
+
+def _retry_reason(exc: BaseException) -> Optional[str]:
+    """재시도 대상이면 사유 문자열, 아니면 None"""
+    if isinstance(exc, asyncio.TimeoutError):
+        return "timeout"
+    try:
+        import openai
+    except ImportError:  # pragma: no cover
+        return None
+    if isinstance(exc, openai.APITimeoutError):
+        return "timeout"
+    if isinstance(exc, openai.APIConnectionError):
+        return "connection"
+    if isinstance(exc, openai.APIStatusError) and exc.status_code in RETRYABLE_STATUS:
+        return str(exc.status_code)
+    return None
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("retry-after") if hasattr(headers, "get") else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class LLMClient:
+    """
+    ChatOpenAI(또는 스텁) 앞단의 공유 호출기
+    invoke / ainvoke / astream 인터페이스는 ChatOpenAI와 동일하게 사용
+    """
+
+    def __init__(self, model: Any, pool: "LLMPool", name: str):
+        self.model = model
+        self.pool = pool
+        self.name = name
+
+    async def ainvoke(self, messages: List[Any], **kwargs) -> Any:
+        return await self.pool.arun(self.model, messages, kwargs)
+
+    def invoke(self, messages: List[Any], **kwargs) -> Any:
+        return self.pool.run(self.model, messages, kwargs)
+
+    async def astream(self, messages: List[Any], **kwargs) -> AsyncIterator[Any]:
+        async for chunk in self.pool.astream(self.model, messages, kwargs):
+            yield chunk
+
+
+class LLMPool:
+    """동시성/속도 제한, 재시도, 타임아웃, 통계 (모든 LLMClient가 공유)"""
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        rate_per_minute: float = 300,
+        max_retries: int = 3,
+        timeout_sec: float = 120,
+        backoff_base_sec: float = 0.5,
+        backoff_max_sec: float = 8.0,
+        stats_window: int = 1000,
+    ):
+        self.limiter = ConcurrencyLimiter(max_concurrency)
+        self.bucket = TokenBucket(rate_per_minute / 60.0) if rate_per_minute > 0 else None
+        self.max_retries = max(0, max_retries)
+        self.timeout_sec = timeout_sec
+        self.backoff_base_sec = backoff_base_sec
+        self.backoff_max_sec = backoff_max_sec
+
+        self._stats_lock = threading.Lock()
+        self._calls = 0
+        self._errors = 0
+        self._retries: Dict[str, int] = {}
+        self._queue_ms: deque = deque(maxlen=stats_window)
+        self._model_ms: deque = deque(maxlen=stats_window)
+
+    # ---------- 재시도/통계 ----------
+    def _backoff(self, attempt: int, exc: BaseException) -> float:
+        retry_after = _retry_after(exc)
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max_sec)
+        return random.uniform(0, min(self.backoff_max_sec, self.backoff_base_sec * (2 ** attempt)))
+
+    def _should_retry(self, attempt: int, exc: BaseException) -> Optional[str]:
+        reason = _retry_reason(exc)
+        if reason is None or attempt >= self.max_retries:
+            return None
+        with self._stats_lock:
+            self._retries[reason] = self._retries.get(reason, 0) + 1
+        count_llm_retry(reason)
+        logger.warning(f"⚠️ LLM 호출 재시도 {attempt + 1}/{self.max_retries} ({reason}): {exc}")
+        return reason
+
+    def _record(self, queue_s: float, model_s: float, ok: bool):
+        record("llm_queue", queue_s)
+        observe_llm(queue_s, model_s, "ok" if ok else "error")
+        with self._stats_lock:
+            self._calls += 1
+            if not ok:
+                self._errors += 1
+            self._queue_ms.append(queue_s * 1000)
+            self._model_ms.append(model_s * 1000)
+
+    # ---------- 비동기 ----------
+    async def _aacquire(self) -> float:
+        started = time.perf_counter()
+        await self.limiter.acquire_async()
+        try:
+            if self.bucket is not None:
+                await self.bucket.acquire_async()
+        except BaseException:
+            self.limiter.release()
+            raise
+        return time.perf_counter() - started
+
+    async def arun(self, model: Any, messages: List[Any], kwargs: Dict[str, Any]) -> Any:
+        queue_s = await self._aacquire()
+        started = time.perf_counter()
+        ok = False
+        try:
+            attempt = 0
+            while True:
+                try:
+                    result = await asyncio.wait_for(model.ainvoke(messages, **kwargs), self.timeout_sec)
+                    ok = True
+                    return result
+                except Exception as e:
+                    if not self._should_retry(attempt, e):
+                        raise
+                    await asyncio.sleep(self._backoff(attempt, e))
+                    attempt += 1
+        finally:
+            self.limiter.release()
+            self._record(queue_s, time.perf_counter() - started, ok)
+
+    async def astream(self, model: Any, messages: List[Any], kwargs: Dict[str, Any]) -> AsyncIterator[Any]:
+        """첫 청크 전 실패만 재시도 (이미 보낸 토큰은 되돌릴 수 없음), 청크 간 간격에 타임아웃 적용"""
+        queue_s = await self._aacquire()
+        started = time.perf_counter()
+        ok = False
+        try:
+            attempt = 0
+            while True:
+                emitted = False
+                stream = model.astream(messages, **kwargs).__aiter__()
+                try:
+                    while True:
+                        try:
+                            chunk = await asyncio.wait_for(stream.__anext__(), self.timeout_sec)
+                        except StopAsyncIteration:
+                            break
+                        emitted = True
+                        yield chunk
+                    ok = True
+                    return
+                except Exception as e:
+                    if emitted or not self._should_retry(attempt, e):
+                        raise
+                    await asyncio.sleep(self._backoff(attempt, e))
+                    attempt += 1
+                finally:
+                    aclose = getattr(stream, "aclose", None)
+                    if aclose is not None:
+                        await aclose()
+        finally:
+            self.limiter.release()
+            self._record(queue_s, time.perf_counter() - started, ok)
+
+    # ---------- 동기 (threadpool 작업용) ----------
+    def run(self, model: Any, messages: List[Any], kwargs: Dict[str, Any]) -> Any:
+        started = time.perf_counter()
+        self.limiter.acquire()
+        if self.bucket is not None:
+            self.bucket.acquire()
+        queue_s = time.perf_counter() - started
+        started = time.perf_counter()
+        ok = False
+        try:
+            attempt = 0
+            while True:
+                try:
+                    result = model.invoke(messages, **kwargs)
+                    ok = True
+                    return result
+                except Exception as e:
+                    if not self._should_retry(attempt, e):
+                        raise
+                    time.sleep(self._backoff(attempt, e))
+                    attempt += 1
+        finally:
+            self.limiter.release()
+            self._record(queue_s, time.perf_counter() - started, ok)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            queue = list(self._queue_ms)
+            model = list(self._model_ms)
+            return {
+                "max_concurrency": self.limiter.limit,
+                "in_flight": self.limiter.active,
+                "waiting": self.limiter.waiting,
+                "rate_per_minute": round(self.bucket.rate * 60, 1) if self.bucket else None,
+                "calls": self._calls,
+                "errors": self._errors,
+                "retries": dict(self._retries),
+                "queue_ms_p50": round(_percentile(queue, 50), 2),
+                "queue_ms_p95": round(_percentile(queue, 95), 2),
+                "model_ms_p50": round(_percentile(model, 50), 2),
+                "model_ms_p95": round(_percentile(model, 95), 2),
+            }
+
+
+# ===== 프로세스 단위 싱글턴 =====
+_pool: Optional[LLMPool] = None
+_http_clients: Optional[Tuple[Any, Any]] = None
+_clients: Dict[Tuple[str, str, float, Optional[int]], LLMClient] = {}
+_lock = threading.Lock()
+
+
+def get_llm_pool() -> LLMPool:
+    global _pool
+    if _pool is None:
+        with _lock:
+            if _pool is None:
+                _pool = LLMPool(
+                    max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "8")),
+                    rate_per_minute=float(os.getenv("LLM_RATE_PER_MINUTE", "300")),
+                    max_retries=int(os.getenv("LLM_MAX_RETRIES", "3")),
+                    timeout_sec=float(os.getenv("LLM_TIMEOUT_SEC", "120")),
+                    backoff_base_sec=float(os.getenv("LLM_RETRY_BASE_MS", "500")) / 1000,
+                    backoff_max_sec=float(os.getenv("LLM_RETRY_MAX_MS", "8000")) / 1000,
+                )
+    return _pool
+
+
+def _get_http_clients() -> Tuple[Any, Any]:
+    """ChatOpenAI 인스턴스들이 공유하는 동기/비동기 httpx 커넥션 풀 (호출 시 _lock 보유)"""
+    global _http_clients
+    if _http_clients is None:
+        import httpx
+        pool_size = int(os.getenv("LLM_HTTP_POOL_SIZE", "20"))
+        limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size, keepalive_expiry=60)
+        timeout = httpx.Timeout(
+            float(os.getenv("LLM_TIMEOUT_SEC", "120")),
+            connect=float(os.getenv("LLM_CONNECT_TIMEOUT_SEC", "10")),
+        )
+        _http_clients = (
+            httpx.Client(limits=limits, timeout=timeout, trust_env=False),
+            httpx.AsyncClient(limits=limits, timeout=timeout, trust_env=False),
+        )
+    return _http_clients
+
+
+def _build_model(model: str, temperature: float, max_tokens: Optional[int]) -> Any:
+    if os.getenv("LLM_BACKEND", "openai").lower() == "stub":
+        from .llm_stub import StubChatModel
+        return StubChatModel()
+    from langchain_openai import ChatOpenAI
+    http_client, http_async_client = _get_http_clients()
+    params: Dict[str, Any] = {
+        "model": model,
+        "temperature": temperature,
+        "openai_api_key": os.getenv("OPENAI_API_KEY"),
+        "http_client": http_client,
+        "http_async_client": http_async_client,
+        "max_retries": 0,  # 재시도는 LLMPool에서 (지터 + 통계)
+        "timeout": float(os.getenv("LLM_TIMEOUT_SEC", "120")),
+    }
+    if max_tokens is not None:
+        params["max_tokens"] = max_tokens
+    if os.getenv("OPENAI_BASE_URL"):
+        params["base_url"] = os.getenv("OPENAI_BASE_URL")
+    return ChatOpenAI(**params)
+
+
+def get_llm_client(model: Optional[str] = None, temperature: float = 0.3, max_tokens: Optional[int] = 3000) -> LLMClient:
+    """설정별 공유 LLMClient (처음 요청 시 1회 생성)"""
+    model = model or os.getenv("OPENAI_MODEL", "gpt-4o")
+    backend = os.getenv("LLM_BACKEND", "openai").lower()
+    key = (backend, model, temperature, max_tokens)
+    client = _clients.get(key)
+    if client is None:
+        pool = get_llm_pool()
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                logger.info(f"🔧 LLM 클라이언트 생성: backend={backend}, model={model}, temperature={temperature}")
+                client = LLMClient(_build_model(model, temperature, max_tokens), pool, name=f"{backend}:{model}")
+                _clients[key] = client
+    return client
+
+
+def llm_stats() -> Dict[str, Any]:
+    """공유 LLM 풀 통계 (호출 전이면 빈 통계)"""
+    stats = get_llm_pool().stats()
+    stats["clients"] = sorted(c.name for c in _clients.values())
+    return stats
@@ -0,0 +1,53 @@
+"""
+오프라인용 LLM 대체 구현 (LLM_BACKEND=stub)
+- OpenAI 호출 없이 결정적인 응답을 생성해 처리량/동시성 테스트에 사용
+- STUB_LLM_LATENCY_MS: 응답 전체 지연(기본 200ms), STUB_LLM_CHUNKS: 스트리밍 청크 수(기본 20)
+"""
+from typing import List, Iterator, AsyncIterator, Any
+import asyncio
+import hashlib
+import os
+import time
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+
+class StubChatModel:
+    """ChatOpenAI의 invoke/stream 인터페이스만 흉내내는 로컬 스텁"""
+
+    def __init__(self, latency_ms: float = None, chunks: int = None):
+        self.latency_ms = float(latency_ms if latency_ms is not None else os.getenv("STUB_LLM_LATENCY_MS", "200"))
+        self.chunks = max(1, int(chunks if chunks is not None else os.getenv("STUB_LLM_CHUNKS", "20")))
+
+    def _render(self, messages: List[Any]) -> str:
+        prompt = "\n".join(getattr(m, "content", str(m)) for m in messages)
+        digest = hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:12]
+        head = " ".join(prompt.split())[:120]
+        return (
+            f"## 1. 개요\n스텁 초안입니다. (prompt={digest}, {len(prompt)}자)\n\n"
+            f"## 2. 주요 내용\n{head}\n"
+        )
+
+    def _pieces(self, text: str) -> List[str]:
+        size = max(1, -(-len(text) // self.chunks))
+        return [text[i:i + size] for i in range(0, len(text), size)]
+
+    def invoke(self, messages: List[Any], **kwargs) -> AIMessage:
+        time.sleep(self.latency_ms / 1000)
+        return AIMessage(content=self._render(messages))
+
+    async def ainvoke(self, messages: List[Any], **kwargs) -> AIMessage:
+        await asyncio.sleep(self.latency_ms / 1000)
+        return AIMessage(content=self._render(messages))
+
+    def stream(self, messages: List[Any], **kwargs) -> Iterator[AIMessageChunk]:
+        pieces = self._pieces(self._render(messages))
+        for piece in pieces:
+            time.sleep(self.latency_ms / 1000 / len(pieces))
+            yield AIMessageChunk(content=piece)
+
+    async def astream(self, messages: List[Any], **kwargs) -> AsyncIterator[AIMessageChunk]:
+        pieces = self._pieces(self._render(messages))
+        for piece in pieces:
+            await asyncio.sleep(self.latency_ms / 1000 / len(pieces))
+            yield AIMessageChunk(content=piece)
@@ -0,0 +1,372 @@
+"""
+ESG 매뉴얼 일괄 색인 파이프라인 (Qdrant)
+- 청크 파일(.jsonl: 한 줄당 청크 1개 / .json: 청크 배열 또는 {"chunks": [...]})을 읽어 큰 배치로 임베딩
+- 임베딩(CPU)과 업로드(I/O)를 동시에 진행: 임베딩 스레드 → 제한된 큐 → 업로드 워커
+- 업로드는 wait=False 로 보내고, 마지막 배치만 wait=True 로 보내 전체 반영을 보장
+- 체크포인트 파일에 청크별 content_hash를 기록해 중단 후 재실행 시 이어서 진행
+- 내용이 바뀌지 않은 청크(content_hash 동일)는 임베딩/업로드를 건너뜀
+  (체크포인트 + Qdrant payload의 content_hash 둘 다 참조)
+- QDRANT_URL=:memory: 로컬 모드에서도 동작
+
+포인트 ID는 RAGUtils.embed_text와 같은 규칙(uuid5(chunk_id))이라 기존 색인을 그대로 덮어씀
+"""
+from typing import List, Dict, Any, Optional, Iterator, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import hashlib
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+
+from qdrant_client.models import Distance, VectorParams, PointStruct
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBED_BATCH = int(os.getenv("INGEST_EMBED_BATCH", "64"))
+DEFAULT_UPLOAD_WORKERS = int(os.getenv("INGEST_UPLOAD_WORKERS", "2"))
+CHECKPOINT_EVERY_BATCHES = 5
+# 컬렉션 이름은 체크포인트 파일명에 쓰이므로 경로 구분자/상위 경로 불가
+COLLECTION_NAME_RE = re.compile(r"[A-Za-z0-9_-]+")
+
+
+def content_hash(chunk: Dict[str, Any]) -> str:
+    """임베딩/payload에 영향을 주는 필드 기준 해시"""
+    key = {k: chunk.get(k) for k in ("title", "content", "pages", "tables", "images", "order", "doc_id")}
+    return hashlib.sha256(json.dumps(key, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def iter_chunk_files(source_path: str) -> List[str]:
+    if os.path.isdir(source_path):
+        files = []
+        for dirpath, _, names in os.walk(source_path):
+            files.extend(os.path.join(dirpath, n) for n in names if n.endswith((".jsonl", ".json")))
+        return sorted(files)
+    return [source_path]
+
+
+def read_chunks(source_path: str) -> Iterator[Dict[str, Any]]:
+    """청크 파일 읽기 (chunk_id 또는 id, content 필수)"""
+    for path in iter_chunk_files(source_path):
+        with open(path, "r", encoding="utf-8") as f:
+            if path.endswith(".jsonl"):
+                records = (json.loads(line) for line in f if line.strip())
+            else:
+                data = json.load(f)
+                records = data.get("chunks", []) if isinstance(data, dict) else data
+            for rec in records:
+                chunk_id = rec.get("chunk_id") or rec.get("id")
+                if not chunk_id or not rec.get("content"):
+                    logger.warning(f"⚠️ chunk_id/content 없는 레코드 건너뜀: {path}")
+                    continue
+                yield {**rec, "chunk_id": str(chunk_id)}
+
+
+class IngestCheckpoint:
+    """청크별 content_hash 기록 (원자적 파일 교체로 저장)"""
+
+    def __init__(self, path: Optional[str], collection_name: str):
+        self.path = path
+        self.collection_name = collection_name
+        self.hashes: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("collection") == collection_name:
+                self.hashes = dict(data.get("hashes", {}))
+            else:
+                logger.warning(f"⚠️ 다른 컬렉션의 체크포인트 무시: {path} ({data.get('collection')})")
+
+    def mark(self, items: List[Tuple[str, str]]):
+        with self._lock:
+            self.hashes.update(items)
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            data = {
+                "collection": self.collection_name,
+                "updated_at": datetime.now().isoformat(),
+                "hashes": dict(self.hashes),
+            }
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+
+class ManualIngestor:
+    """청크 파일 → 배치 임베딩 → 비동기 업로드"""
+
+    def __init__(
+        self,
+        qdrant_client,
+        collection_name: str,
+        encode=None,
+        dim: Optional[int] = None,
+        embed_batch: int = DEFAULT_EMBED_BATCH,
+        upload_workers: int = DEFAULT_UPLOAD_WORKERS,
+    ):
+        self.client = qdrant_client
+        self.collection_name = collection_name
+        if encode is None:
+            from .rag_utils import get_embedder
+            encode, dim, _ = get_embedder()
+        self.encode = encode
+        self.dim = dim
+        self.embed_batch = max(1, embed_batch)
+        self.upload_workers = max(1, upload_workers)
+
+    # ---------- 준비 ----------
+    def _ensure_collection(self):
+        if self.client.collection_exists(self.collection_name):
+            return
+        dim = self.dim or len(self.encode(["dim probe"])[0])
+        logger.info(f"🔨 컬렉션 생성: '{self.collection_name}', 차원={dim}")
+        self.client.create_collection(
+            collection_name=self.collection_name,
+            vectors_config=VectorParams(size=dim, distance=Distance.COSINE),
+        )
+
+    def _remote_hashes(self) -> Dict[str, str]:
+        """이미 색인된 청크의 content_hash (payload만, 벡터 제외)"""
+        hashes: Dict[str, str] = {}
+        offset = None
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=self.collection_name,
+                limit=1024,
+                offset=offset,
+                with_payload=["text_id", "content_hash"],
+                with_vectors=False,
+            )
+            for p in points:
+                payload = p.payload or {}
+                if payload.get("text_id") and payload.get("content_hash"):
+                    hashes[payload["text_id"]] = payload["content_hash"]
+            if offset is None:
+                return hashes
+
+    # ---------- 실행 ----------
+    def run(
+        self,
+        source_path: str,
+        checkpoint_path: Optional[str] = None,
+        force: bool = False,
+        progress: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        색인 실행. progress dict를 넘기면 진행 중 카운터를 갱신 (API 잡 상태용)
+        force=True 면 해시 비교 없이 전체 재색인
+        """
+        from .rag_utils import RAGUtils
+
+        started = time.perf_counter()
+        stats = progress if progress is not None else {}
+        stats.update({"read": 0, "skipped": 0, "embedded": 0, "uploaded": 0, "batches": 0,
+                      "embed_ms": 0.0, "upload_ms": 0.0})
+        self._ensure_collection()
+
+        checkpoint = IngestCheckpoint(checkpoint_path, self.collection_name)
+        known: Dict[str, str] = {}
+        if not force:
+            known.update(self._remote_hashes())
+            known.update(checkpoint.hashes)
+
+        # 1) 변경된 청크만 추림 (파일 안에 같은 chunk_id가 여러 번 나오면 마지막 것 사용)
+        pending: Dict[str, Tuple[Dict[str, Any], str]] = {}
+        for chunk in read_chunks(source_path):
+            stats["read"] += 1
+            pending[chunk["chunk_id"]] = (chunk, content_hash(chunk))
+        todo = [(c, h) for cid, (c, h) in pending.items() if force or known.get(cid) != h]
+        stats["skipped"] = len(pending) - len(todo)
+        stats["total"] = len(todo)
+        logger.info(
+            f"📚 매뉴얼 색인 시작: '{self.collection_name}' 청크 {len(pending)}개 중 "
+            f"{len(todo)}개 색인, {stats['skipped']}개 변경 없음"
+        )
+
+        # 2) 임베딩 스레드(생산자) → 큐 → 업로드 워커(소비자)
+        batches = [todo[i:i + self.embed_batch] for i in range(0, len(todo), self.embed_batch)]
+        uploads: "queue.Queue[Optional[Tuple[int, List[PointStruct], List[Tuple[str, str]]]]]" = queue.Queue(
+            maxsize=self.upload_workers * 2
+        )
+        errors: List[BaseException] = []
+        stats_lock = threading.Lock()
+
+        def embed_all():
+            try:
+                for idx, batch in enumerate(batches):
+                    if errors:
+                        break
+                    t0 = time.perf_counter()
+                    vectors = self.encode([c["content"] for c, _ in batch])
+                    points = []
+                    for (chunk, h), vec in zip(batch, vectors):
+                        payload = dict(chunk)
+                        payload["text_id"] = chunk["chunk_id"]
+                        payload["content_hash"] = h
+                        points.append(PointStruct(id=RAGUtils._uuid_from_text_id(chunk["chunk_id"]), vector=vec, payload=payload))
+                    with stats_lock:
+                        stats["embedded"] += len(points)
+                        stats["embed_ms"] += (time.perf_counter() - t0) * 1000
+                    uploads.put((idx, points, [(c["chunk_id"], h) for c, h in batch]))
+            except BaseException as e:
+                errors.append(e)
+            finally:
+                for _ in range(self.upload_workers):
+                    uploads.put(None)
+
+        last_idx = len(batches) - 1
+
+        def upload_worker():
+            while True:
+                item = uploads.get()
+                if item is None:
+                    return
+                idx, points, marks = item
+                if errors:
+                    continue
+                try:
+                    t0 = time.perf_counter()
+                    # 마지막 배치는 업로드 워커 종료 후 wait=True 로 별도 전송
+                    if idx == last_idx:
+                        final.append((points, marks))
+                        continue
+                    self.client.upsert(collection_name=self.collection_name, points=points, wait=False)
+                    checkpoint.mark(marks)
+                    with stats_lock:
+                        stats["uploaded"] += len(points)
+                        stats["batches"] += 1
+                        stats["upload_ms"] += (time.perf_counter() - t0) * 1000
+                        save_now = stats["batches"] % CHECKPOINT_EVERY_BATCHES == 0
+                    if save_now:
+                        checkpoint.save()
+                except BaseException as e:
+                    errors.append(e)
+
+        final: List[Tuple[List[PointStruct], List[Tuple[str, str]]]] = []
+        producer = threading.Thread(target=embed_all, name="ingest-embed", daemon=True)
+        producer.start()
+        with ThreadPoolExecutor(max_workers=self.upload_workers, thread_name_prefix="ingest-upload") as pool:
+            for f in [pool.submit(upload_worker) for _ in range(self.upload_workers)]:
+                f.result()
+        producer.join()
+
+        if not errors and final:
+            # 3) 마지막 배치는 wait=True: 같은 컬렉션의 앞선 wait=False 업서트까지 반영된 뒤 반환
+            points, marks = final[0]
+            t0 = time.perf_counter()
+            try:
+                self.client.upsert(collection_name=self.collection_name, points=points, wait=True)
+                checkpoint.mark(marks)
+                stats["uploaded"] += len(points)
+                stats["batches"] += 1
+                stats["upload_ms"] += (time.perf_counter() - t0) * 1000
+            except BaseException as e:
+                errors.append(e)
+
+        checkpoint.save()
+        if errors:
+            logger.error(f"❌ 매뉴얼 색인 중단: {errors[0]} (체크포인트 {stats['uploaded']}개 기록, 재실행 시 이어서 진행)")
+            raise errors[0]
+
+        if stats["uploaded"]:
+            from .lexical_index import invalidate_lexical_index
+            invalidate_lexical_index(self.collection_name)
+
+        stats["points"] = self.client.count(collection_name=self.collection_name, exact=True).count
+        stats["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        stats["embed_ms"] = round(stats["embed_ms"], 1)
+        stats["upload_ms"] = round(stats["upload_ms"], 1)
+        logger.info(
+            f"✅ 매뉴얼 색인 완료: 업로드 {stats['uploaded']}개, 건너뜀 {stats['skipped']}개, "
+            f"컬렉션 {stats['points']}개 ({stats['elapsed_ms']}ms)"
+        )
+        return stats
+
+
+# ===== API 잡 (프로세스 메모리 보관) =====
+class ManualIngestJob:
+    def __init__(self, collection_name: str, source_path: str):
+        from uuid import uuid4
+        self.job_id = uuid4().hex
+        self.collection_name = collection_name
+        self.source_path = source_path
+        self.status = "running"
+        self.stats: Dict[str, Any] = {}
+        self.error: Optional[str] = None
+        self.created_at = datetime.now()
+        self.finished_at: Optional[datetime] = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "collection_name": self.collection_name,
+            "source_path": self.source_path,
+            "status": self.status,
+            "stats": dict(self.stats),
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+_ingest_jobs: Dict[str, ManualIngestJob] = {}
+
+
+def resolve_source_path(source_path: str) -> str:
+    """DOC_ROOT 밖의 경로는 거부"""
+    root = os.path.realpath(os.getenv("DOC_ROOT", "."))
+    path = os.path.realpath(os.path.join(root, source_path))
+    if os.path.commonpath([root, path]) != root:
+        raise ValueError("DOC_ROOT 밖의 경로는 색인할 수 없습니다.")
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"청크 파일을 찾을 수 없습니다: {source_path}")
+    return path
+
+
+def checkpoint_path_for(collection_name: str) -> str:
+    """INGEST_CHECKPOINT_DIR/{collection}.checkpoint.json (컬렉션 이름은 경로 구분자 없는 식별자만 허용)"""
+    if not COLLECTION_NAME_RE.fullmatch(collection_name or ""):
+        raise ValueError(f"컬렉션 이름은 영문/숫자/_/- 만 허용됩니다: {collection_name!r}")
+    directory = os.getenv("INGEST_CHECKPOINT_DIR", os.path.join(os.getenv("DOC_ROOT", "."), ".ingest"))
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"{collection_name}.checkpoint.json")
+
+
+def get_ingest_job(job_id: str) -> Optional[ManualIngestJob]:
+    return _ingest_jobs.get(job_id)
+
+
+def start_ingest_job(source_path: str, collection_name: str, force: bool = False,
+                     embed_batch: Optional[int] = None) -> ManualIngestJob:
+    """백그라운드 스레드에서 색인 실행 (컬렉션당 동시에 1개)"""
+    for job in _ingest_jobs.values():
+        if job.collection_name == collection_name and job.status == "running":
+            raise RuntimeError(f"'{collection_name}' 색인이 이미 진행 중입니다: {job.job_id}")
+    path = resolve_source_path(source_path)
+    job = ManualIngestJob(collection_name, source_path)
+    _ingest_jobs[job.job_id] = job
+
+    def run():
+        from .rag_utils import get_qdrant_client
+        try:
+            ManualIngestor(
+                get_qdrant_client(), collection_name, embed_batch=embed_batch or DEFAULT_EMBED_BATCH
+            ).run(path, checkpoint_path=checkpoint_path_for(collection_name), force=force, progress=job.stats)
+            job.status = "completed"
+        except Exception as e:
+            logger.exception(f"매뉴얼 색인 잡 실패: {job.job_id}")
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = datetime.now()
+
+    threading.Thread(target=run, name=f"ingest-{job.job_id[:8]}", daemon=True).start()
+    return job
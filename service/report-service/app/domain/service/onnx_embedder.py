@@ -0,0 +1,115 @@
+"""
+bge-m3 쿼리 임베더 ONNX int8 백엔드 (EMBEDDER=bge-m3-int8)
+- torch 없이 onnxruntime(CPU) + 토크나이저만으로 추론
+- 동적 양자화(int8 가중치)로 모델 크기/지연 감소, 출력은 bge-m3와 같은 1024차원 CLS 벡터(L2 정규화)
+- 모델 디렉토리(ONNX_EMBEDDER_DIR, 기본 ./models/bge-m3-onnx)에 model_int8.onnx + 토크나이저 파일
+  → export_onnx_embedder.py 로 1회 생성
+
+주의: 색인된 문서 벡터는 기존 bge-m3(fp32) 결과이므로, 배포 전 benchmarks/embedder_benchmark.py 로
+top-k 일치율을 확인할 것
+"""
+from typing import List, Optional
+import logging
+import os
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_NAME = "BAAI/bge-m3"
+QUANTIZED_FILE = "model_int8.onnx"
+FP32_FILE = "model_fp32.onnx"
+
+
+def default_model_dir() -> str:
+    return os.getenv("ONNX_EMBEDDER_DIR", os.path.join(".", "models", "bge-m3-onnx"))
+
+
+class OnnxEmbedder:
+    """onnxruntime 세션 + 토크나이저 (CLS 풀링, L2 정규화)"""
+
+    def __init__(self, model_dir: Optional[str] = None, max_length: int = 512, threads: Optional[int] = None):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        self.model_dir = model_dir or default_model_dir()
+        model_path = os.path.join(self.model_dir, QUANTIZED_FILE)
+        if not os.path.exists(model_path):
+            raise RuntimeError(
+                f"ONNX 모델 없음: {model_path} "
+                "(python export_onnx_embedder.py 로 생성하거나 ONNX_EMBEDDER_DIR 지정)"
+            )
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        threads = threads or int(os.getenv("ONNX_EMBEDDER_THREADS", "0"))
+        if threads:
+            opts.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(model_path, opts, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.tokenizer = AutoTokenizer.from_pretrained(self.model_dir)
+        self.max_length = max_length
+        self.dim = int(self.session.get_outputs()[0].shape[-1] or 1024)
+
+    def encode(self, texts: List[str]) -> List[List[float]]:
+        enc = self.tokenizer(
+            texts, padding=True, truncation=True, max_length=self.max_length, return_tensors="np"
+        )
+        feeds = {k: v.astype(np.int64) for k, v in enc.items() if k in self.input_names}
+        hidden = self.session.run(None, feeds)[0]
+        cls = hidden[:, 0]
+        norms = np.linalg.norm(cls, axis=1, keepdims=True)
+        return (cls / np.where(norms == 0, 1, norms)).tolist()
+
+
+def export_quantized(model_name: str = DEFAULT_MODEL_NAME, out_dir: Optional[str] = None,
+                     opset: int = 17, keep_fp32: bool = False) -> str:
+    """
+    HF 모델 → ONNX(fp32) → 동적 int8 양자화. torch/transformers/onnxruntime 필요 (배포 이미지에서는 불필요)
+    bge-m3 fp32 그래프는 2GB를 넘으므로 외부 데이터 형식으로 저장 후 양자화
+    """
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    out_dir = out_dir or default_model_dir()
+    os.makedirs(out_dir, exist_ok=True)
+    fp32_dir = os.path.join(out_dir, "fp32")
+    os.makedirs(fp32_dir, exist_ok=True)
+    fp32_path = os.path.join(fp32_dir, FP32_FILE)
+    int8_path = os.path.join(out_dir, QUANTIZED_FILE)
+
+    logger.info(f"🔧 ONNX 내보내기: {model_name} → {fp32_path}")
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModel.from_pretrained(model_name)
+    model.eval()
+    sample = tokenizer(["query: 온실가스 배출량"], return_tensors="pt")
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (sample["input_ids"], sample["attention_mask"]),
+            fp32_path,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["last_hidden_state"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "seq"},
+                "attention_mask": {0: "batch", 1: "seq"},
+                "last_hidden_state": {0: "batch", 1: "seq"},
+            },
+            opset_version=opset,
+            do_constant_folding=True,
+        )
+
+    logger.info(f"🔧 int8 동적 양자화: {int8_path}")
+    quantize_dynamic(
+        model_input=fp32_path,
+        model_output=int8_path,
+        weight_type=QuantType.QInt8,
+        per_channel=True,
+    )
+    tokenizer.save_pretrained(out_dir)
+    if not keep_fp32:
+        import shutil
+        shutil.rmtree(fp32_dir, ignore_errors=True)
+    size_mb = os.path.getsize(int8_path) / 1024 / 1024
+    logger.info(f"✅ ONNX int8 모델 생성 완료: {int8_path} ({size_mb:.0f}MB)")
+    return int8_path
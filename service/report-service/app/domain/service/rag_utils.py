@@ -3,28 +3,57 @@
 - EMBEDDER, OPENAI_MODEL 등 환경변수로 동작 제어
 - Qdrant는 URL을 host/port로 파싱해 HTTPS + HTTP만(prefer_grpc=False)
 - 포인트 ID는 UUIDv5로 안정 생성
+- Qdrant 클라이언트(동기/비동기)는 프로세스 단위로 공유, 컬렉션 확인도 컬렉션당 1회
+- 임베더는 프로세스 단위로 1회 로드하고, 쿼리 임베딩은 요청 간 마이크로 배처를 거침
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Callable
 import os
 import logging
+import threading
 from urllib.parse import urlparse
 from uuid import uuid5, NAMESPACE_URL
 
-from qdrant_client import QdrantClient
+from qdrant_client import QdrantClient, AsyncQdrantClient
 from qdrant_client.models import Distance, VectorParams, PointStruct, Filter, FieldCondition, MatchValue, PointIdsList
 
+from .instrumentation import span, debug_sampled
+
 logger = logging.getLogger(__name__)
 
 # ===== 임베더 선택 =====
+# 임베더별 벡터 차원 (컬렉션 차원과 맞지 않을 때만 EMBEDDER를 기본값으로 교체)
+EMBEDDER_DIMS = {"bge-m3": 1024, "bge-m3-int8": 1024, "minilm": 384, "openai": 1536, "hash": 256}
+DEFAULT_EMBEDDER_FOR_DIM = {1024: "bge-m3", 384: "minilm", 1536: "openai"}
+
+
 def _get_embedder():
     """
-    EMBEDDER=bge-m3|minilm|openai
+    EMBEDDER=bge-m3|bge-m3-int8|minilm|openai|hash
     - bge-m3: 1024차원 (SentenceTransformer 필요)
+    - bge-m3-int8: 1024차원 (ONNX int8 양자화, onnxruntime + 토크나이저만 필요)
     - minilm: 384차원 (SentenceTransformer 필요)
     - openai: 1536차원 (OpenAI Embeddings)
+    - hash: 256차원 (문자 bigram 해싱, 오프라인 벤치마크/테스트용 - 운영 색인에는 사용 금지)
     """
     emb = os.getenv("EMBEDDER", "bge-m3").lower()  # 기본값 bge-m3 (Qdrant 1024과 일치 가정)
 
+    if emb == "hash":
+        return _get_hash_embedder()
+
+    if emb == "bge-m3-int8":
+        try:
+            from .onnx_embedder import OnnxEmbedder
+            logger.info("🔧 bge-m3 ONNX int8 임베더 초기화 중...")
+            m = OnnxEmbedder()
+            def encode(texts: List[str]) -> List[List[float]]:
+                # bge-m3(SentenceTransformer) 경로와 같은 쿼리 접두어
+                return m.encode([f"query: {t}" for t in texts])
+            logger.info("✅ bge-m3 ONNX int8 임베더 초기화 완료")
+            return encode, 1024, "bge-m3-int8"
+        except Exception as e:
+            logger.error(f"❌ bge-m3 ONNX int8 임베더 초기화 실패: {e}")
+            raise
+
     # sentence-transformers 설치 여부 확인
     try:
         import sentence_transformers  # noqa: F401
@@ -78,6 +107,65 @@ def _get_embedder():
         return _get_openai_embedder()
 
 
+_embedders: Dict[str, Tuple[Callable[[List[str]], List[List[float]]], int, str]] = {}
+_encoders: Dict[str, Any] = {}
+_embedder_lock = threading.Lock()
+
+
+def get_embedder():
+    """프로세스 단위 임베더 (EMBEDDER 값별로 1회만 로드)"""
+    key = os.getenv("EMBEDDER", "bge-m3").lower()
+    cached = _embedders.get(key)
+    if cached is None:
+        with _embedder_lock:
+            cached = _embedders.get(key)
+            if cached is None:
+                cached = _get_embedder()
+                _embedders[key] = cached
+    return cached
+
+
+def get_embedding_encoder():
+    """공유 임베더 앞단의 마이크로 배처 (encode / aencode / stats)"""
+    from .embedding_batcher import build_encoder
+    encode, _, name = get_embedder()
+    encoder = _encoders.get(name)
+    if encoder is None:
+        with _embedder_lock:
+            encoder = _encoders.get(name)
+            if encoder is None:
+                encoder = build_encoder(encode)
+                _encoders[name] = encoder
+    return encoder
+
+
+def embedding_stats() -> Dict[str, Any]:
+    """로드된 임베더별 배처 통계"""
+    return {name: encoder.stats() for name, encoder in _encoders.items()}
+
+
+def _get_hash_embedder(dim: int = 256):
+    """
+    모델/네트워크 없이 동작하는 결정적 임베더 (LLM_BACKEND=stub 과 같은 용도)
+    단어 + 문자 bigram을 crc32로 dim개 버킷에 부호 해싱 후 L2 정규화
+    """
+    import zlib
+    import numpy as np
+    from .lexical_index import tokenize
+
+    def encode(texts: List[str]) -> List[List[float]]:
+        out = np.zeros((len(texts), dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for tok in tokenize(text) + text.lower().split():
+                h = zlib.crc32(tok.encode("utf-8"))
+                out[row, h % dim] += 1.0 if (h >> 31) & 1 else -1.0
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        return (out / np.where(norms == 0, 1, norms)).tolist()
+
+    logger.info(f"🔧 해시 임베더 사용 ({dim}차원, 오프라인 전용)")
+    return encode, dim, "hash"
+
+
 def _get_openai_embedder():
     """OpenAI 임베더 설정 (1536차원)."""
     # ✅ 방어: 혹시 남아 있을지 모르는 프록시 ENV 무시
@@ -100,69 +188,115 @@ def _get_openai_embedder():
 
 # ===== LLM (선택) =====
 def _get_llm():
-    from langchain_openai import ChatOpenAI
-    # ✅ 방어: 프록시 ENV 무시 (OpenAI 1.x 'proxies' 인자 미지원 이슈 회피)
-    for k in ("OPENAI_PROXY", "HTTP_PROXY", "HTTPS_PROXY", "http_proxy", "https_proxy", "ALL_PROXY"):
-        os.environ.pop(k, None)
-
-    model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-    try:
-        # 명시적으로 허용된 파라미터만 전달
-        llm_params = {
-            "model": model,
-            "temperature": 0.7,
-            "openai_api_key": os.getenv("OPENAI_API_KEY")
-        }
-        
-        return ChatOpenAI(**llm_params)
-    except Exception as e:
-        logger.error(f"ChatOpenAI 초기화 실패: {e}")
-        raise
+    """공유 LLM 클라이언트 (커넥션 풀/동시성·속도 제한/재시도는 llm_client에서)"""
+    from .llm_client import get_llm_client
+    return get_llm_client(model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"), temperature=0.7, max_tokens=None)
+
+
+# ===== Qdrant 클라이언트 (프로세스 단위 공유) =====
+def _qdrant_kwargs() -> Dict[str, Any]:
+    qurl = os.getenv("QDRANT_URL", "https://qdrant-production-1efa.up.railway.app")
+    # ✅ 키 이름 호환 (Railway 환경변수와 매칭)
+    key = os.getenv("QDRANT_API_KEY") or os.getenv("QDRANT_SERVICE_API_KEY") or os.getenv("QDRANT__SERVICE__API_KEY")
+    if qurl == ":memory:":
+        return {"location": ":memory:"}
+    p = urlparse(qurl)
+    return {
+        "host": p.hostname,
+        "port": p.port or (443 if p.scheme == "https" else 80),
+        "https": (p.scheme == "https"),
+        "api_key": key,
+        "prefer_grpc": False,
+        "timeout": 60,
+    }
+
+
+_qdrant_client: Optional[QdrantClient] = None
+_async_qdrant_client: Optional[AsyncQdrantClient] = None
+_checked_collections: set = set()
+_client_lock = threading.Lock()
+
+
+def get_qdrant_client() -> QdrantClient:
+    """동기 Qdrant 클라이언트 (요청마다 새 연결을 만들지 않도록 공유)"""
+    global _qdrant_client
+    if _qdrant_client is None:
+        with _client_lock:
+            if _qdrant_client is None:
+                _qdrant_client = QdrantClient(**_qdrant_kwargs())
+    return _qdrant_client
+
+
+def get_async_qdrant_client() -> Optional[AsyncQdrantClient]:
+    """
+    비동기 Qdrant 클라이언트 (이벤트 루프를 막지 않는 검색용)
+    QDRANT_URL=:memory: 이면 동기 클라이언트와 저장소를 공유할 수 없어 None
+    """
+    global _async_qdrant_client
+    if "location" in _qdrant_kwargs():
+        return None
+    if _async_qdrant_client is None:
+        with _client_lock:
+            if _async_qdrant_client is None:
+                _async_qdrant_client = AsyncQdrantClient(**_qdrant_kwargs())
+    return _async_qdrant_client
 
 
 # ===== 유틸 본체 =====
 class RAGUtils:
     def __init__(self, collection_name: Optional[str] = None):
-        qurl = os.getenv("QDRANT_URL", "https://qdrant-production-1efa.up.railway.app")
-        # ✅ 키 이름 호환 (Railway 환경변수와 매칭)
-        key = os.getenv("QDRANT_API_KEY") or os.getenv("QDRANT_SERVICE_API_KEY") or os.getenv("QDRANT__SERVICE__API_KEY")
-        p = urlparse(qurl)
-        self.qdrant_client = QdrantClient(
-            host=p.hostname,
-            port=p.port or (443 if p.scheme == "https" else 80),
-            https=(p.scheme == "https"),
-            api_key=key,
-            prefer_grpc=False,
-            timeout=60,
-        )
+        self.qdrant_client = get_qdrant_client()
 
         # 임베더는 필요할 때만 초기화
         self._encode = None
+        self._aencode = None
         self._dim = None
         self._embedder_name = None
         self.collection_name = collection_name or os.getenv("QDRANT_COLLECTION", "documents")
-        self._ensure_collection_exists()
+        if self.collection_name not in _checked_collections:
+            self._ensure_collection_exists()
+            _checked_collections.add(self.collection_name)
         self._llm = None
 
+    @property
+    def async_qdrant_client(self) -> Optional[AsyncQdrantClient]:
+        return get_async_qdrant_client()
+
+    def _load_embedder(self):
+        encoder = get_embedding_encoder()
+        _, self._dim, self._embedder_name = get_embedder()
+        self._encode = encoder.encode
+        self._aencode = encoder.aencode
+
     @property
     def encode(self):
-        """임베더 lazy loading"""
+        """임베더 lazy loading (공유 임베더 + 마이크로 배처)"""
         if self._encode is None:
-            self._encode, self._dim, self._embedder_name = _get_embedder()
+            self._load_embedder()
         return self._encode
 
+    async def aencode(self, texts: List[str]) -> List[List[float]]:
+        """비동기 임베딩 (배처 워커 스레드에서 계산, 최초 로드는 threadpool)"""
+        from starlette.concurrency import run_in_threadpool
+        if self._aencode is None:
+            if self._encode is not None:
+                # encode만 직접 주입된 경우 (테스트/벤치마크)
+                return await run_in_threadpool(self._encode, texts)
+            await run_in_threadpool(self._load_embedder)
+        return await self._aencode(texts)
+
     @property
     def dim(self):
         """임베더 차원 lazy loading"""
         if self._dim is None:
-            self._encode, self._dim, self._embedder_name = _get_embedder()
+            self._load_embedder()
         return self._dim
 
     @property
     def embedder_name(self):
         """임베더 이름 lazy loading"""
         if self._embedder_name is None:
-            self._encode, self._dim, self._embedder_name = _get_embedder()
+            self._load_embedder()
         return self._embedder_name
 
     def _ensure_collection_exists(self):
@@ -186,14 +320,15 @@ class RAGUtils:
 
             if actual:
                 logger.info(f"📊 컬렉션 벡터 차원: {actual}")
-                if actual == 1024:
-                    os.environ["EMBEDDER"] = "bge-m3"
-                    logger.info("🔧 EMBEDDER를 bge-m3로 설정 (1024차원)")
-                elif actual == 1536:
-                    os.environ["EMBEDDER"] = "openai"
-                    logger.info("🔧 EMBEDDER를 openai로 설정 (1536차원)")
+                current = os.getenv("EMBEDDER", "bge-m3").lower()
+                if EMBEDDER_DIMS.get(current) == actual:
+                    # 같은 차원의 다른 백엔드(예: bge-m3-int8)는 그대로 사용
+                    logger.info(f"🔧 EMBEDDER={current} 유지 ({actual}차원)")
+                elif actual in DEFAULT_EMBEDDER_FOR_DIM:
+                    os.environ["EMBEDDER"] = DEFAULT_EMBEDDER_FOR_DIM[actual]
+                    logger.info(f"🔧 EMBEDDER를 {os.environ['EMBEDDER']}로 설정 ({actual}차원)")
                 else:
-                    logger.warning(f"⚠️ 알 수 없는 차원: {actual} (지원: 1024=bge-m3, 1536=openai)")
+                    logger.warning(f"⚠️ 알 수 없는 차원: {actual} (지원: 1024=bge-m3/bge-m3-int8, 384=minilm, 1536=openai)")
 
                 # 기대 차원과 다르면 경고 (이 시점에서 self.dim은 강제된 EMBEDDER 기준)
                 try:
@@ -248,35 +383,91 @@ class RAGUtils:
         try:
             logger.info(f"🔍 Qdrant 검색 시작: 쿼리='{query}', 컬렉션='{self.collection_name}', limit={limit}")
 
-            qvec = self.encode([query])[0]
+            with span("embed"):
+                qvec = self.encode([query])[0]
             logger.info(f"📊 임베딩 완료: 벡터 차원 = {len(qvec)}")
 
+            local = self._search_mirror(qvec, limit, filters)
+            if local is not None:
+                return local
+
             qf = None
             if filters:
                 qf = Filter(must=[FieldCondition(key=k, match=MatchValue(value=v)) for k, v in filters.items()])
                 logger.info(f"🔧 필터 적용: {filters}")
 
-            res = self.qdrant_client.search(
-                collection_name=self.collection_name,
-                query_vector=qvec,
-                limit=limit,
-                query_filter=qf,
-                with_payload=True,
-                with_vectors=False,
-            )
+            with span("qdrant"):
+                res = self.qdrant_client.search(
+                    collection_name=self.collection_name,
+                    query_vector=qvec,
+                    limit=limit,
+                    query_filter=qf,
+                    with_payload=True,
+                    with_vectors=False,
+                )
 
             logger.info(f"✅ Qdrant 검색 완료: {len(res)} 개 결과")
-            for i, r in enumerate(res):
-                logger.info(
-                    f"  {i+1}. Score: {r.score:.3f}, "
-                    f"Payload keys: {list(r.payload.keys()) if r.payload else []}"
-                )
+            if debug_sampled(logger):
+                for i, r in enumerate(res):
+                    logger.debug(
+                        f"  {i+1}. Score: {r.score:.3f}, "
+                        f"Payload keys: {list(r.payload.keys()) if r.payload else []}"
+                    )
 
             return [{"score": r.score, **(r.payload or {})} for r in res]
         except Exception as e:
             logger.error(f"❌ Qdrant 검색 실패: {e}")
             return {"status": "error", "message": str(e)}
 
+    async def asearch_similar(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None):
+        """
+        search_similar의 비동기 버전
+        - 임베딩은 배처 워커 스레드, 로컬 미러 검색(numpy 내적)은 스레드풀,
+          Qdrant 검색은 AsyncQdrantClient로 이벤트 루프를 막지 않음
+        """
+        from starlette.concurrency import run_in_threadpool
+        if self.async_qdrant_client is None:
+            return await run_in_threadpool(self.search_similar, query, limit, filters)
+        try:
+            logger.info(f"🔍 Qdrant 비동기 검색 시작: 쿼리='{query}', 컬렉션='{self.collection_name}', limit={limit}")
+            with span("embed"):
+                qvec = (await self.aencode([query]))[0]
+            # 미러 전체와의 내적은 CPU 작업 → 다른 요청을 막지 않도록 스레드풀에서 실행
+            local = await run_in_threadpool(self._search_mirror, qvec, limit, filters)
+            if local is not None:
+                return local
+
+            qf = None
+            if filters:
+                qf = Filter(must=[FieldCondition(key=k, match=MatchValue(value=v)) for k, v in filters.items()])
+
+            with span("qdrant"):
+                res = await self.async_qdrant_client.search(
+                    collection_name=self.collection_name,
+                    query_vector=qvec,
+                    limit=limit,
+                    query_filter=qf,
+                    with_payload=True,
+                    with_vectors=False,
+                )
+            logger.info(f"✅ Qdrant 비동기 검색 완료: {len(res)} 개 결과")
+            return [{"score": r.score, **(r.payload or {})} for r in res]
+        except Exception as e:
+            logger.error(f"❌ Qdrant 비동기 검색 실패: {e}")
+            return {"status": "error", "message": str(e)}
+
+    def _search_mirror(self, qvec: List[float], limit: int, filters: Optional[Dict[str, Any]] = None):
+        """로컬 벡터 미러가 신선하면 미러 결과, 아니면 None (Qdrant로 폴백)"""
+        from .vector_mirror import get_vector_mirror
+        mirror = get_vector_mirror(self.collection_name)
+        if mirror is None:
+            return None
+        with span("mirror"):
+            res = mirror.search(qvec, limit, filters)
+        if res is not None:
+            logger.info(f"✅ 로컬 벡터 미러 검색: {len(res)} 개 결과")
+        return res
+
     def search(self, query: str, limit: int = 5, score_threshold: float = 0.0):
         """검색 메서드 (score_threshold 지원)"""
         try:
@@ -294,6 +485,24 @@ class RAGUtils:
             logger.error(f"검색 실패: {e}")
             return []
 
+    def search_lexical(self, query: str, limit: int = 5):
+        """로컬 BM25(문자 bigram) 어휘 검색 - Qdrant 호출 없음 (인덱스 구성 시 1회 scroll)"""
+        from .lexical_index import get_lexical_index
+        try:
+            with span("lexical"):
+                index = get_lexical_index(self.qdrant_client, self.collection_name)
+                if index is None:
+                    return []
+                return index.search(query, limit=limit)
+        except Exception as e:
+            logger.error(f"어휘 검색 실패: {e}")
+            return []
+
+    async def asearch_lexical(self, query: str, limit: int = 5):
+        """search_lexical의 비동기 버전 (인덱스 구성/조회를 threadpool에서 실행)"""
+        from starlette.concurrency import run_in_threadpool
+        return await run_in_threadpool(self.search_lexical, query, limit)
+
     def generate_with_context(
         self,
         query: str,
@@ -0,0 +1,54 @@
+"""
+서비스 준비 상태 (/ready) - /health(프로세스 생존)와 분리
+- 시작 시 백그라운드 작업(마이그레이션, 지표 카탈로그, 임베더 워밍업)을 require() 로 등록하고
+  작업 스레드가 완료 시 mark() 로 보고
+- 등록된 작업이 모두 끝나고 DB 핑이 성공해야 ready
+"""
+from typing import Any, Dict, Optional
+import threading
+import time
+
+_lock = threading.Lock()
+_started_at = time.time()
+_checks: Dict[str, Dict[str, Any]] = {}
+
+
+def require(name: str) -> None:
+    """ready 판정에 포함할 시작 작업 등록 (완료 전까지 pending)"""
+    with _lock:
+        _checks.setdefault(name, {"status": "pending", "detail": None, "elapsed_sec": None})
+
+
+def mark(name: str, ok: bool, detail: Optional[str] = None) -> None:
+    """시작 작업 완료 보고 (실패도 완료로 기록하되 ready 에서 제외)"""
+    with _lock:
+        if name not in _checks:
+            return
+        _checks[name] = {
+            "status": "ok" if ok else "failed",
+            "detail": detail,
+            "elapsed_sec": round(time.time() - _started_at, 3),
+        }
+
+
+def ping_database() -> Dict[str, Any]:
+    started = time.perf_counter()
+    try:
+        from sqlalchemy import text
+        from eripotter_common.database.base import engine
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        return {"status": "ok", "detail": None, "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)}
+    except Exception as e:
+        return {"status": "failed", "detail": str(e)[:200], "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)}
+
+
+def snapshot() -> Dict[str, Any]:
+    with _lock:
+        checks = {name: dict(state) for name, state in _checks.items()}
+    checks["database"] = ping_database()
+    return {
+        "ready": all(state["status"] == "ok" for state in checks.values()),
+        "uptime_sec": round(time.time() - _started_at, 3),
+        "checks": checks,
+    }
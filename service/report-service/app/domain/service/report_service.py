@@ -1,16 +1,27 @@
 """
 Report Service - ESG 매뉴얼 기반 보고서 비즈니스 로직 처리 (LLM lazy 생성, 프록시 최신화, 임베딩 의존성 배제)
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
 from sqlalchemy.orm import Session
 from datetime import datetime
 from ..repository.report_repository import ReportRepository
+from .token_utils import count_tokens
+from .table_store import get_table_store
+from .context_packer import ContextPacker
+from .lexical_index import reciprocal_rank_fusion
+from .instrumentation import span, record, stage_timings, debug_sampled
+from .llm_client import LLMClient, get_llm_client
+from .indicator_catalog import CatalogSnapshot, get_indicator_catalog
+from .revision_service import ReportRevisionService
 from ..model.report_model import (
     ReportCreateRequest, ReportCreateResponse,
     ReportGetRequest, ReportGetResponse,
     ReportUpdateRequest, ReportUpdateResponse,
+    ReportPatchRequest, ReportPatchResponse,
     ReportDeleteRequest, ReportDeleteResponse,
+    ReportRevisionListResponse, ReportRevisionInfo, ReportRevisionResponse, ReportRevisionDiffResponse,
     ReportListResponse, ReportCompleteRequest, ReportCompleteResponse,
+    ReportSummary, ReportPageResponse,
     IndicatorResponse, IndicatorListResponse, IndicatorInputFieldResponse, IndicatorDraftResponse
 )
 
@@ -18,16 +29,41 @@ import logging
 import os
 import re
 import json
+import time
+import asyncio
+import base64
 
-# LLM 관련 (최신 langchain-openai)
-from langchain_openai import ChatOpenAI
-from langchain.schema import SystemMessage, HumanMessage
+from starlette.concurrency import run_in_threadpool
+
+# langchain 메시지 클래스는 LLM 프롬프트를 만드는 메서드 안에서 import (부팅 시 langchain/langsmith 로드 생략)
 
 logger = logging.getLogger(__name__)
 
+MAX_PAGE_SIZE = int(os.getenv("REPORT_LIST_MAX_PAGE_SIZE", "200"))
+
+
+def _encode_cursor(updated_at: datetime, report_id: int) -> str:
+    """목록 커서: 마지막 행의 (updated_at, id) 를 base64url JSON 으로"""
+    raw = json.dumps([updated_at.isoformat(), report_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        updated_at, report_id = json.loads(raw)
+        return datetime.fromisoformat(updated_at), int(report_id)
+    except Exception:
+        raise ValueError("잘못된 cursor 입니다.")
+
 
 class ReportService:
-    """ESG 매뉴얼 기반 보고서 비즈니스 로직 서비스"""
+    """
+    ESG 매뉴얼 기반 보고서 비즈니스 로직 서비스
+    - CRUD/목록 메서드는 동기 (라우터가 threadpool에서 실행)
+    - RAG/LLM 메서드는 async: Qdrant는 AsyncQdrantClient, LLM은 ainvoke/astream,
+      남은 동기 작업(DB 조회, 임베딩)은 run_in_threadpool로 이벤트 루프 밖에서 실행
+    """
 
     def __init__(self, db: Session):
         self.db = db
@@ -39,34 +75,16 @@ class ReportService:
         # LLM을 전역에서 생성하지 않습니다. (지표 목록 등 LLM 불필요 API가 500을 내지 않게)
         # self.llm = ChatOpenAI(...)  # ❌ 금지
 
-        self.doc_root = os.getenv("DOC_ROOT", ".")
-
     # ──────────────────────────────────────────────────────────────────────────────
     # 내부 유틸: LLM 빌더 (필요한 함수 안에서만 호출)
     # ──────────────────────────────────────────────────────────────────────────────
-    def _build_llm(self) -> ChatOpenAI:
+    def _build_llm(self) -> LLMClient:
         """
-        기본 설정으로 ChatOpenAI 초기화.
-        OPENAI_API_KEY / OPENAI_MODEL 환경변수 사용.
+        프로세스 공유 LLM 클라이언트 (커넥션 풀, 동시성/속도 제한, 재시도 포함).
+        OPENAI_API_KEY / OPENAI_MODEL / OPENAI_BASE_URL 환경변수 사용.
+        LLM_BACKEND=stub 이면 오프라인 스텁(StubChatModel)을 같은 제한 아래에서 사용.
         """
-        try:
-            # ✅ 방어: 혹시 남아 있을지 모르는 프록시 ENV 무시 (OpenAI 1.x 'proxies' 인자 미지원 이슈 회피)
-            for k in ("OPENAI_PROXY", "HTTP_PROXY", "HTTPS_PROXY",
-                      "http_proxy", "https_proxy", "ALL_PROXY"):
-                os.environ.pop(k, None)
-
-            # 명시적으로 허용된 파라미터만 전달
-            llm_params = {
-                "model": os.getenv("OPENAI_MODEL", "gpt-4o"),
-                "temperature": 0.3,
-                "max_tokens": 3000,
-                "openai_api_key": os.getenv("OPENAI_API_KEY")
-            }
-            
-            return ChatOpenAI(**llm_params)
-        except Exception as e:
-            logger.error(f"ChatOpenAI 초기화 실패: {e}")
-            raise
+        return get_llm_client(temperature=0.3, max_tokens=3000)
 
     @property
     def esg_manual_rag(self):
@@ -95,6 +113,8 @@ class ReportService:
                 content=request.content,
                 metadata=request.metadata
             )
+            if request.content:
+                self._record_revision(new_report, "create")
 
             return ReportCreateResponse(
                 success=True, message="보고서가 성공적으로 생성되었습니다.",
@@ -128,6 +148,8 @@ class ReportService:
 
     def update_report(self, request: ReportUpdateRequest) -> ReportUpdateResponse:
         try:
+            if request.content is not None:
+                self._record_pending_edits(self.report_repository.get_report(request.topic, request.company_name))
             updated_report = self.report_repository.update_report(
                 topic=request.topic,
                 company_name=request.company_name,
@@ -138,6 +160,8 @@ class ReportService:
             )
             if not updated_report:
                 return ReportUpdateResponse(success=False, message="업데이트할 보고서를 찾을 수 없습니다.", report_id=0, updated_at=None)
+            if request.content is not None:
+                self._record_revision(updated_report, "update")
 
             return ReportUpdateResponse(
                 success=True, message="보고서가 성공적으로 업데이트되었습니다.",
@@ -150,6 +174,114 @@ class ReportService:
                 report_id=0, updated_at=None
             )
 
+    def patch_report(self, request: ReportPatchRequest) -> ReportPatchResponse:
+        """메타데이터 merge patch + 본문 추가/범위 치환 (변경분만 전송, DB에서 병합)"""
+        try:
+            patched = self.report_repository.patch_report(
+                topic=request.topic,
+                company_name=request.company_name,
+                metadata_patch=request.metadata_patch,
+                content_edits=[
+                    {"start": edit.start if edit.op == "replace" else None, "end": edit.end, "text": edit.text}
+                    for edit in request.content_edits
+                ],
+                title=request.title,
+                status=request.status,
+            )
+            if not patched:
+                return ReportPatchResponse(success=False, message="업데이트할 보고서를 찾을 수 없습니다.", report_id=0, updated_at=None)
+            return ReportPatchResponse(
+                success=True, message="보고서가 부분 업데이트되었습니다.",
+                report_id=patched["id"], updated_at=patched["updated_at"], content_length=patched["content_length"]
+            )
+        except ValueError as e:
+            return ReportPatchResponse(success=False, message=f"보고서 부분 업데이트 요청이 올바르지 않습니다: {str(e)}", report_id=0, updated_at=None)
+        except Exception as e:
+            logger.exception("보고서 부분 업데이트 실패")
+            return ReportPatchResponse(
+                success=False, message=f"보고서 부분 업데이트 중 오류가 발생했습니다: {str(e)}",
+                report_id=0, updated_at=None
+            )
+
+    # ===== 리비전 =====
+    def _record_revision(self, report, source: str):
+        """본문 리비전 기록 (실패해도 저장 결과에는 영향 없음)"""
+        if report is None:
+            return
+        try:
+            ReportRevisionService(self.db).record(report.id, report.content, source)
+        except Exception as e:
+            logger.warning(f"⚠️ 리비전 기록 실패 (report_id={report.id}): {e}")
+
+    def _record_pending_edits(self, report):
+        """본문을 덮어쓰기 전에 현재 본문 기록 (PATCH 자동 저장분이 최신 리비전과 다를 때만 남음)"""
+        if report is not None and report.content:
+            self._record_revision(report, "patch")
+
+    def list_report_revisions(self, topic: str, company_name: str) -> ReportRevisionListResponse:
+        try:
+            report = self.report_repository.get_report(topic, company_name)
+            if not report:
+                return ReportRevisionListResponse(
+                    success=False, message="보고서를 찾을 수 없습니다.",
+                    topic=topic, company_name=company_name, revisions=[], total_count=0
+                )
+            revisions = [ReportRevisionInfo(**row) for row in ReportRevisionService(self.db).list_revisions(report.id)]
+            return ReportRevisionListResponse(
+                success=True, message=f"{len(revisions)}개의 리비전을 조회했습니다.",
+                topic=topic, company_name=company_name, revisions=revisions, total_count=len(revisions),
+                stored_bytes=sum(r.stored_bytes for r in revisions)
+            )
+        except Exception as e:
+            logger.exception("리비전 목록 조회 실패")
+            return ReportRevisionListResponse(
+                success=False, message=f"리비전 목록 조회 중 오류가 발생했습니다: {str(e)}",
+                topic=topic, company_name=company_name, revisions=[], total_count=0
+            )
+
+    def get_report_revision(self, topic: str, company_name: str, revision: int) -> ReportRevisionResponse:
+        try:
+            report = self.report_repository.get_report(topic, company_name)
+            found = ReportRevisionService(self.db).get_content(report.id, revision) if report else None
+            if not found:
+                return ReportRevisionResponse(
+                    success=False, message=f"리비전 {revision}을(를) 찾을 수 없습니다.",
+                    topic=topic, company_name=company_name, revision=revision
+                )
+            return ReportRevisionResponse(
+                success=True, message=f"리비전 {revision}을(를) 복원했습니다.",
+                topic=topic, company_name=company_name, **found
+            )
+        except Exception as e:
+            logger.exception("리비전 복원 실패")
+            return ReportRevisionResponse(
+                success=False, message=f"리비전 복원 중 오류가 발생했습니다: {str(e)}",
+                topic=topic, company_name=company_name, revision=revision
+            )
+
+    def diff_report_revisions(
+        self, topic: str, company_name: str, revision: int, against: Optional[int] = None
+    ) -> ReportRevisionDiffResponse:
+        against = against if against is not None else revision - 1
+        try:
+            report = self.report_repository.get_report(topic, company_name)
+            diff = ReportRevisionService(self.db).diff(report.id, revision, against) if report else None
+            if diff is None:
+                return ReportRevisionDiffResponse(
+                    success=False, message=f"리비전 {against} 또는 {revision}을(를) 찾을 수 없습니다.",
+                    revision=revision, against=against
+                )
+            return ReportRevisionDiffResponse(
+                success=True, message=f"리비전 {against} → {revision} 변경 내용입니다.",
+                revision=revision, against=against, diff=diff
+            )
+        except Exception as e:
+            logger.exception("리비전 비교 실패")
+            return ReportRevisionDiffResponse(
+                success=False, message=f"리비전 비교 중 오류가 발생했습니다: {str(e)}",
+                revision=revision, against=against
+            )
+
     def delete_report(self, request: ReportDeleteRequest) -> ReportDeleteResponse:
         try:
             deleted = self.report_repository.delete_report(request.topic, request.company_name)
@@ -206,6 +338,44 @@ class ReportService:
                 reports=[], total_count=0
             )
 
+    def list_reports_page(
+        self,
+        company_name: str,
+        report_type: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        include_counts: bool = False,
+    ) -> ReportPageResponse:
+        """목록 화면용 페이지 조회 (updated_at 최신순, 커서 기반)"""
+        try:
+            limit = max(1, min(limit, MAX_PAGE_SIZE))
+            after = _decode_cursor(cursor) if cursor else None
+            rows = self.report_repository.list_report_summaries(
+                company_name, report_type=report_type, status=status, limit=limit, after=after
+            )
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+            next_cursor = _encode_cursor(rows[-1]["updated_at"], rows[-1]["id"]) if has_more else None
+            status_counts = None
+            total_count = None
+            if include_counts:
+                status_counts = self.report_repository.count_reports_by_status(company_name, report_type)
+                total_count = sum(status_counts.values())
+            return ReportPageResponse(
+                success=True, message=f"{len(rows)}개의 보고서를 조회했습니다.",
+                reports=[ReportSummary(**row) for row in rows],
+                next_cursor=next_cursor, has_more=has_more,
+                status_counts=status_counts, total_count=total_count
+            )
+        except ValueError as e:
+            return ReportPageResponse(success=False, message=str(e), reports=[])
+        except Exception as e:
+            logger.exception("보고서 목록 페이지 조회 실패")
+            return ReportPageResponse(
+                success=False, message=f"보고서 목록 조회 중 오류가 발생했습니다: {str(e)}", reports=[]
+            )
+
     def complete_report(self, request: ReportCompleteRequest) -> ReportCompleteResponse:
         try:
             completed = self.report_repository.complete_report(request.topic, request.company_name)
@@ -227,13 +397,14 @@ class ReportService:
             return {}
 
     # ===== RAG / Indicator =====
-    def search_indicator(self, indicator_id: str, limit: int = None) -> List[Dict[str, Any]]:
+    async def search_indicator(self, indicator_id: str, limit: int = None) -> List[Dict[str, Any]]:
         """지표별 ESG 매뉴얼 검색 (KBZ 테이블의 title과 Qdrant 메타데이터 매칭)"""
         try:
             logger.info(f"🔍 RAG 검색 시작: 지표 ID = {indicator_id}")
             
             # 1. KBZ 테이블에서 해당 지표의 실제 title 가져오기
-            kbz_indicator = self.report_repository.get_indicator_by_id(indicator_id)
+            with span("db"):
+                kbz_indicator = await run_in_threadpool(self.get_indicator, indicator_id)
             if not kbz_indicator:
                 logger.warning(f"⚠️ KBZ 테이블에서 지표를 찾을 수 없음: {indicator_id}")
                 return []
@@ -246,55 +417,29 @@ class ReportService:
             if search_subtitle:
                 logger.info(f"🔍 KBZ 테이블 sub_title로도 검색 가능: {search_subtitle}")
             
-            # 3. Qdrant에서 title과 sub_title로 검색 (정확한 매칭 + 부분 매칭 시도)
+            # 3. 벡터 검색(Qdrant 1회)과 로컬 BM25 어휘 검색을 병렬 실행 후 RRF로 결합
             try:
-                # 먼저 정확한 title로 검색
-                results = self.esg_manual_rag.search_similar(search_title, limit=limit or 100)
-                
-                # title로 찾지 못했고 sub_title이 있으면 sub_title로 검색
-                if (not results or len(results) == 0) and search_subtitle:
-                    logger.info(f"🔍 title 매칭 실패, sub_title로 검색 시도: {search_subtitle}")
-                    results = self.esg_manual_rag.search_similar(search_subtitle, limit=limit or 100)
-                    if results and len(results) > 0:
-                        logger.info(f"✅ sub_title '{search_subtitle}'로 {len(results)}개 결과 발견")
-                
-                # 여전히 없으면 부분 매칭 시도
-                if not results or len(results) == 0:
-                    logger.info(f"🔍 정확한 매칭 실패, 부분 매칭 시도: {search_title}")
-                    
-                    # title에서 키워드 추출 (예: "사업장 안전보건 활동" -> "안전보건")
-                    keywords = search_title.split()
-                    if len(keywords) > 1:
-                        # 가장 중요한 키워드들로 검색
-                        important_keywords = [kw for kw in keywords if len(kw) > 1]
-                        for keyword in important_keywords[:3]:  # 상위 3개 키워드만 시도
-                            logger.info(f"🔍 키워드 검색 시도: {keyword}")
-                            keyword_results = self.esg_manual_rag.search_similar(keyword, limit=limit or 50)
-                            if keyword_results and len(keyword_results) > 0:
-                                results = keyword_results
-                                logger.info(f"✅ 키워드 '{keyword}'로 {len(results)}개 결과 발견")
-                                break
-                
-                if isinstance(results, list) and results:
-                    logger.info(f"✅ Qdrant에서 총 {len(results)}개 결과 발견")
-                    
-                    # 중복 제거 (chunk_id 기준) 및 점수 순 정렬
-                    seen_chunks = set()
-                    unique_results = []
-                    for result in results:
-                        chunk_id = result.get("chunk_id", "")
-                        if chunk_id and chunk_id not in seen_chunks:
-                            seen_chunks.add(chunk_id)
-                            unique_results.append(result)
-                    
-                    # 점수 순으로 정렬 (높은 점수 우선)
-                    unique_results.sort(key=lambda x: x.get("score", 0.0), reverse=True)
-                    raw = unique_results
+                rag = await run_in_threadpool(lambda: self.esg_manual_rag)
+                top_k = limit or 100
+                lexical_query = " ".join(dict.fromkeys(q for q in (indicator_id, search_title, search_subtitle) if q))
+                vector_results, lexical_results = await asyncio.gather(
+                    rag.asearch_similar(search_title, limit=top_k),
+                    rag.asearch_lexical(lexical_query, limit=top_k),
+                )
+                if not isinstance(vector_results, list):
+                    logger.error(f"❌ 벡터 검색 실패: {vector_results.get('message') if isinstance(vector_results, dict) else vector_results}")
+                    vector_results = []
+                logger.info(f"🔍 벡터 {len(vector_results)}개 / 어휘 {len(lexical_results)}개 결과")
+
+                raw = reciprocal_rank_fusion(
+                    [("vector", vector_results), ("lexical", lexical_results)]
+                )[:top_k]
+                if raw:
+                    logger.info(f"✅ RRF 결합 결과: {len(raw)}개")
                 else:
-                    logger.warning(f"⚠️ Qdrant에서 결과를 찾을 수 없음: {search_title}")
-                    raw = []
+                    logger.warning(f"⚠️ 검색 결과를 찾을 수 없음: {search_title}")
             except Exception as e:
-                logger.error(f"❌ Qdrant 검색 실패: {e}")
+                logger.error(f"❌ 검색 실패: {e}")
                 raw = []
             
             logger.info(f"📊 RAG 검색 결과: {len(raw) if isinstance(raw, list) else 'error'} 개")
@@ -303,13 +448,14 @@ class ReportService:
                 logger.error(f"❌ RAG search error: {raw.get('message')}")
                 return []
 
-            if isinstance(raw, list):
-                logger.info(f"📋 검색된 청크들:")
+            # 청크 단위 상세 로그는 샘플링된 요청에서만 (RAG_DEBUG_SAMPLE_RATE)
+            if isinstance(raw, list) and debug_sampled(logger):
+                logger.debug(f"📋 검색된 청크들:")
                 for i, r in enumerate(raw):
-                    logger.info(f"  {i+1}. Score: {r.get('score', 0.0):.3f}")
-                    logger.info(f"     Title: {r.get('title', 'N/A')}")
-                    logger.info(f"     Content: {r.get('content', 'N/A')[:100]}...")
-                    logger.info(f"     Metadata: {r.get('metadata', {})}")
+                    logger.debug(f"  {i+1}. Score: {r.get('score', 0.0):.3f}")
+                    logger.debug(f"     Title: {r.get('title', 'N/A')}")
+                    logger.debug(f"     Content: {r.get('content', 'N/A')[:100]}...")
+                    logger.debug(f"     Metadata: {r.get('metadata', {})}")
 
             processed = []
             for r in raw:
@@ -323,6 +469,8 @@ class ReportService:
                     "images": r.get("images", []),
                     "order": r.get("order", 0),
                     "score": r.get("score", 0.0),
+                    "vector_score": r.get("vector_score"),
+                    "lexical_score": r.get("lexical_score"),
                 })
             
             logger.info(f"✅ 처리된 결과: {len(processed)} 개")
@@ -332,13 +480,16 @@ class ReportService:
             # RAG 실패 시에도 기본 응답 반환
             return []
 
-    def get_indicator_summary(self, indicator_id: str) -> str:
+    async def get_indicator_summary(self, indicator_id: str) -> str:
+        from langchain.schema import SystemMessage, HumanMessage
         try:
-            documents = self.search_indicator(indicator_id, limit=3)
+            documents = await self.search_indicator(indicator_id, limit=3)
             if not documents:
                 return "해당 지표에 대한 정보를 찾을 수 없습니다. RAG 검색 결과가 없습니다."
 
-            content = "\n".join([doc.get("content", "") for doc in documents])
+            with span("prompt"):
+                packed = ContextPacker.for_path("summary").pack(documents)
+            content = "\n".join(packed.chunks)
             system = SystemMessage(content="""
             너는 ESG 보고서 작성 전문가야.
             아래 지표 설명 텍스트를 바탕으로 다음과 같이 요약해줘:
@@ -349,7 +500,8 @@ class ReportService:
             user = HumanMessage(content=f"[지표 ID: {indicator_id}]\n\n{content}")
 
             llm = self._build_llm()
-            response = llm.invoke([system, user])
+            with span("llm"):
+                response = await llm.ainvoke([system, user])
             return response.content.strip()
         except Exception:
             logger.exception("지표 요약 생성 실패")
@@ -403,25 +555,15 @@ class ReportService:
         return rows
 
     def _read_text_files(self, paths: List[str]) -> List[str]:
-        """테이블 HTML 파일 경로 목록을 읽어 본문 삽입용 문자열 리스트로 반환"""
-        out: List[str] = []
-        for p in paths or []:
-            abs_path = os.path.join(self.doc_root, p)
-            try:
-                with open(abs_path, "r", encoding="utf-8") as f:
-                    out.append(f.read())
-            except UnicodeDecodeError:
-                with open(abs_path, "r", encoding="cp949", errors="ignore") as f:
-                    out.append(f.read())
-            except Exception as e:
-                logger.warning(f"표 파일 로드 실패: {abs_path} ({e})")
-        return out
+        """테이블 HTML 파일 경로 목록을 본문 삽입용 문자열 리스트로 반환 (표 저장소에서 조회, 파일 I/O 없음)"""
+        return get_table_store().get_many(paths)
 
-    def generate_input_fields(self, indicator_id: str) -> Dict[str, Any]:
+    async def generate_input_fields(self, indicator_id: str) -> Dict[str, Any]:
+        from langchain.schema import SystemMessage, HumanMessage
         try:
             logger.info(f"🎯 입력 필드 생성 시작: 지표 ID = {indicator_id}")
             
-            documents = self.search_indicator(indicator_id, limit=5)
+            documents = await self.search_indicator(indicator_id, limit=5)
             logger.info(f"📄 검색된 문서 수: {len(documents)}")
             
             if not documents:
@@ -432,7 +574,7 @@ class ReportService:
                     "required_fields": []
                 }
 
-            chunks = [d.get("content", "") for d in documents]
+            chunks = ContextPacker.for_path("input_fields").pack(documents).chunks
             logger.info(f"📝 추출된 청크 수: {len(chunks)}")
             logger.info(f"📄 첫 번째 청크 내용: {chunks[0][:200] if chunks else 'N/A'}...")
 
@@ -460,7 +602,8 @@ class ReportService:
 
             logger.info(f"🤖 LLM 호출 시작...")
             llm = self._build_llm()
-            resp = llm.invoke([system, user])
+            with span("llm"):
+                resp = await llm.ainvoke([system, user])
             logger.info(f"🤖 LLM 응답 완료: {len(resp.content)} 문자")
             
             parsed = self.parse_markdown_to_fields(resp.content)
@@ -478,70 +621,162 @@ class ReportService:
                 "required_fields": []
             }
 
-    def generate_indicator_draft(self, indicator_id: str, company_name: str, inputs: Dict[str, Any]) -> str:
-        try:
-            docs = self.search_indicator(indicator_id, limit=5)
-            if not docs:
-                return "해당 지표에 대한 정보를 찾을 수 없습니다. RAG 검색 결과가 없습니다."
-
-            chunks = [d.get("content", "") for d in docs]
-            table_paths: List[str] = []
-            for d in docs:
-                table_paths.extend(d.get("tables", []) or [])
-            table_htmls = self._read_text_files(table_paths)
-
-            system = SystemMessage(content="""
-            너는 ESG 보고서를 작성하는 전문 컨설턴트야.
-            제공한 지표 설명과 표 HTML을 바탕으로 보고서 초안을 작성해.
-
-            ▶ 전반 톤&스타일
-            - 공식적·객관적 문체, 사실/수치 중심, 격식체 종결.
-            - 추측/원인 해석/메타표현 금지.
+    async def _build_draft_messages(self, indicator_id: str, company_name: str, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        초안 생성용 프롬프트 구성 (RAG 검색 + 표 HTML 로드)
+        반환: {"messages": [...] | None, "chunk_ids": [...], "table_paths": [...], "context": {패킹 요약}}
+        """
+        from langchain.schema import SystemMessage, HumanMessage
+        docs = await self.search_indicator(indicator_id, limit=5)
+        if not docs:
+            return {"messages": None, "chunk_ids": [], "table_paths": [], "context": None}
+
+        with span("prompt"):
+            packed = ContextPacker.for_path("draft").pack(docs, include_tables=True)
+        chunks = packed.chunks
+        table_htmls = packed.tables
+
+        system = SystemMessage(content="""
+        너는 ESG 보고서를 작성하는 전문 컨설턴트야.
+        제공한 지표 설명과 표 HTML을 바탕으로 보고서 초안을 작성해.
+
+        ▶ 전반 톤&스타일
+        - 공식적·객관적 문체, 사실/수치 중심, 격식체 종결.
+        - 추측/원인 해석/메타표현 금지.
+
+        ▶ 구조
+        1) 의미별 소제목 2개 이상 구성
+        2) 소제목별로 사용자 입력값을 서술형으로 자연스럽게 녹여 쓰기(단답 나열 금지)
+        3) 표 HTML은 **본문에 그대로 삽입**하고, 각 표는 한 줄 설명 뒤에 `<table>...</table>` 원문을 그대로 넣기
+           (여러 표가 있어도 모두 삽입. 요약/생략 절대 금지)
+
+        ▶ 수치/표 규칙
+        - 표의 수치를 본문에 반복해서 쓰지 말 것(표로만 제시).
+        """)
+        flat_inputs: List[str] = []
+        for k, v in inputs.items():
+            if isinstance(v, dict):
+                for sk, sv in v.items():
+                    flat_inputs.append(f"- {k} ({sk}): {sv}")
+            else:
+                flat_inputs.append(f"- {k}: {v}")
 
-            ▶ 구조
-            1) 의미별 소제목 2개 이상 구성
-            2) 소제목별로 사용자 입력값을 서술형으로 자연스럽게 녹여 쓰기(단답 나열 금지)
-            3) 표 HTML은 **본문에 그대로 삽입**하고, 각 표는 한 줄 설명 뒤에 `<table>...</table>` 원문을 그대로 넣기
-               (여러 표가 있어도 모두 삽입. 요약/생략 절대 금지)
+        user = HumanMessage(content=f"""
+        [지표 ID] {indicator_id}
+        [회사명] {company_name}
 
-            ▶ 수치/표 규칙
-            - 표의 수치를 본문에 반복해서 쓰지 말 것(표로만 제시).
-            """)
-            flat_inputs: List[str] = []
-            for k, v in inputs.items():
-                if isinstance(v, dict):
-                    for sk, sv in v.items():
-                        flat_inputs.append(f"- {k} ({sk}): {sv}")
-                else:
-                    flat_inputs.append(f"- {k}: {v}")
+        [지표 설명 텍스트]
+        {chr(10).join(chunks)}
 
-            user = HumanMessage(content=f"""
-            [지표 ID] {indicator_id}
-            [회사명] {company_name}
+        [표 HTML 원문들]
+        {chr(10).join(table_htmls)}
 
-            [지표 설명 텍스트]
-            {chr(10).join(chunks)}
+        [사용자 입력 데이터]
+        {chr(10).join(flat_inputs)}
+        """)
 
-            [표 HTML 원문들]
-            {chr(10).join(table_htmls)}
+        return {
+            "messages": [system, user],
+            "chunk_ids": packed.chunk_ids,
+            "table_paths": packed.table_paths,
+            "context": packed.summary(),
+        }
 
-            [사용자 입력 데이터]
-            {chr(10).join(flat_inputs)}
-            """)
+    async def generate_indicator_draft(self, indicator_id: str, company_name: str, inputs: Dict[str, Any]) -> str:
+        try:
+            prompt = await self._build_draft_messages(indicator_id, company_name, inputs)
+            if not prompt["messages"]:
+                return "해당 지표에 대한 정보를 찾을 수 없습니다. RAG 검색 결과가 없습니다."
 
             llm = self._build_llm()
-            resp = llm.invoke([system, user])
+            with span("llm"):
+                resp = await llm.ainvoke(prompt["messages"])
             return resp.content.strip()
         except Exception:
             logger.exception("초안 생성 실패")
             return "⚠️ 초안 생성 중 오류가 발생했습니다."
 
+    # ===== 초안 스트리밍 (SSE) =====
+    async def prepare_indicator_draft(
+        self, indicator_id: str, company_name: str, inputs: Dict[str, Any], require_indicator: bool = False
+    ) -> Dict[str, Any]:
+        """
+        스트리밍 초안 생성의 DB/RAG 단계 (LLM 호출 전까지)
+        - DB 세션이 필요한 작업은 여기서 모두 끝내고, 스트리밍 중에는 세션을 점유하지 않음
+        """
+        started = time.perf_counter()
+        if require_indicator:
+            with span("db"):
+                exists = await run_in_threadpool(self.get_indicator, indicator_id)
+            if not exists:
+                return {"error": f"지표 {indicator_id}를 찾을 수 없습니다.", "messages": None}
+
+        prompt = await self._build_draft_messages(indicator_id, company_name, inputs)
+        prompt["retrieval_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        if not prompt["messages"]:
+            prompt["error"] = "해당 지표에 대한 정보를 찾을 수 없습니다. RAG 검색 결과가 없습니다."
+        return prompt
+
+    async def stream_indicator_draft(self, prepared: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        준비된 프롬프트로 LLM 스트리밍 호출
+        yield: {"event": "token", "data": {...}} ... {"event": "done", "data": {메타데이터}}
+        """
+        if prepared.get("error"):
+            yield {"event": "error", "data": {"message": prepared["error"]}}
+            return
+
+        messages = prepared["messages"]
+        prompt_tokens = sum(count_tokens(m.content) for m in messages)
+        parts: List[str] = []
+        usage: Optional[Dict[str, Any]] = None
+        first_token_ms = None
+        started = time.perf_counter()
+        try:
+            llm = self._build_llm()
+            llm_started = time.perf_counter()
+            async for chunk in llm.astream(messages):
+                text = chunk.content or ""
+                if getattr(chunk, "usage_metadata", None):
+                    usage = dict(chunk.usage_metadata)
+                if not text:
+                    continue
+                if first_token_ms is None:
+                    first_token_ms = round((time.perf_counter() - started) * 1000, 1)
+                parts.append(text)
+                yield {"event": "token", "data": {"text": text}}
+        except Exception as e:
+            logger.exception("초안 스트리밍 실패")
+            yield {"event": "error", "data": {"message": f"초안 생성 중 오류가 발생했습니다: {str(e)}"}}
+            return
+
+        draft = "".join(parts)
+        # SSE는 헤더가 먼저 나가므로 스트리밍 구간 단계 시간은 done 이벤트로만 전달
+        record("llm", time.perf_counter() - llm_started)
+        yield {
+            "event": "done",
+            "data": {
+                "chunk_ids": prepared.get("chunk_ids", []),
+                "table_paths": prepared.get("table_paths", []),
+                "context": prepared.get("context"),
+                "prompt_tokens": (usage or {}).get("input_tokens", prompt_tokens),
+                "completion_tokens": (usage or {}).get("output_tokens", count_tokens(draft)),
+                "timings": {
+                    "retrieval_ms": prepared.get("retrieval_ms"),
+                    "first_token_ms": first_token_ms,
+                    "generation_ms": round((time.perf_counter() - started) * 1000, 1),
+                    "stages_ms": stage_timings(),
+                },
+                "generated_at": datetime.now().isoformat(),
+            },
+        }
+
     def save_indicator_data(self, indicator_id: str, company_name: str, inputs: Dict[str, Any]) -> Dict[str, Any]:
         try:
             existing = self.report_repository.get_report(indicator_id, company_name)
             if existing:
                 # KBZ 테이블에서 sub_title 가져오기
-                kbz_indicator = self.report_repository.get_indicator_by_id(indicator_id)
+                kbz_indicator = self.get_indicator(indicator_id)
                 title = kbz_indicator.subcategory if kbz_indicator else existing.title
                 
                 self.report_repository.update_report(
@@ -550,7 +785,7 @@ class ReportService:
                 )
             else:
                 # KBZ 테이블에서 sub_title 가져오기
-                kbz_indicator = self.report_repository.get_indicator_by_id(indicator_id)
+                kbz_indicator = self.get_indicator(indicator_id)
                 title = kbz_indicator.subcategory if kbz_indicator else f"{indicator_id} 보고서"
                 
                 self.report_repository.create_report(
@@ -573,6 +808,62 @@ class ReportService:
                 "company_name": company_name
             }
 
+    def patch_indicator_data(self, indicator_id: str, company_name: str, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """변경된 입력값만 metadata.inputs 에 병합 (null 은 삭제). 보고서가 없으면 저장으로 생성"""
+        try:
+            patched = self.report_repository.patch_report(
+                topic=indicator_id, company_name=company_name, metadata_patch={"inputs": inputs}
+            )
+            if patched is None:
+                return self.save_indicator_data(
+                    indicator_id, company_name, {k: v for k, v in inputs.items() if v is not None}
+                )
+            return {
+                "success": True,
+                "message": f"{indicator_id} 지표 입력값 {len(inputs)}개가 반영되었습니다.",
+                "indicator_id": indicator_id,
+                "company_name": company_name,
+                "updated_fields": sorted(inputs),
+                "saved_at": datetime.now().isoformat()
+            }
+        except Exception as e:
+            logger.exception("지표 데이터 부분 저장 실패")
+            return {
+                "success": False,
+                "message": f"지표 데이터 부분 저장 중 오류가 발생했습니다: {str(e)}",
+                "indicator_id": indicator_id,
+                "company_name": company_name
+            }
+
+    def save_indicator_draft(
+        self, indicator_id: str, company_name: str, draft_content: str, inputs: Optional[Dict[str, Any]] = None
+    ):
+        """생성된 초안을 보고서 content로 저장 (없으면 생성, 기존 metadata는 유지)"""
+        generated_at = datetime.now().isoformat()
+        existing = self.report_repository.get_report(indicator_id, company_name)
+        if existing:
+            self._record_pending_edits(existing)
+            meta = dict(getattr(existing, "meta", None) or {})
+            if inputs is not None:
+                meta["inputs"] = inputs
+            meta["draft_generated_at"] = generated_at
+            report = self.report_repository.update_report(
+                topic=indicator_id, company_name=company_name,
+                content=draft_content, metadata=meta
+            )
+            self._record_revision(report, "draft")
+            return report
+
+        kbz_indicator = self.get_indicator(indicator_id)
+        title = kbz_indicator.subcategory if kbz_indicator else f"{indicator_id} 보고서"
+        report = self.report_repository.create_report(
+            topic=indicator_id, company_name=company_name, report_type="indicator",
+            title=title, content=draft_content,
+            metadata={"inputs": inputs or {}, "draft_generated_at": generated_at}
+        )
+        self._record_revision(report, "draft")
+        return report
+
     def get_indicator_data(self, indicator_id: str, company_name: str) -> Dict[str, Any]:
         try:
             r = self.report_repository.get_report(indicator_id, company_name)
@@ -602,9 +893,35 @@ class ReportService:
             }
 
     # ===== 지표 관리 =====
-    def get_all_indicators(self) -> IndicatorListResponse:
+    def indicator_catalog(self) -> Optional[CatalogSnapshot]:
+        """인메모리 지표 카탈로그 스냅샷 (로드 실패 시 None → DB 직접 조회)"""
         try:
-            indicators = self.report_repository.get_all_indicators()
+            return get_indicator_catalog().snapshot(self.report_repository)
+        except Exception as e:
+            logger.warning(f"⚠️ 지표 카탈로그 사용 불가, DB 직접 조회: {e}")
+            return None
+
+    def get_indicator(self, indicator_id: str):
+        """지표 ID 조회 (카탈로그 우선)"""
+        catalog = self.indicator_catalog()
+        if catalog is None:
+            return self.report_repository.get_indicator_by_id(indicator_id)
+        return catalog.get(indicator_id)
+
+    def refresh_indicator_catalog(self) -> Dict[str, Any]:
+        catalog = get_indicator_catalog()
+        catalog.invalidate()
+        try:
+            snapshot = catalog.snapshot(self.report_repository)
+            return {"success": True, "message": "지표 카탈로그를 다시 로드했습니다.", **snapshot.stats()}
+        except Exception as e:
+            logger.exception("지표 카탈로그 재로드 실패")
+            return {"success": False, "message": f"지표 카탈로그 재로드 중 오류가 발생했습니다: {str(e)}"}
+
+    def get_all_indicators(self, catalog: Optional[CatalogSnapshot] = None) -> IndicatorListResponse:
+        try:
+            catalog = catalog or self.indicator_catalog()
+            indicators = catalog.indicators if catalog else self.report_repository.get_all_indicators()
             indicator_responses = []
             for indicator in indicators:
                 indicator_responses.append(IndicatorResponse(
@@ -636,9 +953,13 @@ class ReportService:
                 total_count=0
             )
 
-    def get_indicators_by_category(self, category: str) -> IndicatorListResponse:
+    def get_indicators_by_category(self, category: str, catalog: Optional[CatalogSnapshot] = None) -> IndicatorListResponse:
         try:
-            indicators = self.report_repository.get_indicators_by_category(category)
+            catalog = catalog or self.indicator_catalog()
+            if catalog:
+                indicators = catalog.by_category.get(category, [])
+            else:
+                indicators = self.report_repository.get_indicators_by_category(category)
             indicator_responses = []
             for indicator in indicators:
                 indicator_responses.append(IndicatorResponse(
@@ -671,13 +992,14 @@ class ReportService:
             )
 
     # ===== 개별 지표 처리 메서드 (새로 추가) =====
-    def process_single_indicator(self, indicator_id: str, company_name: str, inputs: Dict[str, Any]) -> IndicatorDraftResponse:
+    async def process_single_indicator(self, indicator_id: str, company_name: str, inputs: Dict[str, Any]) -> IndicatorDraftResponse:
         """
         개별 지표 처리: 입력필드 생성 → 초안 생성 (한 번에 처리)
         """
         try:
             # 1. 지표 정보 조회
-            indicator = self.report_repository.get_indicator_by_id(indicator_id)
+            with span("db"):
+                indicator = await run_in_threadpool(self.get_indicator, indicator_id)
             if not indicator:
                 return IndicatorDraftResponse(
                     success=False,
@@ -690,13 +1012,13 @@ class ReportService:
 
             # 2. RAG 기반 입력필드 생성 (필요시)
             if not inputs:
-                inputs = self.generate_input_fields_only(indicator_id)
+                inputs = await self.generate_input_fields_only(indicator_id)
             
             # 3. 필드 스키마를 값으로 변환 (보정)
             inputs = self._coerce_field_schema_to_values(inputs)
 
             # 4. 초안 생성
-            draft_content = self.generate_indicator_draft(indicator_id, company_name, inputs)
+            draft_content = await self.generate_indicator_draft(indicator_id, company_name, inputs)
 
             return IndicatorDraftResponse(
                 success=True,
@@ -717,18 +1039,20 @@ class ReportService:
                 generated_at=datetime.now()
             )
 
-    def generate_input_fields_only(self, indicator_id: str) -> Dict[str, Any]:
+    async def generate_input_fields_only(self, indicator_id: str) -> Dict[str, Any]:
         """
         개별 지표의 입력필드만 생성 (RAG 기반 AI 생성)
         """
+        from langchain.schema import SystemMessage, HumanMessage
         try:
-            indicator = self.report_repository.get_indicator_by_id(indicator_id)
+            with span("db"):
+                indicator = await run_in_threadpool(self.get_indicator, indicator_id)
             if not indicator:
                 logger.warning(f"⚠️ 지표를 찾을 수 없음: {indicator_id}")
                 return {}
 
             # search_indicator 메서드를 사용하여 KBZ 테이블의 title로 정확한 검색
-            search_results = self.search_indicator(indicator_id, limit=10)  # 더 많은 결과 검색
+            search_results = await self.search_indicator(indicator_id, limit=10)  # 더 많은 결과 검색
             logger.info(f"📄 검색된 문서 수: {len(search_results)}")
 
             if not search_results:
@@ -736,7 +1060,7 @@ class ReportService:
                 return {}
 
             # RAG 검색 결과를 기반으로 AI가 입력필드 생성
-            chunks = [result.get("content", "") for result in search_results]
+            chunks = ContextPacker.for_path("input_fields").pack(search_results).chunks
             작성_블록 = self.extract_작성내용(chunks)
             
             system = SystemMessage(content="""
@@ -780,7 +1104,8 @@ class ReportService:
 
             logger.info(f"🤖 AI 입력필드 생성 시작...")
             llm = self._build_llm()
-            resp = llm.invoke([system, user])
+            with span("llm"):
+                resp = await llm.ainvoke([system, user])
             logger.info(f"🤖 AI 입력필드 생성 완료: {len(resp.content)} 문자")
             
             # JSON 파싱 (더 안전한 방식)
@@ -829,12 +1154,13 @@ class ReportService:
             logger.exception(f"입력필드 생성 실패: {indicator_id}")
             return {}
 
-    def generate_indicator_draft_only(self, indicator_id: str, company_name: str, inputs: Dict[str, Any]) -> IndicatorDraftResponse:
+    async def generate_indicator_draft_only(self, indicator_id: str, company_name: str, inputs: Dict[str, Any]) -> IndicatorDraftResponse:
         """
         개별 지표의 초안만 생성 (입력된 데이터 기반)
         """
         try:
-            indicator = self.report_repository.get_indicator_by_id(indicator_id)
+            with span("db"):
+                indicator = await run_in_threadpool(self.get_indicator, indicator_id)
             if not indicator:
                 return IndicatorDraftResponse(
                     success=False,
@@ -846,7 +1172,7 @@ class ReportService:
                 )
 
             # 초안 생성
-            draft_content = self.generate_indicator_draft(indicator_id, company_name, inputs)
+            draft_content = await self.generate_indicator_draft(indicator_id, company_name, inputs)
 
             return IndicatorDraftResponse(
                 success=True,
@@ -867,12 +1193,13 @@ class ReportService:
                 generated_at=datetime.now()
             )
 
-    def get_indicator_with_recommended_fields(self, indicator_id: str) -> IndicatorInputFieldResponse:
+    async def get_indicator_with_recommended_fields(self, indicator_id: str) -> IndicatorInputFieldResponse:
         """
         지표와 함께 추천 필드를 반환
         """
         try:
-            indicator = self.report_repository.get_indicator_by_id(indicator_id)
+            with span("db"):
+                indicator = await run_in_threadpool(self.get_indicator, indicator_id)
             if not indicator:
                 return IndicatorInputFieldResponse(
                     success=False, 
@@ -884,7 +1211,7 @@ class ReportService:
                 )
             
             # 추천 필드 생성 (기존 generate_input_fields 활용)
-            gen = self.generate_input_fields(indicator_id)
+            gen = await self.generate_input_fields(indicator_id)
             return IndicatorInputFieldResponse(
                 success=True, 
                 message="입력필드 추천을 생성했습니다.",
@@ -904,12 +1231,12 @@ class ReportService:
                 recommended_fields=[]
             )
 
-    def generate_enhanced_draft(self, indicator_id: str, company_name: str, inputs: Dict[str, Any]) -> IndicatorDraftResponse:
+    async def generate_enhanced_draft(self, indicator_id: str, company_name: str, inputs: Dict[str, Any]) -> IndicatorDraftResponse:
         """
         향상된 초안 생성
         """
         try:
-            draft = self.generate_indicator_draft(indicator_id, company_name, inputs)
+            draft = await self.generate_indicator_draft(indicator_id, company_name, inputs)
             return IndicatorDraftResponse(
                 success=True, 
                 message="향상된 초안을 생성했습니다.",
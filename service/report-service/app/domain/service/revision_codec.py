@@ -0,0 +1,86 @@
+"""
+보고서 리비전 인코딩 (줄 단위 delta + zlib)
+- snapshot: 본문 전체를 zlib 압축
+- delta: 직전 리비전 대비 difflib 줄 단위 편집 목록을 JSON → zlib 압축
+  [[i1, i2], "추가된 줄\n", ...]  숫자 쌍은 직전 본문의 줄 [i1, i2) 복사, 문자열은 그대로 삽입
+- 직전 스냅샷 이후 snapshot_every 개째이거나 delta가 전체 압축본보다 크면 snapshot으로 저장
+  → 임의 리비전 복원 비용은 스냅샷 1개 + delta 최대 snapshot_every-1 개 적용
+"""
+from typing import Iterable, List, Optional, Tuple, Union
+import difflib
+import hashlib
+import json
+import zlib
+
+SNAPSHOT = "snapshot"
+DELTA = "delta"
+
+_Op = Union[List[int], str]
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def compress_text(text: str) -> bytes:
+    return zlib.compress(text.encode("utf-8"), 9)
+
+
+def decompress_text(data: bytes) -> str:
+    return zlib.decompress(data).decode("utf-8")
+
+
+def make_delta(base: str, target: str) -> bytes:
+    """base → target 줄 단위 편집 목록 (압축)"""
+    base_lines = base.splitlines(keepends=True)
+    target_lines = target.splitlines(keepends=True)
+    ops: List[_Op] = []
+    matcher = difflib.SequenceMatcher(None, base_lines, target_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif tag in ("replace", "insert"):
+            ops.append("".join(target_lines[j1:j2]))
+    raw = json.dumps(ops, ensure_ascii=False, separators=(",", ":"))
+    return zlib.compress(raw.encode("utf-8"), 9)
+
+
+def apply_delta(base: str, delta: bytes) -> str:
+    base_lines = base.splitlines(keepends=True)
+    parts: List[str] = []
+    for op in json.loads(zlib.decompress(delta).decode("utf-8")):
+        if isinstance(op, str):
+            parts.append(op)
+        else:
+            parts.extend(base_lines[op[0]:op[1]])
+    return "".join(parts)
+
+
+def encode_revision(base: Optional[str], target: str, since_snapshot: int, snapshot_every: int) -> Tuple[str, bytes]:
+    """
+    새 리비전 저장 형식 결정
+    - base: 직전 리비전 본문 (없으면 snapshot)
+    - since_snapshot: 직전 리비전이 마지막 스냅샷 이후 몇 번째 delta인지 (스냅샷 자신이면 0)
+    """
+    full = compress_text(target)
+    if base is None or since_snapshot + 1 >= snapshot_every:
+        return SNAPSHOT, full
+    delta = make_delta(base, target)
+    if len(delta) >= len(full):
+        return SNAPSHOT, full
+    return DELTA, delta
+
+
+def reconstruct(chain: Iterable[Tuple[str, bytes]]) -> str:
+    """스냅샷부터 순서대로 (kind, data) 를 적용해 마지막 리비전 본문 복원"""
+    text: Optional[str] = None
+    for kind, data in chain:
+        if kind == SNAPSHOT:
+            text = decompress_text(data)
+        elif text is None:
+            raise ValueError("리비전 체인이 스냅샷으로 시작하지 않습니다.")
+        else:
+            text = apply_delta(text, data)
+    if text is None:
+        raise ValueError("빈 리비전 체인입니다.")
+    return text
@@ -0,0 +1,88 @@
+"""
+Report Revision Service - 보고서 본문 리비전 기록/복원
+- 본문이 바뀌는 저장(생성, PUT 업데이트, 초안 저장)마다 리비전 1개 기록 (본문이 같으면 건너뜀)
+  PATCH 자동 저장은 요청마다 기록하지 않고, 전체 저장이 본문을 덮어쓰기 직전에 현재 본문을 source=patch 로 기록
+  (자동 저장한 수동 편집이 초안 재생성 등으로 덮어써져도 리비전에 남음)
+- 저장 형식은 revision_codec (직전 리비전 대비 줄 단위 delta, REPORT_REVISION_SNAPSHOT_EVERY 마다 스냅샷)
+"""
+from typing import Any, Dict, List, Optional
+import difflib
+import logging
+import os
+
+from sqlalchemy.orm import Session
+
+from ..repository.report_revision_repository import ReportRevisionRepository
+from . import revision_codec
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_EVERY = max(1, int(os.getenv("REPORT_REVISION_SNAPSHOT_EVERY", "10")))
+
+
+class ReportRevisionService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.revision_repository = ReportRevisionRepository(db)
+
+    def record(self, report_id: int, content: Optional[str], source: str) -> Optional[int]:
+        """새 본문을 리비전으로 기록하고 리비전 번호 반환 (변경 없으면 None)"""
+        content = content or ""
+        chain = self.revision_repository.get_chain(report_id)
+        base = None
+        if chain:
+            latest = chain[-1]
+            if latest.content_hash == revision_codec.content_hash(content):
+                return None
+            base = revision_codec.reconstruct((r.kind, r.data) for r in chain)
+        kind, data = revision_codec.encode_revision(base, content, len(chain) - 1, SNAPSHOT_EVERY)
+        revision = chain[-1].revision + 1 if chain else 1
+        saved = self.revision_repository.add_revision(
+            report_id=report_id,
+            revision=revision,
+            kind=kind,
+            data=data,
+            content_hash=revision_codec.content_hash(content),
+            content_length=len(content),
+            source=source,
+        )
+        if saved is None:
+            logger.warning(f"⚠️ 리비전 번호 충돌로 기록 생략: report_id={report_id}, revision={revision}")
+            return None
+        logger.info(f"🗂️ 리비전 기록: report_id={report_id} r{revision} {kind} ({len(data)}B / 본문 {len(content)}자)")
+        return revision
+
+    def list_revisions(self, report_id: int) -> List[Dict[str, Any]]:
+        return self.revision_repository.list_revisions(report_id)
+
+    def get_content(self, report_id: int, revision: int) -> Optional[Dict[str, Any]]:
+        """리비전 본문 복원 (없으면 None)"""
+        chain = self.revision_repository.get_chain(report_id, revision)
+        if not chain or chain[-1].revision != revision:
+            return None
+        content = revision_codec.reconstruct((r.kind, r.data) for r in chain)
+        target = chain[-1]
+        if revision_codec.content_hash(content) != target.content_hash:
+            raise ValueError(f"리비전 {revision} 복원 결과가 저장된 해시와 다릅니다.")
+        return {
+            "revision": target.revision,
+            "kind": target.kind,
+            "source": target.source,
+            "content": content,
+            "content_length": target.content_length,
+            "created_at": target.created_at,
+            "applied_deltas": len(chain) - 1,
+        }
+
+    def diff(self, report_id: int, revision: int, against: int) -> Optional[str]:
+        """against → revision unified diff"""
+        new = self.get_content(report_id, revision)
+        old = self.get_content(report_id, against)
+        if new is None or old is None:
+            return None
+        return "".join(difflib.unified_diff(
+            old["content"].splitlines(keepends=True),
+            new["content"].splitlines(keepends=True),
+            fromfile=f"r{against}",
+            tofile=f"r{revision}",
+        ))
@@ -0,0 +1,184 @@
+"""
+동일 요청 단일 실행 (single-flight)
+- 같은 키(엔드포인트, 지표 ID, 회사명, 입력값 해시)의 호출이 진행 중이면 새로 실행하지 않고 첫 호출 결과를 함께 받음
+  (더블 클릭, 여러 사용자가 같은 지표를 동시에 여는 경우 검색/LLM 비용 1회)
+- 프로세스 내: 첫 호출을 별도 Task로 실행하고 모두 shield로 대기 → 첫 요청이 끊겨도 나머지는 결과를 받음
+- 레플리카 간(선택): SINGLE_FLIGHT_REDIS_URL 지정 시 Redis 락(SET NX PX) + 결과 키(짧은 TTL)로 공유
+  결과는 JSON으로 저장하므로 pydantic 모델은 model 인자로 복원. Redis 오류 시 로컬 실행으로 폴백
+- 진행 중인 호출만 합치며 캐시가 아님 (결과 키 TTL은 대기자가 읽어갈 수 있을 만큼만)
+- SINGLE_FLIGHT=0 이면 비활성화 (모든 호출을 각자 실행)
+"""
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# 소유자일 때만 락 해제
+_RELEASE_LUA = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def request_key(endpoint: str, indicator_id: str, company_name: Optional[str] = None,
+                inputs: Optional[Dict[str, Any]] = None) -> str:
+    """정규화된 요청 키 (입력값은 키 순서와 무관한 해시)"""
+    inputs_hash = ""
+    if inputs:
+        raw = json.dumps(inputs, ensure_ascii=False, sort_keys=True, default=str)
+        inputs_hash = hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+    return ":".join([endpoint, indicator_id.strip(), (company_name or "").strip(), inputs_hash])
+
+
+class SingleFlight:
+    """키별 진행 중 호출 공유 (프로세스 내 Task + 선택적 Redis 락)"""
+
+    def __init__(self, redis_url: Optional[str] = None, lock_ttl_sec: float = 180,
+                 result_ttl_sec: float = 10, poll_ms: float = 200, prefix: str = "report:sf",
+                 enabled: bool = True):
+        self.enabled = enabled
+        self._inflight: Dict[str, Tuple[asyncio.AbstractEventLoop, asyncio.Task]] = {}
+        self._lock = threading.Lock()
+        self.lock_ttl_ms = int(lock_ttl_sec * 1000)
+        self.result_ttl_ms = int(result_ttl_sec * 1000)
+        self.poll = poll_ms / 1000
+        self.prefix = prefix
+        self._redis = None
+        self._stats = {"leaders": 0, "followers": 0, "remote_leaders": 0, "remote_followers": 0, "remote_errors": 0}
+        if redis_url:
+            try:
+                import redis.asyncio as aioredis
+                self._redis = aioredis.from_url(redis_url)
+                logger.info("✅ single-flight Redis 공유 활성화")
+            except ImportError:
+                logger.warning("⚠️ SINGLE_FLIGHT_REDIS_URL 지정됐지만 redis 패키지 미설치 → 프로세스 내 single-flight만 사용")
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    async def run(self, key: str, fn: Callable[[], Awaitable[Any]], model: Optional[Type] = None) -> Any:
+        """key로 진행 중인 호출이 있으면 그 결과를, 없으면 fn() 실행 결과를 반환"""
+        if not self.enabled:
+            return await fn()
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entry = self._inflight.get(key)
+            leader = entry is None or entry[0] is not loop
+            if leader:
+                task = loop.create_task(self._execute(key, fn, model))
+                self._inflight[key] = (loop, task)
+                task.add_done_callback(lambda t, k=key: self._forget(k, t))
+            else:
+                task = entry[1]
+        self._count("leaders" if leader else "followers")
+        if not leader:
+            logger.info(f"🔁 동일 요청 진행 중, 결과 공유 대기: {key}")
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task):
+        with self._lock:
+            entry = self._inflight.get(key)
+            if entry is not None and entry[1] is task:
+                del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # 대기자가 모두 사라진 경우 'exception never retrieved' 경고 방지
+
+    # ---------- 레플리카 간 공유 ----------
+    async def _execute(self, key: str, fn: Callable[[], Awaitable[Any]], model: Optional[Type]) -> Any:
+        if self._redis is None:
+            return await fn()
+        try:
+            return await self._execute_remote(key, fn, model)
+        except _RemoteUnavailable:
+            return await fn()
+
+    async def _execute_remote(self, key: str, fn: Callable[[], Awaitable[Any]], model: Optional[Type]) -> Any:
+        lock_key = f"{self.prefix}:{key}:lock"
+        result_key = f"{self.prefix}:{key}:result"
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.lock_ttl_ms / 1000
+        waited = False
+        while True:
+            try:
+                cached = await self._redis.get(result_key)
+                if cached is not None:
+                    self._count("remote_followers")
+                    return _decode(cached, model)
+                acquired = await self._redis.set(lock_key, token, nx=True, px=self.lock_ttl_ms)
+            except Exception as e:
+                self._count("remote_errors")
+                logger.warning(f"⚠️ single-flight Redis 오류, 로컬 실행: {e}")
+                raise _RemoteUnavailable() from e
+            if acquired:
+                break
+            if not waited:
+                logger.info(f"🔁 다른 인스턴스에서 동일 요청 진행 중, 결과 대기: {key}")
+                waited = True
+            if time.monotonic() > deadline:
+                raise _RemoteUnavailable()
+            await asyncio.sleep(self.poll)
+
+        self._count("remote_leaders")
+        try:
+            result = await fn()
+            try:
+                await self._redis.set(result_key, _encode(result), px=self.result_ttl_ms)
+            except Exception as e:
+                self._count("remote_errors")
+                logger.warning(f"⚠️ single-flight 결과 공유 실패: {e}")
+            return result
+        finally:
+            try:
+                await self._redis.eval(_RELEASE_LUA, 1, lock_key, token)
+            except Exception as e:
+                logger.warning(f"⚠️ single-flight 락 해제 실패 (TTL 만료로 해제됨): {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "enabled": self.enabled, "in_flight": len(self._inflight), "shared": self._redis is not None}
+
+
+class _RemoteUnavailable(Exception):
+    """Redis 사용 불가/대기 시간 초과 → 이 인스턴스에서 직접 실행"""
+
+
+def _encode(result: Any) -> str:
+    if hasattr(result, "model_dump"):
+        result = result.model_dump(mode="json")
+    elif hasattr(result, "dict"):
+        result = result.dict()
+    return json.dumps(result, ensure_ascii=False, default=str)
+
+
+def _decode(raw: Any, model: Optional[Type]) -> Any:
+    data = json.loads(raw)
+    if model is None:
+        return data
+    if hasattr(model, "model_validate"):
+        return model.model_validate(data)
+    return model.parse_obj(data)
+
+
+_single_flight: Optional[SingleFlight] = None
+
+
+def get_single_flight() -> SingleFlight:
+    global _single_flight
+    if _single_flight is None:
+        _single_flight = SingleFlight(
+            redis_url=os.getenv("SINGLE_FLIGHT_REDIS_URL") or None,
+            lock_ttl_sec=float(os.getenv("SINGLE_FLIGHT_LOCK_TTL_SEC", "180")),
+            result_ttl_sec=float(os.getenv("SINGLE_FLIGHT_RESULT_TTL_SEC", "10")),
+            enabled=os.getenv("SINGLE_FLIGHT", "1") != "0",
+        )
+    return _single_flight
@@ -0,0 +1,223 @@
+"""
+표 HTML 저장소 (DOC_ROOT/tables_gpt/*.html)
+- 시작 시 전체 로드(preload) 또는 조회 시 lazy 로드, 이후 파일 I/O 없이 메모리에서 반환
+- 경로 / 파일명 / (페이지, 표 번호) 세 가지 인덱스 제공
+  (Qdrant payload의 "extracted/.../page66_table19_gpt.html" 같은 경로도 파일명으로 매칭)
+- 공백/코드펜스 제거(minify) 후 zlib 압축 보관, 자주 쓰는 표는 LRU로 압축 해제본 캐시
+- 표별 토큰 수를 미리 계산해 프롬프트 예산 계산에 사용
+- 없는 표 조회 결과는 miss_ttl 초 동안만 기억 (이후 추가된 파일도 재시작 없이 반영, load_all 시 초기화)
+"""
+from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
+import logging
+import os
+import re
+import threading
+import time
+import zlib
+
+from .token_utils import count_tokens
+
+logger = logging.getLogger(__name__)
+
+_PAGE_TABLE_RE = re.compile(r"page(\d+)_table(\d+)", re.IGNORECASE)
+_FENCE_RE = re.compile(r"^\s*```[a-zA-Z]*\s*|\s*```\s*$")
+_BETWEEN_TAGS_RE = re.compile(r">\s+<")
+_SPACES_RE = re.compile(r"\s+")
+
+
+def minify_html(html: str) -> str:
+    """마크다운 코드펜스 제거 + 태그 사이 공백/연속 공백 축소"""
+    html = _FENCE_RE.sub("", html)
+    html = _BETWEEN_TAGS_RE.sub("><", html)
+    return _SPACES_RE.sub(" ", html).strip()
+
+
+def parse_page_table(path: str) -> Optional[Tuple[int, int]]:
+    """파일명에서 (페이지, 표 번호) 추출. 예: page100_table37_gpt.html -> (100, 37)"""
+    m = _PAGE_TABLE_RE.search(os.path.basename(path))
+    if not m:
+        return None
+    return int(m.group(1)), int(m.group(2))
+
+
+def _normalize(path: str) -> str:
+    path = path.replace("\\", "/")
+    while path.startswith("./"):
+        path = path[2:]
+    return path.lstrip("/")
+
+
+class TableEntry:
+    """압축 보관된 표 1개"""
+
+    __slots__ = ("path", "page", "table", "data", "raw_bytes", "tokens")
+
+    def __init__(self, path: str, html: str):
+        self.path = path
+        pt = parse_page_table(path)
+        self.page, self.table = pt if pt else (None, None)
+        encoded = html.encode("utf-8")
+        self.raw_bytes = len(encoded)
+        self.data = zlib.compress(encoded, 6)
+        self.tokens = count_tokens(html)
+
+    def html(self) -> str:
+        return zlib.decompress(self.data).decode("utf-8")
+
+
+class TableStore:
+    """표 HTML 인메모리 인덱스 저장소"""
+
+    def __init__(self, doc_root: str, subdir: str = "tables_gpt", cache_size: int = 64, miss_ttl: float = 60.0):
+        self.doc_root = doc_root
+        self.subdir = subdir
+        self.cache_size = cache_size
+        self.miss_ttl = miss_ttl
+        self._by_path: Dict[str, TableEntry] = {}
+        self._by_name: Dict[str, TableEntry] = {}
+        self._by_page_table: Dict[Tuple[int, int], TableEntry] = {}
+        self._missing: Dict[str, float] = {}  # 정규화 경로 → 다시 파일을 확인할 시각
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.loaded = False
+
+    # ---------- 로드 ----------
+    def _read_file(self, abs_path: str) -> str:
+        try:
+            with open(abs_path, "r", encoding="utf-8") as f:
+                return f.read()
+        except UnicodeDecodeError:
+            with open(abs_path, "r", encoding="cp949", errors="ignore") as f:
+                return f.read()
+
+    def _add(self, rel_path: str, html: str) -> TableEntry:
+        entry = TableEntry(rel_path, minify_html(html))
+        with self._lock:
+            self._by_path[rel_path] = entry
+            self._by_name[os.path.basename(rel_path)] = entry
+            if entry.page is not None:
+                self._by_page_table[(entry.page, entry.table)] = entry
+        return entry
+
+    def load_all(self) -> int:
+        """DOC_ROOT/tables_gpt 아래 모든 .html 로드 (이미 로드된 표는 건너뜀)"""
+        base = os.path.join(self.doc_root, self.subdir)
+        if not os.path.isdir(base):
+            logger.warning(f"⚠️ 표 디렉토리 없음: {base} (lazy 로드로 동작)")
+            return 0
+        with self._lock:
+            self._missing.clear()
+        count = 0
+        for dirpath, _, filenames in os.walk(base):
+            for name in filenames:
+                if not name.lower().endswith(".html"):
+                    continue
+                abs_path = os.path.join(dirpath, name)
+                rel_path = _normalize(os.path.relpath(abs_path, self.doc_root))
+                if rel_path in self._by_path:
+                    continue
+                try:
+                    self._add(rel_path, self._read_file(abs_path))
+                    count += 1
+                except Exception as e:
+                    logger.warning(f"표 파일 로드 실패: {abs_path} ({e})")
+        self.loaded = True
+        stats = self.stats()
+        logger.info(
+            f"✅ 표 저장소 로드 완료: {stats['tables']}개, 원본 {stats['raw_bytes']}B → 압축 {stats['compressed_bytes']}B"
+        )
+        return count
+
+    # ---------- 조회 ----------
+    def _lookup(self, path: str) -> Optional[TableEntry]:
+        norm = _normalize(path)
+        entry = self._by_path.get(norm) or self._by_name.get(os.path.basename(norm))
+        if entry:
+            return entry
+        pt = parse_page_table(norm)
+        if pt and pt in self._by_page_table:
+            return self._by_page_table[pt]
+        if self._missing.get(norm, 0.0) > time.monotonic():
+            return None
+        # preload 이전이거나 디렉토리 밖의 표: 파일에서 1회 로드 후 인덱싱 (DOC_ROOT 밖을 가리키는 경로는 제외)
+        candidates = () if ".." in norm.split("/") else (
+            os.path.join(self.doc_root, norm),
+            os.path.join(self.doc_root, self.subdir, os.path.basename(norm)),
+        )
+        for candidate in candidates:
+            if os.path.isfile(candidate):
+                try:
+                    return self._add(norm, self._read_file(candidate))
+                except Exception as e:
+                    logger.warning(f"표 파일 로드 실패: {candidate} ({e})")
+                    break
+        with self._lock:
+            self._missing[norm] = time.monotonic() + self.miss_ttl
+        return None
+
+    def _html(self, entry: TableEntry) -> str:
+        with self._lock:
+            html = self._cache.get(entry.path)
+            if html is not None:
+                self._cache.move_to_end(entry.path)
+                return html
+        html = entry.html()
+        with self._lock:
+            self._cache[entry.path] = html
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return html
+
+    def get(self, path: str) -> Optional[str]:
+        """경로(또는 파일명)로 표 HTML 조회"""
+        entry = self._lookup(path)
+        return self._html(entry) if entry else None
+
+    def get_by_page_table(self, page: int, table: int) -> Optional[str]:
+        entry = self._by_page_table.get((int(page), int(table)))
+        return self._html(entry) if entry else None
+
+    def get_many(self, paths: List[str]) -> List[str]:
+        """경로 목록 조회 (없는 표는 경고 후 제외)"""
+        out: List[str] = []
+        for p in paths or []:
+            html = self.get(p)
+            if html is None:
+                logger.warning(f"표 파일 로드 실패: {p} (저장소에 없음)")
+                continue
+            out.append(html)
+        return out
+
+    def token_count(self, path: str) -> Optional[int]:
+        """표의 근사 토큰 수 (프롬프트 예산용)"""
+        entry = self._lookup(path)
+        return entry.tokens if entry else None
+
+    def stats(self) -> Dict[str, int]:
+        entries = list(self._by_path.values())
+        return {
+            "tables": len(entries),
+            "raw_bytes": sum(e.raw_bytes for e in entries),
+            "compressed_bytes": sum(len(e.data) for e in entries),
+            "tokens": sum(e.tokens for e in entries),
+            "cached": len(self._cache),
+        }
+
+
+_store: Optional[TableStore] = None
+_store_lock = threading.Lock()
+
+
+def get_table_store() -> TableStore:
+    """프로세스 단위 표 저장소 (DOC_ROOT, TABLE_STORE_CACHE_SIZE, TABLE_STORE_MISS_TTL_SEC 환경변수 사용)"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = TableStore(
+                    doc_root=os.getenv("DOC_ROOT", "."),
+                    cache_size=int(os.getenv("TABLE_STORE_CACHE_SIZE", "64")),
+                    miss_ttl=float(os.getenv("TABLE_STORE_MISS_TTL_SEC", "60")),
+                )
+    return _store
@@ -0,0 +1,47 @@
+"""
+호출 속도 제한 유틸 (토큰 버킷)
+- 스레드 안전: 동기 acquire()는 threadpool 작업에서, acquire_async()는 이벤트 루프에서 사용
+- 토큰을 선점(reserve)하는 방식이라 동시 대기자가 많아도 순서대로 간격이 벌어짐
+"""
+from typing import Optional
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """초당 rate개, 최대 capacity개까지 버스트를 허용하는 토큰 버킷"""
+
+    def __init__(self, rate_per_sec: float, capacity: Optional[float] = None):
+        if rate_per_sec <= 0:
+            raise ValueError("rate_per_sec must be positive")
+        self.rate = float(rate_per_sec)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate_per_sec))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """토큰 1개를 선점하고, 사용 가능해질 때까지 기다려야 할 시간(초)을 반환"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1.0
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self) -> float:
+        """토큰 획득 (블로킹). 대기한 시간(초) 반환"""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """토큰 획득 (논블로킹). 대기한 시간(초) 반환"""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
@@ -0,0 +1,55 @@
+"""
+토큰 수 계산 유틸 (프롬프트 예산/스트리밍 메타데이터용)
+- tiktoken 설치 시 실제 토크나이저 사용, 미설치 시 문자 기반 근사치
+- 근사치: ASCII 4자당 1토큰, 한글 등 비ASCII 문자는 1자당 1토큰
+- TOKEN_COUNTER=approx 이면 tiktoken을 쓰지 않음 (인코딩 파일 다운로드가 불가능한 오프라인 환경)
+"""
+from typing import Optional
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+_encoding = None
+_encoding_loaded = False
+
+
+def _get_encoding():
+    """tiktoken 인코딩 lazy loading (미설치/모델 미지원 시 None)"""
+    global _encoding, _encoding_loaded
+    if _encoding_loaded:
+        return _encoding
+    _encoding_loaded = True
+    if os.getenv("TOKEN_COUNTER", "tiktoken").lower() == "approx":
+        logger.info("ℹ️ TOKEN_COUNTER=approx, 근사 토큰 계산 사용")
+        return None
+    try:
+        import tiktoken
+        model = os.getenv("OPENAI_MODEL", "gpt-4o")
+        try:
+            _encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            _encoding = tiktoken.get_encoding("o200k_base")
+        logger.info(f"✅ tiktoken 인코딩 사용: {_encoding.name}")
+    except Exception as e:
+        logger.info(f"ℹ️ tiktoken 미사용, 근사 토큰 계산으로 대체: {e}")
+        _encoding = None
+    return _encoding
+
+
+def approx_tokens(text: Optional[str]) -> int:
+    """문자 기반 근사 토큰 수"""
+    if not text:
+        return 0
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def count_tokens(text: Optional[str]) -> int:
+    """토큰 수 (tiktoken 가능 시 정확값, 아니면 근사치)"""
+    if not text:
+        return 0
+    enc = _get_encoding()
+    if enc is None:
+        return approx_tokens(text)
+    return len(enc.encode(text, disallowed_special=()))
@@ -0,0 +1,312 @@
+"""
+Qdrant 컬렉션 로컬 미러 (읽기 전용, 프로세스 내 검색)
+- 컬렉션의 벡터/페이로드를 scroll로 내보내 VECTOR_MIRROR_DIR 에 저장
+  (vectors.npy: 정규화된 float32 행렬 → mmap으로 로드, payloads.json, meta.json)
+- 검색은 numpy 내적(코사인) 또는 faiss 설치 시 IndexFlatIP
+- 동기화 스레드가 VECTOR_MIRROR_SYNC_SEC 마다 원격 지문(포인트 id + content_hash)을 비교해
+  바뀌었으면 새 스냅샷을 만들어 원자적으로 교체
+- 마지막 확인 이후 VECTOR_MIRROR_MAX_AGE_SEC 가 지났거나 원격 변경이 감지되어 재구성 전이면 stale
+  → RAGUtils.search_similar 는 Qdrant로 폴백
+
+환경변수: VECTOR_MIRROR=1 로 활성화, VECTOR_MIRROR_COLLECTIONS(기본 esg_manual)
+"""
+from typing import List, Dict, Any, Optional
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def mirror_enabled() -> bool:
+    return os.getenv("VECTOR_MIRROR", "0") == "1"
+
+
+def remote_fingerprint(qdrant_client, collection_name: str, batch: int = 1024) -> Dict[str, Any]:
+    """포인트 id + content_hash(없으면 text_id) 기준 지문 (벡터 없이 payload 일부만 scroll)"""
+    entries: List[str] = []
+    offset = None
+    while True:
+        points, offset = qdrant_client.scroll(
+            collection_name=collection_name,
+            limit=batch,
+            offset=offset,
+            with_payload=["content_hash", "text_id", "chunk_id"],
+            with_vectors=False,
+        )
+        for p in points:
+            payload = p.payload or {}
+            entries.append(f"{p.id}:{payload.get('content_hash') or payload.get('text_id') or payload.get('chunk_id') or ''}")
+        if offset is None:
+            break
+    entries.sort()
+    return {
+        "points": len(entries),
+        "fingerprint": hashlib.sha1("\n".join(entries).encode("utf-8")).hexdigest(),
+    }
+
+
+class MirrorSnapshot:
+    """디스크 스냅샷 1개 (불변, 교체 시 통째로 바뀜)"""
+
+    def __init__(self, path: str, backend: str = "numpy"):
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        with open(os.path.join(path, "payloads.json"), "r", encoding="utf-8") as f:
+            self.payloads: List[Dict[str, Any]] = json.load(f)
+        self.vectors = np.load(os.path.join(path, "vectors.npy"), mmap_mode="r")
+        self.path = path
+        self._faiss = None
+        if backend == "faiss":
+            try:
+                import faiss
+                index = faiss.IndexFlatIP(self.vectors.shape[1])
+                index.add(np.ascontiguousarray(self.vectors, dtype=np.float32))
+                self._faiss = index
+            except ImportError:
+                logger.warning("⚠️ faiss 미설치 - numpy 검색 사용")
+
+    def __len__(self) -> int:
+        return len(self.payloads)
+
+    def _matches(self, payload: Dict[str, Any], filters: Dict[str, Any]) -> bool:
+        return all(payload.get(k) == v for k, v in filters.items())
+
+    def search(self, qvec: List[float], limit: int, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        if not len(self):
+            return []
+        q = np.asarray(qvec, dtype=np.float32)
+        norm = np.linalg.norm(q)
+        if norm > 0:
+            q = q / norm
+        if filters:
+            idx = np.array([i for i, p in enumerate(self.payloads) if self._matches(p, filters)], dtype=np.int64)
+            if not len(idx):
+                return []
+            scores = self.vectors[idx] @ q
+        elif self._faiss is not None:
+            s, i = self._faiss.search(q.reshape(1, -1), min(limit, len(self)))
+            return [{"score": float(sc), **self.payloads[j]} for sc, j in zip(s[0], i[0]) if j >= 0]
+        else:
+            idx = None
+            scores = self.vectors @ q
+        k = min(limit, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            {"score": float(scores[t]), **self.payloads[int(idx[t]) if idx is not None else int(t)]}
+            for t in top
+        ]
+
+
+class VectorMirror:
+    """컬렉션 1개의 로컬 미러 + 동기화"""
+
+    def __init__(self, qdrant_client, collection_name: str, root: str, backend: str = "numpy",
+                 max_age_sec: float = 900.0):
+        self.client = qdrant_client
+        self.collection_name = collection_name
+        self.dir = os.path.join(root, collection_name)
+        self.backend = backend
+        self.max_age_sec = max_age_sec
+        self.snapshot: Optional[MirrorSnapshot] = None
+        self.checked_at = 0.0           # 원격과 일치함을 마지막으로 확인한 시각
+        self.remote_changed = False
+        self.last_error: Optional[str] = None
+        self._sync_lock = threading.Lock()
+
+    # ---------- 상태 ----------
+    def is_fresh(self) -> bool:
+        return (
+            self.snapshot is not None
+            and not self.remote_changed
+            and time.time() - self.checked_at <= self.max_age_sec
+        )
+
+    def status(self) -> Dict[str, Any]:
+        meta = self.snapshot.meta if self.snapshot else {}
+        return {
+            "collection": self.collection_name,
+            "fresh": self.is_fresh(),
+            "points": len(self.snapshot) if self.snapshot else 0,
+            "dim": meta.get("dim"),
+            "fingerprint": meta.get("fingerprint"),
+            "synced_at": meta.get("synced_at"),
+            "checked_seconds_ago": round(time.time() - self.checked_at, 1) if self.checked_at else None,
+            "backend": "faiss" if self.snapshot is not None and self.snapshot._faiss is not None else "numpy",
+            "last_error": self.last_error,
+        }
+
+    # ---------- 로드/내보내기 ----------
+    def _current_path(self) -> Optional[str]:
+        pointer = os.path.join(self.dir, "CURRENT")
+        if not os.path.exists(pointer):
+            return None
+        with open(pointer, "r", encoding="utf-8") as f:
+            path = os.path.join(self.dir, f.read().strip())
+        return path if os.path.isdir(path) else None
+
+    def load_local(self) -> bool:
+        """디스크에 남은 스냅샷 로드 (신선도는 다음 sync에서 확인)"""
+        path = self._current_path()
+        if not path:
+            return False
+        self.snapshot = MirrorSnapshot(path, self.backend)
+        logger.info(f"✅ 벡터 미러 로드: '{self.collection_name}' {len(self.snapshot)}개 ({path})")
+        return True
+
+    def _export(self, fingerprint: Dict[str, Any], batch: int = 256) -> str:
+        vectors: List[List[float]] = []
+        payloads: List[Dict[str, Any]] = []
+        offset = None
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=self.collection_name,
+                limit=batch,
+                offset=offset,
+                with_payload=True,
+                with_vectors=True,
+            )
+            for p in points:
+                vec = p.vector
+                if isinstance(vec, dict):   # named vector 컬렉션이면 첫 번째 벡터 사용
+                    vec = next(iter(vec.values()))
+                vectors.append(vec)
+                payloads.append(dict(p.payload or {}))
+            if offset is None:
+                break
+
+        matrix = np.asarray(vectors, dtype=np.float32).reshape(len(vectors), -1)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = matrix / np.where(norms == 0, 1, norms)
+
+        name = f"snap-{int(time.time() * 1000)}"
+        path = os.path.join(self.dir, name)
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, "vectors.npy"), matrix)
+        with open(os.path.join(path, "payloads.json"), "w", encoding="utf-8") as f:
+            json.dump(payloads, f, ensure_ascii=False)
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "collection": self.collection_name,
+                "dim": int(matrix.shape[1]) if len(matrix) else None,
+                "synced_at": time.time(),
+                **fingerprint,
+            }, f)
+        tmp = os.path.join(self.dir, "CURRENT.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(name)
+        os.replace(tmp, os.path.join(self.dir, "CURRENT"))
+        return path
+
+    def _cleanup(self, keep: str):
+        for name in os.listdir(self.dir):
+            full = os.path.join(self.dir, name)
+            if name.startswith("snap-") and os.path.isdir(full) and full != keep:
+                shutil.rmtree(full, ignore_errors=True)
+
+    # ---------- 동기화 ----------
+    def sync(self, force: bool = False) -> bool:
+        """원격 지문 비교 후 필요 시 재구성. 재구성했으면 True"""
+        with self._sync_lock:
+            try:
+                remote = remote_fingerprint(self.client, self.collection_name)
+                current = self.snapshot.meta.get("fingerprint") if self.snapshot else None
+                if not force and current == remote["fingerprint"]:
+                    self.checked_at = time.time()
+                    self.remote_changed = False
+                    self.last_error = None
+                    return False
+
+                self.remote_changed = self.snapshot is not None
+                started = time.perf_counter()
+                path = self._export(remote)
+                old = self.snapshot
+                self.snapshot = MirrorSnapshot(path, self.backend)
+                self.checked_at = time.time()
+                self.remote_changed = False
+                self.last_error = None
+                if old is not None:
+                    # 이전 mmap 해제는 GC에 맡기고 디렉토리만 정리 (POSIX에서는 열린 파일 삭제 가능)
+                    self._cleanup(keep=path)
+                logger.info(
+                    f"✅ 벡터 미러 동기화: '{self.collection_name}' {len(self.snapshot)}개 "
+                    f"({(time.perf_counter() - started) * 1000:.0f}ms)"
+                )
+                return True
+            except Exception as e:
+                self.last_error = str(e)
+                logger.warning(f"⚠️ 벡터 미러 동기화 실패 ('{self.collection_name}'): {e}")
+                return False
+
+    def search(self, qvec: List[float], limit: int, filters: Optional[Dict[str, Any]] = None) -> Optional[List[Dict[str, Any]]]:
+        """신선한 미러면 결과, 아니면 None (호출 측이 Qdrant로 폴백)"""
+        snapshot = self.snapshot
+        if snapshot is None or not self.is_fresh():
+            return None
+        if snapshot.meta.get("dim") and len(qvec) != snapshot.meta["dim"]:
+            return None
+        return snapshot.search(qvec, limit, filters)
+
+
+_mirrors: Dict[str, VectorMirror] = {}
+_mirrors_lock = threading.Lock()
+_sync_thread: Optional[threading.Thread] = None
+
+
+def mirror_collections() -> List[str]:
+    return [c.strip() for c in os.getenv("VECTOR_MIRROR_COLLECTIONS", "esg_manual").split(",") if c.strip()]
+
+
+def get_vector_mirror(collection_name: str) -> Optional[VectorMirror]:
+    """활성화되어 있고 미러 대상 컬렉션이면 VectorMirror (아니면 None)"""
+    if not mirror_enabled() or collection_name not in mirror_collections():
+        return None
+    mirror = _mirrors.get(collection_name)
+    if mirror is None:
+        with _mirrors_lock:
+            mirror = _mirrors.get(collection_name)
+            if mirror is None:
+                from .rag_utils import get_qdrant_client
+                mirror = VectorMirror(
+                    get_qdrant_client(),
+                    collection_name,
+                    root=os.getenv("VECTOR_MIRROR_DIR", os.path.join(os.getenv("DOC_ROOT", "."), ".vector_mirror")),
+                    backend=os.getenv("VECTOR_MIRROR_BACKEND", "numpy").lower(),
+                    max_age_sec=float(os.getenv("VECTOR_MIRROR_MAX_AGE_SEC", "900")),
+                )
+                _mirrors[collection_name] = mirror
+    return mirror
+
+
+def mirror_status() -> List[Dict[str, Any]]:
+    return [m.status() for m in _mirrors.values()]
+
+
+def start_mirror_sync():
+    """디스크 스냅샷 로드 후 주기적 동기화 스레드 시작 (앱 시작 시 1회)"""
+    global _sync_thread
+    if not mirror_enabled() or (_sync_thread is not None and _sync_thread.is_alive()):
+        return
+    interval = float(os.getenv("VECTOR_MIRROR_SYNC_SEC", "300"))
+
+    def loop():
+        mirrors = [m for m in (get_vector_mirror(c) for c in mirror_collections()) if m]
+        for m in mirrors:
+            try:
+                m.load_local()
+            except Exception as e:
+                logger.warning(f"⚠️ 벡터 미러 로컬 스냅샷 로드 실패: {e}")
+        while True:
+            for m in mirrors:
+                m.sync()
+            time.sleep(interval)
+
+    _sync_thread = threading.Thread(target=loop, name="vector-mirror-sync", daemon=True)
+    _sync_thread.start()
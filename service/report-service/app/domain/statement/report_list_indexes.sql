@@ -0,0 +1,5 @@
+-- 보고서 목록 keyset 페이지네이션용 인덱스
+-- (company_name, updated_at DESC, id DESC) 순서로 읽어 커서 이후 limit 행만 스캔
+-- 서비스 시작 시 report_migration.ensure_report_statements() 가 실행 (IF NOT EXISTS 이므로 반복 실행 안전)
+CREATE INDEX IF NOT EXISTS ix_report_company_updated
+    ON report (company_name, updated_at DESC, id DESC);
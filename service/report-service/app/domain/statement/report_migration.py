@@ -0,0 +1,60 @@
+"""
+report 서비스 DB 마이그레이션 (테이블 + statement/*.sql)
+- report / report_revision / indicator / kbz 테이블 생성 (없을 때만, checkfirst)
+- report_patch_functions.sql: jsonb_merge_patch, report_content_splice (PATCH API에서 사용)
+- report_list_indexes.sql: 목록 keyset 페이지네이션 인덱스 (기존 테이블에는 create_all 이 인덱스를 추가하지 않음)
+
+컨테이너 시작 시 docker-entrypoint.sh 가 서버보다 먼저 실행 (반복 실행 안전):
+    python -m app.domain.statement.report_migration
+엔트리포인트 없이 실행하거나 실패한 경우 서비스 시작 시 백그라운드로 실행 (RUN_DB_MIGRATIONS 기본 1)
+"""
+import logging
+import os
+import sys
+
+logger = logging.getLogger(__name__)
+
+SQL_FILES = ("report_patch_functions.sql", "report_list_indexes.sql")
+
+
+def ensure_report_tables(engine) -> None:
+    """report 서비스 엔티티 테이블 생성 (이미 있으면 건너뜀)"""
+    from eripotter_common.database.base import Base
+    from ..entity.report_entity import Report, ReportRevision, Indicator, KBZIndicator
+
+    tables = [model.__table__ for model in (Report, Indicator, KBZIndicator, ReportRevision)]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    logger.info(f"✅ report 테이블 확인: {', '.join(t.name for t in tables)}")
+
+
+def ensure_report_statements(engine) -> bool:
+    """PostgreSQL 함수/인덱스 생성 (CREATE OR REPLACE / IF NOT EXISTS, 반복 실행 안전). PostgreSQL이 아니면 건너뜀"""
+    if engine.dialect.name != "postgresql":
+        logger.info(f"⏭️ {engine.dialect.name} DB: report 함수/인덱스 설치 건너뜀 (PATCH API 사용 불가)")
+        return False
+    with engine.begin() as conn:
+        for name in SQL_FILES:
+            path = os.path.join(os.path.dirname(__file__), name)
+            with open(path, "r", encoding="utf-8") as f:
+                # no_parameters: RAISE 메시지의 % 를 드라이버가 파라미터 자리로 해석하지 않도록
+                conn.execution_options(no_parameters=True).exec_driver_sql(f.read())
+            logger.info(f"✅ report SQL 적용: {name}")
+    return True
+
+
+def migrate(engine=None) -> None:
+    """테이블 → 함수/인덱스 순서로 적용 (engine 미지정 시 eripotter_common 기본 엔진)"""
+    if engine is None:
+        from eripotter_common.database.base import engine
+    ensure_report_tables(engine)
+    ensure_report_statements(engine)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    try:
+        migrate()
+    except Exception as e:
+        logger.error(f"❌ report 마이그레이션 실패: {e}")
+        sys.exit(1)
+    logger.info("✅ report 마이그레이션 완료")
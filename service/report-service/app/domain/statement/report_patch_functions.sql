@@ -0,0 +1,60 @@
+-- report 부분 업데이트(PATCH)용 함수
+-- 서비스 시작 시 report_migration.ensure_report_statements() 가 실행 (CREATE OR REPLACE 이므로 반복 실행 안전)
+
+-- RFC 7396 JSON Merge Patch
+-- patch가 객체가 아니면 patch로 교체, 값이 null인 키는 삭제, 객체끼리는 재귀 병합
+CREATE OR REPLACE FUNCTION jsonb_merge_patch(target jsonb, patch jsonb)
+RETURNS jsonb
+LANGUAGE plpgsql
+IMMUTABLE
+AS $$
+DECLARE
+    result jsonb;
+    patch_key text;
+    patch_value jsonb;
+BEGIN
+    IF patch IS NULL THEN
+        RETURN target;
+    END IF;
+    IF jsonb_typeof(patch) <> 'object' THEN
+        RETURN patch;
+    END IF;
+    IF target IS NULL OR jsonb_typeof(target) <> 'object' THEN
+        result := '{}'::jsonb;
+    ELSE
+        result := target;
+    END IF;
+    FOR patch_key, patch_value IN SELECT key, value FROM jsonb_each(patch) LOOP
+        IF jsonb_typeof(patch_value) = 'null' THEN
+            result := result - patch_key;
+        ELSE
+            result := jsonb_set(result, ARRAY[patch_key], jsonb_merge_patch(result -> patch_key, patch_value));
+        END IF;
+    END LOOP;
+    RETURN result;
+END;
+$$;
+
+-- 본문 범위 치환: [start_pos, end_pos) (문자 단위, 0부터) 를 replacement 로 교체
+-- start_pos 가 NULL 이면 끝에 추가(append), end_pos 가 NULL 이면 start_pos 위치에 삽입
+-- 범위가 본문 길이를 벗어나면 22023(invalid_parameter_value) 오류
+CREATE OR REPLACE FUNCTION report_content_splice(content text, start_pos integer, end_pos integer, replacement text)
+RETURNS text
+LANGUAGE plpgsql
+IMMUTABLE
+AS $$
+DECLARE
+    base text := coalesce(content, '');
+    base_length integer := char_length(coalesce(content, ''));
+BEGIN
+    IF start_pos IS NULL THEN
+        RETURN base || coalesce(replacement, '');
+    END IF;
+    end_pos := coalesce(end_pos, start_pos);
+    IF start_pos < 0 OR end_pos < start_pos OR end_pos > base_length THEN
+        RAISE EXCEPTION 'content range [%, %) out of bounds (length %)', start_pos, end_pos, base_length
+            USING ERRCODE = '22023';
+    END IF;
+    RETURN substr(base, 1, start_pos) || coalesce(replacement, '') || substr(base, end_pos + 1);
+END;
+$$;
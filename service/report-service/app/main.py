@@ -3,10 +3,12 @@ Report Service main ㅡ MSA 프랙탈 구조
 """
 import logging, sys, traceback, os
 import threading  # 🔥 워밍업용
+import time
 
 # ---------- Logging ----------
+# LOG_LEVEL (기본 INFO) — DEBUG 는 라이브러리 로그까지 쏟아내 부팅/요청 경로를 느리게 하므로 필요할 때만
 logging.basicConfig(
-    level=logging.DEBUG,  # DEBUG 레벨로 변경
+    level=getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO),
     format="%(asctime)s %(levelname)s [%(name)s] %(message)s",
     handlers=[logging.StreamHandler(sys.stdout)],
     force=True,
@@ -29,7 +31,8 @@ except Exception as e:
 # ---------- FastAPI ----------
 logger.info("🔧 FastAPI import 시도...")
 try:
-    from fastapi import FastAPI, Request, HTTPException
+    from fastapi import FastAPI, Request, HTTPException, Response
+    from fastapi.responses import JSONResponse
     from fastapi.middleware.cors import CORSMiddleware
     logger.info("✅ FastAPI import 완료")
 except Exception as e:
@@ -63,27 +66,35 @@ except Exception as e:
     logger.error(f"❌ 라우터 import 실패: {e}")
     raise
 
-# ---------- Database Initialization ----------
-logger.info("🗄️ 데이터베이스 초기화 시도...")
-try:
-    logger.info("📦 eripotter_common.database.base import 시도...")
-    from eripotter_common.database.base import Base
-    logger.info("✅ Base import 완료")
-    
-    logger.info("🔧 engine import 시도...")
-    from eripotter_common.database.base import engine
-    logger.info("✅ engine import 완료")
-    
-    logger.info("🏗️ 테이블 생성 시도...")
-    Base.metadata.create_all(bind=engine)
-    logger.info("✅ 데이터베이스 초기화 완료")
-except Exception as e:
-    logger.warning(f"⚠️ 데이터베이스 초기화 실패: {e}")
-    logger.warning(traceback.format_exc())
-
 # ---------- Include Routers ----------
 app.include_router(report_router)
 
+# ---------- Readiness ----------
+from .domain.service import readiness
+
+# ---------- Database Migration ----------
+# 테이블/함수/인덱스 생성은 요청 처리와 분리: 이미지 시작 시 docker-entrypoint.sh 가 먼저
+#   python -m app.domain.statement.report_migration
+# 을 실행하고 성공하면 RUN_DB_MIGRATIONS=0 으로 서버 시작.
+# 그 외(엔트리포인트 실패/미사용)는 기본값 1 → 시작 시 백그라운드로 실행 (완료 전 /ready 503)
+def _run_db_migrations():
+    try:
+        from .domain.statement.report_migration import migrate
+        migrate()
+        readiness.mark("db_migration", True)
+        logger.info("✅ 데이터베이스 마이그레이션 완료")
+    except Exception as e:
+        readiness.mark("db_migration", False, str(e)[:200])
+        logger.warning(f"⚠️ 데이터베이스 마이그레이션 실패: {e}")
+        logger.debug("Migration stacktrace:", exc_info=True)
+
+@app.on_event("startup")
+async def migrate_on_startup():
+    if os.getenv("RUN_DB_MIGRATIONS", "1") != "1":
+        return
+    readiness.require("db_migration")
+    threading.Thread(target=_run_db_migrations, daemon=True).start()
+
 # ---------- RAG Embedder Warm-up (콜드스타트 제거) ----------
 def _warmup_rag_embedder():
     """
@@ -95,18 +106,70 @@ def _warmup_rag_embedder():
         from .domain.service.rag_utils import RAGUtils
         rag = RAGUtils(collection_name="esg_manual")  # Qdrant 차원 기반으로 임베더 자동 선택
         _ = rag.encode(["warmup ping"])               # 임베더 로딩 트리거
+        readiness.mark("rag_warmup", True)
         logger.info("✅ RAG embedder warm-up completed")
     except Exception as e:
+        readiness.mark("rag_warmup", False, str(e)[:200])
         # 워밍업 실패해도 치명적이지 않으므로 경고만 남긴다.
         logger.warning(f"⚠️ RAG warm-up skipped: {e}")
         logger.debug("Warm-up stacktrace:", exc_info=True)
 
+def _preload_table_store():
+    """tables_gpt 표 HTML을 메모리 저장소에 미리 적재 (실패 시 lazy 로드로 동작)"""
+    try:
+        from .domain.service.table_store import get_table_store
+        get_table_store().load_all()
+    except Exception as e:
+        logger.warning(f"⚠️ 표 저장소 preload 실패: {e}")
+
+@app.on_event("startup")
+async def preload_tables_on_startup():
+    # 필요 시 비활성화: DISABLE_TABLE_PRELOAD=1
+    if os.getenv("DISABLE_TABLE_PRELOAD") == "1":
+        logger.info("⏭️ 표 저장소 preload disabled via env.")
+        return
+    threading.Thread(target=_preload_table_store, daemon=True).start()
+
+def _preload_indicator_catalog():
+    """kbz 지표 카탈로그를 메모리에 미리 적재 (실패 시 첫 조회 때 로드)"""
+    try:
+        from eripotter_common.database import get_session
+        from .domain.repository.report_repository import ReportRepository
+        from .domain.service.indicator_catalog import get_indicator_catalog
+        with get_session() as db:
+            get_indicator_catalog().snapshot(ReportRepository(db))
+        readiness.mark("indicator_catalog", True)
+    except Exception as e:
+        readiness.mark("indicator_catalog", False, str(e)[:200])
+        logger.warning(f"⚠️ 지표 카탈로그 preload 실패: {e}")
+
+@app.on_event("startup")
+async def preload_indicator_catalog_on_startup():
+    # 필요 시 비활성화: DISABLE_INDICATOR_CATALOG_PRELOAD=1
+    if os.getenv("DISABLE_INDICATOR_CATALOG_PRELOAD") == "1":
+        logger.info("⏭️ 지표 카탈로그 preload disabled via env.")
+        return
+    readiness.require("indicator_catalog")
+    threading.Thread(target=_preload_indicator_catalog, daemon=True).start()
+
+@app.on_event("startup")
+async def start_vector_mirror_on_startup():
+    # VECTOR_MIRROR=1 일 때만 로컬 벡터 미러 로드/동기화 스레드 시작
+    try:
+        from .domain.service.vector_mirror import start_mirror_sync
+        start_mirror_sync()
+    except Exception as e:
+        logger.warning(f"⚠️ 벡터 미러 시작 실패: {e}")
+
 @app.on_event("startup")
 async def warmup_on_startup():
     # 필요 시 비활성화: DISABLE_RAG_WARMUP=1
     if os.getenv("DISABLE_RAG_WARMUP") == "1":
         logger.info("⏭️ RAG warm-up disabled via env.")
         return
+    # READY_REQUIRE_WARMUP=1 이면 임베더 로딩이 끝나야 /ready 통과 (첫 요청 콜드스타트 방지)
+    if os.getenv("READY_REQUIRE_WARMUP") == "1":
+        readiness.require("rag_warmup")
     # 논블로킹 백그라운드로 워밍업 실행 (부팅/헬스체크 지연 없음)
     threading.Thread(target=_warmup_rag_embedder, daemon=True).start()
 
@@ -123,29 +186,56 @@ def root():
             "POST /reports",
             "GET /reports/{topic}/{company_name}",
             "PUT /reports", 
+            "PATCH /reports",
             "DELETE /reports/{topic}/{company_name}",
+            "GET /reports/{topic}/{company_name}/revisions",
+            "GET /reports/{topic}/{company_name}/revisions/{revision}",
+            "GET /reports/{topic}/{company_name}/revisions/{revision}/diff",
             "POST /reports/complete",
             
             # 목록 조회
             "GET /reports/company/{company_name}",
             "GET /reports/company/{company_name}/type/{report_type}",
+            "GET /reports/company/{company_name}/page",
+            "GET /reports/company/{company_name}/type/{report_type}/page",
             "GET /reports/status/{company_name}",
             
             # ESG 매뉴얼 기반 지표 API
             "GET /reports/indicator/{indicator_id}/summary",
             "GET /reports/indicator/{indicator_id}/input-fields",
             "POST /reports/indicator/{indicator_id}/draft",
+            "POST /reports/indicator/{indicator_id}/draft/stream",
             "POST /reports/indicator/{indicator_id}/save",
             "GET /reports/indicator/{indicator_id}/data",
+            "PATCH /reports/indicator/{indicator_id}/data",
+            
+            # 일괄 초안 생성 잡
+            "POST /reports/bulk-drafts",
+            "GET /reports/bulk-drafts",
+            "GET /reports/bulk-drafts/{job_id}",
             
             # 지표 관리 API
             "GET /indicators",
             "GET /indicators/category/{category}",
+            "POST /indicators/catalog/refresh",
             "GET /indicators/{indicator_id}/fields",
             "POST /indicators/{indicator_id}/enhanced-draft",
+            "POST /indicators/{indicator_id}/enhanced-draft/stream",
+            "POST /indicators/{indicator_id}/draft-only/stream",
             
-            # 헬스체크
-            "GET /reports/health"
+            # RAG 진단
+            "GET /reports/rag/embedding-stats",
+            "GET /reports/llm/stats",
+            "POST /reports/rag/ingest",
+            "GET /reports/rag/ingest/{job_id}",
+            "GET /reports/rag/mirror",
+            "POST /reports/rag/mirror/sync",
+            
+            # 헬스체크 / 메트릭
+            "GET /health",
+            "GET /ready",
+            "GET /reports/health",
+            "GET /metrics"
         ]
     }
 
@@ -155,13 +245,34 @@ def health():
     logger.info("📡 Health Check 엔드포인트 호출됨")
     return {"status": "healthy", "service": "report-service"}
 
+# 준비 상태: 시작 작업(마이그레이션/지표 카탈로그/워밍업) 완료 + DB 연결 — 미준비 시 503
+@app.get("/ready", summary="Readiness Check")
+def ready():
+    state = readiness.snapshot()
+    return JSONResponse(status_code=200 if state["ready"] else 503, content={"service": "report-service", **state})
+
+# Prometheus 스크레이프 (report_stage_seconds, report_request_seconds)
+@app.get("/metrics", summary="Prometheus Metrics")
+def metrics():
+    content, media_type = metrics_payload()
+    return Response(content=content, headers={"Content-Type": media_type})
+
 # ---------- Middleware ----------
+from .domain.service.instrumentation import start_request, server_timing, observe_request, metrics_payload
+
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     logger.info(f"📥 요청: {request.method} {request.url.path} (클라이언트: {request.client.host if request.client else '-'})")
+    spans = start_request()
+    started = time.perf_counter()
     try:
         response = await call_next(request)
-        logger.info(f"📤 응답: {response.status_code}")
+        elapsed = time.perf_counter() - started
+        # 단계별 시간(db/embed/qdrant/tables/prompt/llm ...) → Server-Timing 헤더 (스트리밍 응답은 헤더 전송 시점까지)
+        response.headers["Server-Timing"] = server_timing(spans, elapsed)
+        route = request.scope.get("route")
+        observe_request(request.method, getattr(route, "path", "unmatched"), response.status_code, elapsed)
+        logger.info(f"📤 응답: {response.status_code} ({elapsed * 1000:.1f}ms)")
         return response
     except Exception as e:
         logger.error(f"❌ 요청 처리 중 오류: {e}")
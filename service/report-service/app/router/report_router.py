@@ -1,89 +1,211 @@
 """
 Report Router - ESG 매뉴얼 기반 보고서 API 라우팅
 """
-from fastapi import APIRouter, Depends, Request
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Request
+from starlette.concurrency import run_in_threadpool
 from ..domain.controller.report_controller import ReportController, get_report_controller
 from ..domain.model.report_model import (
     ReportCreateRequest, ReportCreateResponse,
     ReportGetResponse, ReportUpdateRequest, ReportUpdateResponse,
     ReportDeleteResponse, ReportListResponse, ReportCompleteRequest, ReportCompleteResponse,
-    IndicatorDraftRequest, IndicatorSaveRequest,
-    IndicatorListResponse, IndicatorInputFieldResponse, IndicatorDraftResponse
+    ReportPatchRequest, ReportPatchResponse,
+    ReportRevisionListResponse, ReportRevisionResponse, ReportRevisionDiffResponse,
+    ReportPageResponse,
+    IndicatorDraftRequest, IndicatorSaveRequest, IndicatorPatchRequest,
+    IndicatorListResponse, IndicatorInputFieldResponse, IndicatorDraftResponse,
+    BulkDraftRequest, BulkDraftJobResponse, BulkDraftJobListResponse,
+    ManualIngestRequest, ManualIngestJobResponse
 )
 
 router = APIRouter(tags=["reports"])
 
+# ===== 일괄 초안 생성 잡 API =====
+# /reports/{topic}/{company_name} 보다 먼저 등록해야 경로가 가로채이지 않음
+@router.post("/reports/bulk-drafts", response_model=BulkDraftJobResponse, status_code=202)
+async def start_bulk_draft_job(body: BulkDraftRequest, controller: ReportController = Depends(get_report_controller)):
+    """
+    회사 단위 지표 초안 일괄 생성 (지표 목록 또는 카테고리) - 잡 ID 즉시 반환
+    """
+    return await controller.start_bulk_draft_job(body)
+
+@router.get("/reports/bulk-drafts", response_model=BulkDraftJobListResponse)
+async def list_bulk_draft_jobs(company_name: Optional[str] = None, controller: ReportController = Depends(get_report_controller)):
+    return controller.list_bulk_draft_jobs(company_name)
+
+@router.get("/reports/bulk-drafts/{job_id}", response_model=BulkDraftJobResponse)
+async def get_bulk_draft_job(job_id: str, controller: ReportController = Depends(get_report_controller)):
+    """잡 진행률 및 지표별 상태 조회"""
+    return controller.get_bulk_draft_job(job_id)
+
+# RAG 진단 / LLM 통계 (/reports/{topic}/{company_name} 보다 먼저 등록)
+@router.get("/reports/rag/embedding-stats")
+async def get_embedding_stats(controller: ReportController = Depends(get_report_controller)):
+    """임베딩 배치 크기/대기 시간 통계"""
+    return controller.get_embedding_stats()
+
+@router.get("/reports/llm/stats")
+async def get_llm_stats(controller: ReportController = Depends(get_report_controller)):
+    """LLM 호출 대기(queue)/모델 시간, 재시도 통계"""
+    return controller.get_llm_stats()
+
+@router.post("/reports/rag/ingest", response_model=ManualIngestJobResponse, status_code=202)
+async def start_manual_ingest(body: ManualIngestRequest, controller: ReportController = Depends(get_report_controller)):
+    """ESG 매뉴얼 청크 파일 일괄 색인 (변경된 청크만, 체크포인트로 재개)"""
+    return controller.start_manual_ingest(body)
+
+@router.get("/reports/rag/ingest/{job_id}", response_model=ManualIngestJobResponse)
+async def get_manual_ingest_job(job_id: str, controller: ReportController = Depends(get_report_controller)):
+    return controller.get_manual_ingest_job(job_id)
+
+@router.get("/reports/rag/mirror")
+async def get_vector_mirror_status(controller: ReportController = Depends(get_report_controller)):
+    """로컬 벡터 미러 상태 (신선도, 포인트 수, 마지막 동기화)"""
+    return controller.get_vector_mirror_status()
+
+@router.post("/reports/rag/mirror/sync")
+def sync_vector_mirror(collection_name: str = "esg_manual", controller: ReportController = Depends(get_report_controller)):
+    """원격 컬렉션과 즉시 동기화 (변경 시 스냅샷 재구성)"""
+    return controller.sync_vector_mirror(collection_name)
+
 # 기본 CRUD
+# DB만 쓰는 핸들러는 def 로 두어 FastAPI가 threadpool에서 실행 (이벤트 루프 블로킹 방지)
 @router.post("/reports", response_model=ReportCreateResponse)
-async def create_report(request: ReportCreateRequest, controller: ReportController = Depends(get_report_controller)):
+def create_report(request: ReportCreateRequest, controller: ReportController = Depends(get_report_controller)):
     return controller.create_report(request)
 
 @router.get("/reports/{topic}/{company_name}", response_model=ReportGetResponse)
-async def get_report(topic: str, company_name: str, controller: ReportController = Depends(get_report_controller)):
+def get_report(topic: str, company_name: str, controller: ReportController = Depends(get_report_controller)):
     return controller.get_report(topic, company_name)
 
 @router.put("/reports", response_model=ReportUpdateResponse)
-async def update_report(request: ReportUpdateRequest, controller: ReportController = Depends(get_report_controller)):
+def update_report(request: ReportUpdateRequest, controller: ReportController = Depends(get_report_controller)):
     return controller.update_report(request)
 
+@router.patch("/reports", response_model=ReportPatchResponse)
+def patch_report(request: ReportPatchRequest, controller: ReportController = Depends(get_report_controller)):
+    """메타데이터 merge patch(RFC 7396) + 본문 추가/범위 치환 (자동 저장용, 변경분만 전송)"""
+    return controller.patch_report(request)
+
+# 본문 리비전 (delta 압축 저장, 임의 리비전 복원/비교)
+@router.get("/reports/{topic}/{company_name}/revisions", response_model=ReportRevisionListResponse)
+def list_report_revisions(topic: str, company_name: str, controller: ReportController = Depends(get_report_controller)):
+    return controller.list_report_revisions(topic, company_name)
+
+@router.get("/reports/{topic}/{company_name}/revisions/{revision}", response_model=ReportRevisionResponse)
+def get_report_revision(topic: str, company_name: str, revision: int, controller: ReportController = Depends(get_report_controller)):
+    return controller.get_report_revision(topic, company_name, revision)
+
+@router.get("/reports/{topic}/{company_name}/revisions/{revision}/diff", response_model=ReportRevisionDiffResponse)
+def diff_report_revisions(topic: str, company_name: str, revision: int, against: Optional[int] = None, controller: ReportController = Depends(get_report_controller)):
+    """against(기본: 직전 리비전) → revision unified diff"""
+    return controller.diff_report_revisions(topic, company_name, revision, against)
+
 @router.delete("/reports/{topic}/{company_name}", response_model=ReportDeleteResponse)
-async def delete_report(topic: str, company_name: str, controller: ReportController = Depends(get_report_controller)):
+def delete_report(topic: str, company_name: str, controller: ReportController = Depends(get_report_controller)):
     return controller.delete_report(topic, company_name)
 
 @router.post("/reports/complete", response_model=ReportCompleteResponse)
-async def complete_report(request: ReportCompleteRequest, controller: ReportController = Depends(get_report_controller)):
+def complete_report(request: ReportCompleteRequest, controller: ReportController = Depends(get_report_controller)):
     return controller.complete_report(request.topic, request.company_name)
 
 # 목록
 @router.get("/reports/company/{company_name}", response_model=ReportListResponse)
-async def get_reports_by_company(company_name: str, controller: ReportController = Depends(get_report_controller)):
+def get_reports_by_company(company_name: str, controller: ReportController = Depends(get_report_controller)):
     return controller.get_reports_by_company(company_name)
 
 @router.get("/reports/company/{company_name}/type/{report_type}", response_model=ReportListResponse)
-async def get_reports_by_type(company_name: str, report_type: str, controller: ReportController = Depends(get_report_controller)):
+def get_reports_by_type(company_name: str, report_type: str, controller: ReportController = Depends(get_report_controller)):
     return controller.get_reports_by_type(company_name, report_type)
 
+# 목록 페이지 (keyset 페이지네이션, content/metadata 제외, 선택적으로 상태별 개수)
+@router.get("/reports/company/{company_name}/page", response_model=ReportPageResponse)
+def list_reports_page(
+    company_name: str,
+    report_type: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: int = Query(50, ge=1),
+    cursor: Optional[str] = None,
+    include_counts: bool = False,
+    controller: ReportController = Depends(get_report_controller),
+):
+    """updated_at 최신순 페이지. 응답의 next_cursor 를 cursor 로 넘기면 다음 페이지"""
+    return controller.list_reports_page(company_name, report_type, status, limit, cursor, include_counts)
+
+@router.get("/reports/company/{company_name}/type/{report_type}/page", response_model=ReportPageResponse)
+def list_reports_page_by_type(
+    company_name: str,
+    report_type: str,
+    status: Optional[str] = None,
+    limit: int = Query(50, ge=1),
+    cursor: Optional[str] = None,
+    include_counts: bool = False,
+    controller: ReportController = Depends(get_report_controller),
+):
+    return controller.list_reports_page(company_name, report_type, status, limit, cursor, include_counts)
+
 @router.get("/reports/status/{company_name}")
-async def get_report_status(company_name: str, controller: ReportController = Depends(get_report_controller)):
+def get_report_status(company_name: str, controller: ReportController = Depends(get_report_controller)):
     return controller.get_report_status(company_name)
 
 # ESG 매뉴얼 기반 지표 API
 @router.get("/reports/indicator/{indicator_id}/summary")
 async def get_indicator_summary(indicator_id: str, controller: ReportController = Depends(get_report_controller)):
-    return controller.get_indicator_summary(indicator_id)
+    return await controller.get_indicator_summary(indicator_id)
 
 @router.get("/reports/indicator/{indicator_id}/input-fields")
 async def generate_input_fields(indicator_id: str, controller: ReportController = Depends(get_report_controller)):
-    return controller.generate_input_fields(indicator_id)
+    return await controller.generate_input_fields(indicator_id)
 
 @router.post("/reports/indicator/{indicator_id}/draft")
 async def generate_indicator_draft(indicator_id: str, body: IndicatorDraftRequest, controller: ReportController = Depends(get_report_controller)):
-    return controller.generate_indicator_draft(indicator_id, body.company_name, body.inputs)
+    return await controller.generate_indicator_draft(indicator_id, body.company_name, body.inputs)
+
+@router.post("/reports/indicator/{indicator_id}/draft/stream")
+async def stream_indicator_draft(indicator_id: str, body: IndicatorDraftRequest, controller: ReportController = Depends(get_report_controller)):
+    """초안 생성 SSE 스트리밍 (token 이벤트 → done 이벤트에 메타데이터)"""
+    return controller.stream_indicator_draft(indicator_id, body.company_name, body.inputs)
 
 @router.post("/reports/indicator/{indicator_id}/save")
-async def save_indicator_data(indicator_id: str, body: IndicatorSaveRequest, controller: ReportController = Depends(get_report_controller)):
+def save_indicator_data(indicator_id: str, body: IndicatorSaveRequest, controller: ReportController = Depends(get_report_controller)):
     return controller.save_indicator_data(indicator_id, body.company_name, body.inputs)
 
+@router.patch("/reports/indicator/{indicator_id}/data")
+def patch_indicator_data(indicator_id: str, body: IndicatorPatchRequest, controller: ReportController = Depends(get_report_controller)):
+    """변경된 입력값만 병합 저장 (null 은 삭제)"""
+    return controller.patch_indicator_data(indicator_id, body.company_name, body.inputs)
+
 @router.get("/reports/indicator/{indicator_id}/data")
-async def get_indicator_data(indicator_id: str, company_name: str, controller: ReportController = Depends(get_report_controller)):
+def get_indicator_data(indicator_id: str, company_name: str, controller: ReportController = Depends(get_report_controller)):
     return controller.get_indicator_data(indicator_id, company_name)
 
 # ===== 지표 관리 API =====
+# 인메모리 카탈로그에서 응답, ETag/If-None-Match 로 변경 없으면 304
 @router.get("/indicators", response_model=IndicatorListResponse)
-async def get_all_indicators(controller: ReportController = Depends(get_report_controller)):
-    return controller.get_all_indicators()
+def get_all_indicators(request: Request, controller: ReportController = Depends(get_report_controller)):
+    return controller.get_all_indicators(request.headers.get("if-none-match"))
 
 @router.get("/indicators/category/{category}", response_model=IndicatorListResponse)
-async def get_indicators_by_category(category: str, controller: ReportController = Depends(get_report_controller)):
-    return controller.get_indicators_by_category(category)
+def get_indicators_by_category(category: str, request: Request, controller: ReportController = Depends(get_report_controller)):
+    return controller.get_indicators_by_category(category, request.headers.get("if-none-match"))
+
+@router.post("/indicators/catalog/refresh")
+def refresh_indicator_catalog(controller: ReportController = Depends(get_report_controller)):
+    """지표 카탈로그 즉시 재로드 (kbz 테이블 수정 후 관리자 호출)"""
+    return controller.refresh_indicator_catalog()
 
 @router.get("/indicators/{indicator_id}/fields", response_model=IndicatorInputFieldResponse)
 async def get_indicator_with_recommended_fields(indicator_id: str, controller: ReportController = Depends(get_report_controller)):
-    return controller.get_indicator_with_recommended_fields(indicator_id)
+    return await controller.get_indicator_with_recommended_fields(indicator_id)
 
 @router.post("/indicators/{indicator_id}/enhanced-draft", response_model=IndicatorDraftResponse)
 async def generate_enhanced_draft(indicator_id: str, body: IndicatorDraftRequest, controller: ReportController = Depends(get_report_controller)):
-    return controller.generate_enhanced_draft(indicator_id, body.company_name, body.inputs)
+    return await controller.generate_enhanced_draft(indicator_id, body.company_name, body.inputs)
+
+@router.post("/indicators/{indicator_id}/enhanced-draft/stream")
+async def stream_enhanced_draft(indicator_id: str, body: IndicatorDraftRequest, controller: ReportController = Depends(get_report_controller)):
+    """향상된 초안 SSE 스트리밍 (향상된 초안 = 일반 초안 생성이므로 같은 스트림)"""
+    return controller.stream_indicator_draft(indicator_id, body.company_name, body.inputs)
 
 # ===== 개별 지표 처리 API (새로 추가) =====
 @router.post("/indicators/{indicator_id}/process", response_model=IndicatorDraftResponse)
@@ -95,7 +217,7 @@ async def process_single_indicator(
     """
     개별 지표 처리: 입력필드 생성 → 초안생성 (한 번에 처리)
     """
-    return controller.process_single_indicator(indicator_id, body.company_name, body.inputs)
+    return await controller.process_single_indicator(indicator_id, body.company_name, body.inputs)
 
 @router.get("/indicators/{indicator_id}/input-fields-only")
 @router.post("/indicators/{indicator_id}/input-fields-only")
@@ -106,7 +228,7 @@ async def get_indicator_input_fields_only(
     """
     개별 지표의 입력필드만 생성 (RAG 기반)
     """
-    return controller.generate_input_fields_only(indicator_id)
+    return await controller.generate_input_fields_only(indicator_id)
 
 @router.post("/indicators/{indicator_id}/draft-only", response_model=IndicatorDraftResponse)
 async def generate_indicator_draft_only(
@@ -117,38 +239,49 @@ async def generate_indicator_draft_only(
     """
     개별 지표의 초안만 생성 (입력된 데이터 기반)
     """
-    return controller.generate_indicator_draft_only(indicator_id, body.company_name, body.inputs)
+    return await controller.generate_indicator_draft_only(indicator_id, body.company_name, body.inputs)
+
+@router.post("/indicators/{indicator_id}/draft-only/stream")
+async def stream_indicator_draft_only(
+    indicator_id: str, 
+    body: IndicatorDraftRequest, 
+    controller: ReportController = Depends(get_report_controller)
+):
+    """
+    개별 지표의 초안만 SSE 스트리밍 (지표 미존재 시 error 이벤트)
+    """
+    return controller.stream_indicator_draft(indicator_id, body.company_name, body.inputs, require_indicator=True)
 
 # ===== 새로운 통일된 API 엔드포인트 =====
 # 프론트엔드에서 요청한 새로운 엔드포인트들
 @router.get("/indicator/{indicator_id}/input-fields")
 async def get_input_fields_new(indicator_id: str, controller: ReportController = Depends(get_report_controller)):
     """새로운 통일된 엔드포인트: 입력필드 조회"""
-    return controller.generate_input_fields(indicator_id)
+    return await controller.generate_input_fields(indicator_id)
 
 @router.post("/indicator/{indicator_id}/draft")
 async def generate_draft_new(indicator_id: str, company_name: str, request: Request, controller: ReportController = Depends(get_report_controller)):
     """새로운 통일된 엔드포인트: 초안 생성"""
     # 요청 바디에서 inputs를 직접 받음
     body = await request.json()
-    return controller.generate_indicator_draft(indicator_id, company_name, body)
+    return await controller.generate_indicator_draft(indicator_id, company_name, body)
 
 @router.post("/indicator/{indicator_id}/save")
 async def save_indicator_data_new(indicator_id: str, company_name: str, request: Request, controller: ReportController = Depends(get_report_controller)):
     """새로운 통일된 엔드포인트: 입력값 저장"""
     # 요청 바디에서 inputs를 직접 받음
     body = await request.json()
-    return controller.save_indicator_data(indicator_id, company_name, body)
+    return await run_in_threadpool(controller.save_indicator_data, indicator_id, company_name, body)
 
 @router.get("/indicator/{indicator_id}/data")
-async def get_indicator_data_new(indicator_id: str, company_name: str, controller: ReportController = Depends(get_report_controller)):
+def get_indicator_data_new(indicator_id: str, company_name: str, controller: ReportController = Depends(get_report_controller)):
     """새로운 통일된 엔드포인트: 입력값 조회"""
     return controller.get_indicator_data(indicator_id, company_name)
 
 @router.get("/indicator/{indicator_id}/summary")
 async def get_indicator_summary_new(indicator_id: str, controller: ReportController = Depends(get_report_controller)):
     """새로운 통일된 엔드포인트: 지표 요약"""
-    return controller.get_indicator_summary(indicator_id)
+    return await controller.get_indicator_summary(indicator_id)
 
 # 헬스체크
 @router.get("/reports/health")
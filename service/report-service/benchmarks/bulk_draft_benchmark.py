@@ -0,0 +1,117 @@
+"""
+일괄 초안 생성 잡 처리량 벤치마크 (LLM_BACKEND=stub, DB/Qdrant 없이)
+
+BulkDraftService 의 실행 경로(Semaphore 동시성 제한 + TokenBucket 속도 제한 + 공유 LLM 클라이언트)를
+그대로 쓰고, 검색/프롬프트 구성(_prepare)과 저장(_save)만 메모리 구현으로 바꿔 잡 1개를 끝까지 실행합니다.
+- items_per_sec: 처리 지표 수 / 잡 경과 시간
+- status: 잡 최종 상태 (--fail-every 로 지표 오류를 섞으면 partial, 전부 실패하면 failed)
+기대 상태와 다르면 종료 코드 1
+
+사용 예:
+    python benchmarks/bulk_draft_benchmark.py --items 40 --concurrency 8 --latency-ms 200
+    python benchmarks/bulk_draft_benchmark.py --items 40 --fail-every 5 --out /tmp/bulk.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+from typing import Any, Dict, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from langchain_core.messages import HumanMessage, SystemMessage  # noqa: E402
+
+from app.domain.service.bulk_draft_service import BulkDraftJob, BulkDraftService  # noqa: E402
+
+
+class InMemoryBulkDraftService(BulkDraftService):
+    """_prepare/_save 만 메모리 구현으로 바꾼 BulkDraftService (나머지 실행 경로는 그대로)"""
+
+    _jobs: Dict[str, BulkDraftJob] = {}
+    _tasks: Dict[str, asyncio.Task] = {}
+
+    def __init__(self, retrieval_ms: float, fail_every: int):
+        self.retrieval_ms = retrieval_ms
+        self.fail_every = fail_every
+        self.saved: Dict[str, str] = {}
+
+    async def _prepare(self, job: BulkDraftJob, indicator_id: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        await asyncio.sleep(self.retrieval_ms / 1000)
+        index = job.indicator_ids.index(indicator_id) + 1
+        if self.fail_every and index % self.fail_every == 0:
+            raise RuntimeError(f"주입된 검색 오류: {indicator_id}")
+        messages = [
+            SystemMessage(content="ESG 보고서 초안 작성"),
+            HumanMessage(content=f"{job.company_name} / {indicator_id} 초안"),
+        ]
+        return {}, {"messages": messages, "chunk_ids": [f"{indicator_id}-c1"]}
+
+    async def _save(self, job: BulkDraftJob, indicator_id: str, draft: str, inputs: Dict[str, Any]) -> Optional[int]:
+        self.saved[indicator_id] = draft
+        return len(self.saved)
+
+
+def _expected_status(items: int, fail_every: int) -> str:
+    failed = items // fail_every if fail_every else 0
+    if not failed:
+        return "completed"
+    return "failed" if failed == items else "partial"
+
+
+async def run(args) -> Dict[str, Any]:
+    service = InMemoryBulkDraftService(args.retrieval_ms, args.fail_every)
+    indicator_ids = [f"BENCH-{i:03d}" for i in range(1, args.items + 1)]
+    job = service.submit(
+        "벤치마크회사", indicator_ids, concurrency=args.concurrency, rate_per_minute=args.rate_per_minute,
+    )
+    await service._tasks[job.job_id]
+    snap = job.snapshot()
+    elapsed = snap["elapsed_seconds"] or 0.0
+    processed = snap["completed"] + snap["failed"] + snap["skipped"]
+    expected = _expected_status(args.items, args.fail_every)
+    llm_ms = [item["llm_ms"] for item in snap["items"] if "llm_ms" in item]
+    return {
+        "items": args.items,
+        "concurrency": job.concurrency,
+        "rate_per_minute": job.rate_per_minute,
+        "stub_latency_ms": float(os.environ["STUB_LLM_LATENCY_MS"]),
+        "retrieval_ms": args.retrieval_ms,
+        "elapsed_seconds": elapsed,
+        "items_per_sec": round(processed / elapsed, 2) if elapsed else None,
+        "saved": snap["completed"],
+        "failed": snap["failed"],
+        "avg_llm_ms": round(sum(llm_ms) / len(llm_ms), 1) if llm_ms else None,
+        "status": job.status,
+        "expected_status": expected,
+        "ok": job.status == expected and len(service.saved) == snap["completed"],
+    }
+
+
+def main(args) -> int:
+    # LLM 클라이언트/스텁은 첫 호출 시 생성되므로 실행 전에만 설정하면 됨
+    os.environ["LLM_BACKEND"] = "stub"
+    os.environ["STUB_LLM_LATENCY_MS"] = str(args.latency_ms)
+    os.environ.setdefault("LLM_MAX_CONCURRENCY", str(max(args.concurrency, 8)))
+    os.environ.setdefault("LLM_RATE_PER_MINUTE", "0")
+
+    result = asyncio.run(run(args))
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    return 0 if result["ok"] else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="일괄 초안 생성 잡 처리량 벤치마크 (스텁 LLM)")
+    parser.add_argument("--items", type=int, default=40, help="잡에 넣을 지표 수")
+    parser.add_argument("--concurrency", type=int, default=8, help="잡 동시성 (BULK_DRAFT_MAX_CONCURRENCY 이하)")
+    parser.add_argument("--rate-per-minute", type=float, default=6000, help="잡 속도 제한 (분당 LLM 호출)")
+    parser.add_argument("--latency-ms", type=float, default=200, help="스텁 LLM 응답 지연")
+    parser.add_argument("--retrieval-ms", type=float, default=20, help="검색/프롬프트 구성 지연 (모의)")
+    parser.add_argument("--fail-every", type=int, default=0, help="N번째 지표마다 오류 주입 (0이면 없음)")
+    parser.add_argument("--out", default=None, help="결과 JSON 저장 경로")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,107 @@
+"""
+동시성 점검 스크립트 (실행 중인 report-service 대상)
+
+초안 생성 요청 N개를 동시에 보내는 동안 가벼운 엔드포인트(/health, 지표 목록)의
+응답 지연(p50/p95)을 측정합니다. RAG/LLM 경로가 이벤트 루프를 막으면 가벼운 요청의
+p95가 초안 생성 시간만큼 늘어나므로, 기준치를 넘으면 종료 코드 1로 실패합니다.
+
+사용 예 (OpenAI 호출 없이 측정하려면 서버를 LLM_BACKEND=stub 으로 실행):
+    LLM_BACKEND=stub STUB_LLM_LATENCY_MS=2000 uvicorn app.main:app --port 8007
+    python benchmarks/concurrency_check.py --base-url http://localhost:8007 \\
+        --indicator KBZ-EN22 --company 테스트회사 --drafts 8 --max-p95-ms 300
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from typing import List
+
+import httpx
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+async def _draft(client: httpx.AsyncClient, args) -> float:
+    started = time.perf_counter()
+    resp = await client.post(
+        f"/reports/indicator/{args.indicator}/draft",
+        json={"company_name": args.company, "inputs": {}},
+    )
+    resp.raise_for_status()
+    return (time.perf_counter() - started) * 1000
+
+
+async def _probe(client: httpx.AsyncClient, paths: List[str], stop: asyncio.Event, interval: float) -> List[float]:
+    latencies: List[float] = []
+    while not stop.is_set():
+        for path in paths:
+            started = time.perf_counter()
+            resp = await client.get(path)
+            resp.raise_for_status()
+            latencies.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def main(args) -> int:
+    limits = httpx.Limits(max_connections=args.drafts + 4)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        # 기준선: 부하 없는 상태의 가벼운 요청 지연
+        idle_stop = asyncio.Event()
+        idle_task = asyncio.create_task(_probe(client, args.probe, idle_stop, args.interval))
+        await asyncio.sleep(1.0)
+        idle_stop.set()
+        idle = await idle_task
+
+        stop = asyncio.Event()
+        probe_task = asyncio.create_task(_probe(client, args.probe, stop, args.interval))
+        started = time.perf_counter()
+        drafts = await asyncio.gather(*(_draft(client, args) for _ in range(args.drafts)), return_exceptions=True)
+        wall_ms = (time.perf_counter() - started) * 1000
+        stop.set()
+        loaded = await probe_task
+
+    errors = [str(d) for d in drafts if isinstance(d, Exception)]
+    draft_ms = [d for d in drafts if not isinstance(d, Exception)]
+    result = {
+        "drafts": args.drafts,
+        "draft_errors": errors,
+        "draft_wall_ms": round(wall_ms, 1),
+        "draft_p50_ms": round(_percentile(draft_ms, 50), 1),
+        "draft_max_ms": round(max(draft_ms), 1) if draft_ms else None,
+        "probe_idle_p50_ms": round(_percentile(idle, 50), 1),
+        "probe_idle_p95_ms": round(_percentile(idle, 95), 1),
+        "probe_loaded_p50_ms": round(_percentile(loaded, 50), 1),
+        "probe_loaded_p95_ms": round(_percentile(loaded, 95), 1),
+        "probe_samples": len(loaded),
+        "max_p95_ms": args.max_p95_ms,
+    }
+    # 초안이 직렬 처리되면 wall ≈ 개별 시간 × N
+    if draft_ms:
+        result["draft_parallelism"] = round(sum(draft_ms) / wall_ms, 2)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+    if errors:
+        return 1
+    return 0 if result["probe_loaded_p95_ms"] <= args.max_p95_ms else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="report-service 동시성 점검")
+    parser.add_argument("--base-url", default="http://localhost:8007")
+    parser.add_argument("--indicator", default="KBZ-EN22")
+    parser.add_argument("--company", default="테스트회사")
+    parser.add_argument("--drafts", type=int, default=8, help="동시에 보낼 초안 생성 요청 수")
+    parser.add_argument("--probe", nargs="+", default=["/health", "/indicators"], help="지연을 측정할 GET 경로")
+    parser.add_argument("--interval", type=float, default=0.05, help="프로브 간격(초)")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--max-p95-ms", type=float, default=300.0, help="부하 중 프로브 p95 허용치")
+    sys.exit(asyncio.run(main(parser.parse_args())))
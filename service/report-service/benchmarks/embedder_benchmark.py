@@ -0,0 +1,126 @@
+"""
+임베더 백엔드 비교 (기준: bge-m3 fp32 SentenceTransformer)
+
+1) top-k 일치율: 픽스처 코퍼스를 기준 임베더로 색인한 상태(운영과 동일)에서
+   기준/후보 쿼리 벡터의 top-k chunk_id 가 얼마나 겹치는지 측정
+2) 단건 쿼리 임베딩 지연 p50/p95 (배치 1, 운영 쿼리 경로와 동일)
+3) 모델 로드 전후 RSS 증가량
+
+사용 예:
+    python benchmarks/embedder_benchmark.py --candidate bge-m3-int8 --k 5 --min-overlap 0.9
+일치율이 --min-overlap 미만이면 종료 코드 1
+"""
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+DEFAULT_FIXTURE = os.path.join(ROOT, "benchmarks", "fixtures", "esg_retrieval.json")
+
+
+def _rss_mb() -> float:
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1024 / 1024
+    except ImportError:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def _load(name: str):
+    from app.domain.service import rag_utils
+    os.environ["EMBEDDER"] = name
+    gc.collect()
+    before = _rss_mb()
+    started = time.perf_counter()
+    encode, dim, _ = rag_utils._get_embedder()
+    load_s = time.perf_counter() - started
+    encode(["warmup"])
+    return encode, {"load_seconds": round(load_s, 2), "rss_delta_mb": round(_rss_mb() - before, 1), "dim": dim}
+
+
+def _latency(encode, queries: List[str], repeat: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        for q in queries:
+            t = time.perf_counter()
+            encode([q])
+            samples.append((time.perf_counter() - t) * 1000)
+    samples.sort()
+    return {
+        "p50_ms": round(statistics.median(samples), 2),
+        "p95_ms": round(samples[int(0.95 * (len(samples) - 1))], 2),
+        "samples": len(samples),
+    }
+
+
+def _topk(corpus_vecs: np.ndarray, qvecs: np.ndarray, k: int) -> List[List[int]]:
+    scores = qvecs @ corpus_vecs.T
+    return [list(np.argsort(-row)[:k]) for row in scores]
+
+
+def main(args) -> int:
+    with open(args.fixture, "r", encoding="utf-8") as f:
+        fixture = json.load(f)
+    corpus = fixture["corpus"]
+    queries = [q["query"] for q in fixture["queries"]]
+
+    ref_encode, ref_info = _load(args.reference)
+    # 운영과 동일: 문서는 기준 임베더(encode)로 색인되어 있음
+    corpus_vecs = np.asarray(ref_encode([c["content"] for c in corpus]), dtype=np.float32)
+    ref_q = np.asarray(ref_encode(queries), dtype=np.float32)
+    ref_latency = _latency(ref_encode, queries, args.repeat)
+    del ref_encode
+    gc.collect()
+
+    cand_encode, cand_info = _load(args.candidate)
+    cand_q = np.asarray(cand_encode(queries), dtype=np.float32)
+    cand_latency = _latency(cand_encode, queries, args.repeat)
+
+    ref_top = _topk(corpus_vecs, ref_q, args.k)
+    cand_top = _topk(corpus_vecs, cand_q, args.k)
+    overlaps = [len(set(a) & set(b)) / args.k for a, b in zip(ref_top, cand_top)]
+    top1 = [a[0] == b[0] for a, b in zip(ref_top, cand_top)]
+    cosine = [float(np.dot(a, b)) for a, b in zip(ref_q, cand_q)]
+    disagreements = [
+        {"query": q, "reference": [corpus[i]["chunk_id"] for i in a], "candidate": [corpus[i]["chunk_id"] for i in b]}
+        for q, a, b in zip(queries, ref_top, cand_top) if set(a) != set(b)
+    ]
+
+    result = {
+        "k": args.k,
+        "queries": len(queries),
+        "overlap_at_k": round(sum(overlaps) / len(overlaps), 4),
+        "top1_agreement": round(sum(top1) / len(top1), 4),
+        "query_cosine_min": round(min(cosine), 4),
+        "query_cosine_mean": round(sum(cosine) / len(cosine), 4),
+        "reference": {"embedder": args.reference, **ref_info, **ref_latency},
+        "candidate": {"embedder": args.candidate, **cand_info, **cand_latency},
+        "speedup_p50": round(ref_latency["p50_ms"] / cand_latency["p50_ms"], 2) if cand_latency["p50_ms"] else None,
+        "disagreements": disagreements,
+        "min_overlap": args.min_overlap,
+    }
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0 if result["overlap_at_k"] >= args.min_overlap else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="임베더 백엔드 top-k 일치율/지연/메모리 비교")
+    parser.add_argument("--reference", default="bge-m3")
+    parser.add_argument("--candidate", default="bge-m3-int8")
+    parser.add_argument("--fixture", default=DEFAULT_FIXTURE)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5, help="쿼리별 지연 측정 반복 횟수")
+    parser.add_argument("--min-overlap", type=float, default=0.9)
+    sys.exit(main(parser.parse_args()))
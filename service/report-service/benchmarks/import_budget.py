@@ -0,0 +1,110 @@
+"""
+report-service 부팅 import 예산 점검 (python -X importtime)
+
+새 인터프리터에서 `import app.main` 을 실행해
+- 누적 import 시간과 상위 모듈 (cumulative 기준)
+- 부팅 시 로드되면 안 되는 무거운 모듈(LLM/RAG/임베더) 검출
+을 출력하고, 금지 모듈이 로드되었거나 --budget-ms 를 넘으면 종료 코드 1
+
+사용 예:
+    python benchmarks/import_budget.py
+    python benchmarks/import_budget.py --budget-ms 1500 --top 15 --out /tmp/import_budget.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 요청 처리 시점에만 필요한 모듈 (report_service / llm_client / rag_utils 에서 지연 import)
+FORBIDDEN = (
+    "langchain",
+    "langchain_core",
+    "langchain_openai",
+    "langsmith",
+    "openai",
+    "tiktoken",
+    "qdrant_client",
+    "sentence_transformers",
+    "transformers",
+    "torch",
+    "onnxruntime",
+    "numpy",
+)
+
+
+def measure(python: str, target: str) -> List[Dict[str, Any]]:
+    env = dict(os.environ)
+    env.setdefault("LOG_LEVEL", "WARNING")
+    proc = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {target}"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {target} 실패:\n{proc.stderr[-2000:]}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip())) // 2,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        })
+    return rows
+
+
+def run(args) -> Dict[str, Any]:
+    rows = measure(args.python, args.target)
+    total = next((r["cumulative_ms"] for r in rows if r["module"] == args.target), 0.0)
+    forbidden = sorted({
+        r["module"].split(".")[0] for r in rows
+        if r["module"].split(".")[0] in FORBIDDEN
+    })
+    top = sorted((r for r in rows if r["module"] != args.target), key=lambda r: r["cumulative_ms"], reverse=True)
+    return {
+        "target": args.target,
+        "total_ms": round(total, 1),
+        "budget_ms": args.budget_ms,
+        "modules": len(rows),
+        "forbidden_loaded": forbidden,
+        "top": [
+            {"module": r["module"], "cumulative_ms": round(r["cumulative_ms"], 1), "self_ms": round(r["self_ms"], 1)}
+            for r in top[:args.top]
+        ],
+    }
+
+
+def main(args) -> int:
+    result = run(args)
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    failed = False
+    if result["forbidden_loaded"]:
+        print(f"❌ 부팅 시 로드된 무거운 모듈: {', '.join(result['forbidden_loaded'])}", file=sys.stderr)
+        failed = True
+    if args.budget_ms and result["total_ms"] > args.budget_ms:
+        print(f"❌ import 시간 {result['total_ms']}ms > 예산 {args.budget_ms}ms", file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="report-service 부팅 import 시간/금지 모듈 점검")
+    parser.add_argument("--target", default="app.main")
+    parser.add_argument("--python", default=sys.executable)
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("IMPORT_BUDGET_MS", "2000")))
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--out", default=None, help="결과 JSON 저장 경로")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,264 @@
+"""
+오프라인 검색 품질/지연 벤치마크 (report RAG 파이프라인)
+
+네트워크 없이 운영 코드 경로를 그대로 실행합니다.
+- Qdrant: QDRANT_URL=:memory: 로컬 모드, 픽스처 코퍼스를 ManualIngestor로 색인
+- 임베더: 기본 EMBEDDER=hash (결정적 오프라인 임베더). 모델이 로컬 캐시에 있으면 --embedder bge-m3 등 지정
+- KBZ 지표: 픽스처의 indicators (지표 → 정답 chunk_id) 를 메모리 저장소로 제공
+- LLM: LLM_BACKEND=stub (STUB_LLM_LATENCY_MS = --llm-latency-ms)
+
+측정 항목 (JSON 출력)
+1) ReportService.search_indicator (벡터 + 어휘 RRF) 의 recall@k, MRR
+   + 같은 질의로 벡터/어휘 단독 검색 결과 (어느 쪽이 좋아지고 나빠졌는지 구분용)
+2) 자유 질의(queries) 하이브리드 검색 recall@k, MRR
+3) 검색 지연 p50/p95, 초안 생성(generate_indicator_draft) end-to-end 지연 p50/p95 및 단계별 p50
+
+사용 예:
+    python benchmarks/retrieval_benchmark.py --k 5 --min-recall 0.8 --min-mrr 0.7
+    python benchmarks/retrieval_benchmark.py --embedder bge-m3 --out /tmp/retrieval.json
+recall@k 또는 MRR이 기준치 미만이면 종료 코드 1
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+DEFAULT_FIXTURE = os.path.join(ROOT, "benchmarks", "fixtures", "esg_retrieval.json")
+KS = (1, 3, 5, 10)
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def _latency(samples: List[float]) -> Dict[str, float]:
+    return {
+        "p50_ms": round(_percentile(samples, 50), 2),
+        "p95_ms": round(_percentile(samples, 95), 2),
+        "samples": len(samples),
+    }
+
+
+def _quality(rankings: List[List[str]], relevants: List[List[str]]) -> Dict[str, float]:
+    """질의별 순위 목록(chunk_id) → 평균 recall@k, MRR"""
+    result: Dict[str, float] = {}
+    for k in KS:
+        recalls = [len(set(r[:k]) & set(rel)) / len(rel) for r, rel in zip(rankings, relevants)]
+        result[f"recall@{k}"] = round(sum(recalls) / len(recalls), 4)
+    rr = []
+    for ranking, rel in zip(rankings, relevants):
+        rank = next((i + 1 for i, cid in enumerate(ranking) if cid in rel), None)
+        rr.append(1 / rank if rank else 0.0)
+    result["mrr"] = round(sum(rr) / len(rr), 4)
+    return result
+
+
+def _configure_env(args):
+    """app 모듈 import 전에 오프라인 설정 (기존 환경변수보다 우선)"""
+    os.environ.update({
+        "QDRANT_URL": ":memory:",
+        "EMBEDDER": args.embedder,
+        "LLM_BACKEND": "stub",
+        "STUB_LLM_LATENCY_MS": str(args.llm_latency_ms),
+        "LLM_RATE_PER_MINUTE": "0",  # 공유 LLM 클라이언트 속도 제한이 지연 측정에 섞이지 않도록
+        "VECTOR_MIRROR": "0",
+        "RAG_DEBUG_SAMPLE_RATE": "0",
+        "HF_HUB_OFFLINE": "1",
+        "TRANSFORMERS_OFFLINE": "1",
+    })
+    if not args.tiktoken:
+        os.environ["TOKEN_COUNTER"] = "approx"
+    os.environ.setdefault("DOC_ROOT", tempfile.mkdtemp(prefix="retrieval-bench-"))
+
+
+class FixtureIndicatorRepository:
+    """KBZ 지표 조회만 제공하는 메모리 저장소 (ReportService.report_repository 대체, 지표 카탈로그도 이 저장소로 로드)"""
+
+    def __init__(self, indicators: List[Dict[str, Any]]):
+        self.indicators = {
+            ind["indicator_id"]: SimpleNamespace(
+                indicator_id=ind["indicator_id"],
+                title=ind["title"],
+                subcategory=ind.get("subcategory"),
+                category=ind.get("category"),
+                description=f"지표: {ind['title']}",
+                status="active",
+            )
+            for ind in indicators
+        }
+
+    def get_indicator_by_id(self, indicator_id: str):
+        return self.indicators.get(indicator_id)
+
+    def get_all_indicators(self):
+        return list(self.indicators.values())
+
+    def get_indicator_catalog_version(self) -> str:
+        return str(len(self.indicators))
+
+
+def _ingest(corpus: List[Dict[str, Any]]) -> Dict[str, Any]:
+    from app.domain.service.manual_ingest import ManualIngestor
+    from app.domain.service.rag_utils import get_qdrant_client
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "chunks.json")
+        with open(source, "w", encoding="utf-8") as f:
+            json.dump({"chunks": corpus}, f, ensure_ascii=False)
+        started = time.perf_counter()
+        stats = ManualIngestor(get_qdrant_client(), "esg_manual", upload_workers=1).run(source)
+    return {"chunks": stats.get("uploaded"), "seconds": round(time.perf_counter() - started, 3)}
+
+
+async def _run(args, fixture: Dict[str, Any]) -> Dict[str, Any]:
+    from app.domain.service.report_service import ReportService
+    from app.domain.service.lexical_index import reciprocal_rank_fusion
+    from app.domain.service.instrumentation import start_request, stage_timings
+
+    corpus = fixture["corpus"]
+    indicators = fixture["indicators"]
+    queries = fixture.get("queries", [])
+    top_k = max(KS)
+
+    ingest = _ingest(corpus)
+    service = ReportService(None)
+    service.report_repository = FixtureIndicatorRepository(indicators)
+    rag = service.esg_manual_rag
+
+    # 콜드 스타트(임베더 로드 + 어휘 인덱스 구성)는 별도 기록
+    started = time.perf_counter()
+    await service.search_indicator(indicators[0]["indicator_id"], limit=top_k)
+    cold_ms = (time.perf_counter() - started) * 1000
+
+    # 1) 지표 검색: 하이브리드(운영 경로) + 벡터/어휘 단독
+    rankings: Dict[str, List[List[str]]] = {"hybrid": [], "vector": [], "lexical": []}
+    search_ms: List[float] = []
+    for rep in range(args.repeat):
+        for ind in indicators:
+            start_request()
+            t = time.perf_counter()
+            docs = await service.search_indicator(ind["indicator_id"], limit=top_k)
+            search_ms.append((time.perf_counter() - t) * 1000)
+            if rep == 0:
+                rankings["hybrid"].append([d["chunk_id"] for d in docs])
+
+    for ind in indicators:
+        lexical_query = " ".join(dict.fromkeys(
+            q for q in (ind["indicator_id"], ind["title"], ind.get("subcategory")) if q
+        ))
+        vector = await rag.asearch_similar(ind["title"], limit=top_k)
+        lexical = await rag.asearch_lexical(lexical_query, limit=top_k)
+        rankings["vector"].append([d.get("chunk_id", "") for d in vector] if isinstance(vector, list) else [])
+        rankings["lexical"].append([d.get("chunk_id", "") for d in lexical])
+
+    relevants = [ind["relevant"] for ind in indicators]
+    by_retriever = {name: _quality(r, relevants) for name, r in rankings.items()}
+    misses = [
+        {"indicator_id": ind["indicator_id"], "relevant": ind["relevant"], "top": ranking[:args.k]}
+        for ind, ranking in zip(indicators, rankings["hybrid"])
+        if not set(ind["relevant"]) & set(ranking[:args.k])
+    ]
+
+    # 2) 자유 질의: 벡터 + 어휘 RRF (search_indicator와 같은 결합)
+    query_quality = None
+    if queries:
+        query_rankings = []
+        for q in queries:
+            vector, lexical = await asyncio.gather(
+                rag.asearch_similar(q["query"], limit=top_k),
+                rag.asearch_lexical(q["query"], limit=top_k),
+            )
+            fused = reciprocal_rank_fusion([("vector", vector if isinstance(vector, list) else []), ("lexical", lexical)])
+            query_rankings.append([d.get("chunk_id", "") for d in fused[:top_k]])
+        query_quality = {"queries": len(queries), **_quality(query_rankings, [q["relevant"] for q in queries])}
+
+    # 3) 초안 생성 end-to-end (검색 + 표 로드 + 프롬프트 + 스텁 LLM)
+    e2e_ms: List[float] = []
+    stages: Dict[str, List[float]] = {}
+    failures = 0
+    for _ in range(args.e2e_repeat):
+        for ind in indicators:
+            start_request()
+            t = time.perf_counter()
+            draft = await service.generate_indicator_draft(ind["indicator_id"], "벤치마크", {"비고": "오프라인 측정"})
+            e2e_ms.append((time.perf_counter() - t) * 1000)
+            if draft.startswith(("⚠️", "해당 지표에 대한 정보를 찾을 수 없습니다")):
+                failures += 1
+            for stage, ms in stage_timings().items():
+                stages.setdefault(stage, []).append(ms)
+
+    return {
+        "config": {
+            "embedder": args.embedder,
+            "embedder_loaded": rag.embedder_name,
+            "k": args.k,
+            "corpus": len(corpus),
+            "indicators": len(indicators),
+            "repeat": args.repeat,
+            "e2e_repeat": args.e2e_repeat,
+            "llm_latency_ms": args.llm_latency_ms,
+        },
+        "ingest": ingest,
+        "retrieval": by_retriever,
+        "queries": query_quality,
+        "latency": {
+            "cold_search_ms": round(cold_ms, 2),
+            "search": _latency(search_ms),
+            "draft_e2e": _latency(e2e_ms),
+            "draft_stages_p50_ms": {stage: round(_percentile(v, 50), 2) for stage, v in stages.items()},
+        },
+        "draft_failures": failures,
+        "misses_at_k": misses,
+    }
+
+
+def main(args) -> int:
+    _configure_env(args)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    with open(args.fixture, "r", encoding="utf-8") as f:
+        fixture = json.load(f)
+
+    result = asyncio.run(_run(args, fixture))
+    hybrid = result["retrieval"]["hybrid"]
+    result["thresholds"] = {"min_recall": args.min_recall, "min_mrr": args.min_mrr}
+    passed = (
+        hybrid[f"recall@{args.k}"] >= args.min_recall
+        and hybrid["mrr"] >= args.min_mrr
+        and result["draft_failures"] == 0
+    )
+    result["passed"] = passed
+
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="오프라인 검색 품질(recall@k, MRR)/지연 벤치마크")
+    parser.add_argument("--fixture", default=DEFAULT_FIXTURE)
+    parser.add_argument("--embedder", default="hash", help="hash | bge-m3 | bge-m3-int8 | minilm (모델은 로컬 캐시 필요)")
+    parser.add_argument("--k", type=int, default=5, choices=KS)
+    parser.add_argument("--repeat", type=int, default=5, help="지표 검색 지연 측정 반복 횟수")
+    parser.add_argument("--e2e-repeat", type=int, default=1, help="초안 생성 반복 횟수")
+    parser.add_argument("--llm-latency-ms", type=float, default=50)
+    parser.add_argument("--min-recall", type=float, default=0.0)
+    parser.add_argument("--min-mrr", type=float, default=0.0)
+    parser.add_argument("--tiktoken", action="store_true", help="tiktoken 사용 (인코딩 파일이 캐시에 있을 때)")
+    parser.add_argument("--out", default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--verbose", action="store_true")
+    sys.exit(main(parser.parse_args()))
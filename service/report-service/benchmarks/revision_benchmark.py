@@ -0,0 +1,190 @@
+"""
+보고서 리비전 저장 벤치마크 (revision_codec, DB 없이)
+
+픽스처 코퍼스 문장으로 초안(마크다운)을 만들고 리비전을 연속 저장한 뒤
+- 저장량: 전체 본문 사본 / zlib 전체 사본 / delta+스냅샷 저장량과 비율
+- 인코딩 지연 p50/p95 (저장 1회당)
+- 복원 지연 p50/p95 (임의 리비전, 스냅샷 + delta 체인 적용) 및 체인 길이
+- 복원 결과가 원본과 같은지 검증 (다르면 종료 코드 1)
+
+시나리오
+- edit: 사용자가 몇 줄씩 고치는 자동/수동 저장 (줄 교체/삽입/삭제 1~3개)
+- regenerate: LLM 재생성 (문단 일부 유지, 나머지 새 문장으로 교체)
+
+사용 예:
+    python benchmarks/revision_benchmark.py --revisions 100 --snapshot-every 10
+    python benchmarks/revision_benchmark.py --scenario regenerate --out /tmp/revision.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+DEFAULT_FIXTURE = os.path.join(ROOT, "benchmarks", "fixtures", "esg_retrieval.json")
+
+from app.domain.service import revision_codec  # noqa: E402
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def _latency(samples: List[float]) -> Dict[str, float]:
+    return {
+        "p50_ms": round(_percentile(samples, 50), 3),
+        "p95_ms": round(_percentile(samples, 95), 3),
+        "samples": len(samples),
+    }
+
+
+def _sentences(fixture: Dict[str, Any]) -> List[str]:
+    sentences = []
+    for chunk in fixture["corpus"]:
+        for part in str(chunk.get("content", "")).replace("\n", " ").split(". "):
+            part = part.strip()
+            if len(part) > 10:
+                sentences.append(part.rstrip(".") + ".")
+    return sentences
+
+
+def _initial_draft(rng: random.Random, sentences: List[str], sections: int) -> str:
+    lines = []
+    for s in range(1, sections + 1):
+        lines.append(f"## {s}. {rng.choice(sentences)[:30]}")
+        for _ in range(rng.randint(3, 6)):
+            lines.append(" ".join(rng.sample(sentences, 2)))
+        lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+def _edit(rng: random.Random, text: str, sentences: List[str]) -> str:
+    lines = text.splitlines()
+    for _ in range(rng.randint(1, 3)):
+        i = rng.randrange(len(lines))
+        action = rng.random()
+        if action < 0.6:
+            lines[i] = lines[i] + " " + rng.choice(sentences) if rng.random() < 0.5 else rng.choice(sentences)
+        elif action < 0.85:
+            lines.insert(i, rng.choice(sentences))
+        elif len(lines) > 5:
+            del lines[i]
+    return "\n".join(lines) + "\n"
+
+
+def _regenerate(rng: random.Random, text: str, sentences: List[str], keep: float) -> str:
+    paragraphs = text.split("\n\n")
+    out = []
+    for p in paragraphs:
+        if rng.random() < keep:
+            out.append(p)
+        else:
+            heading = p.splitlines()[0] if p.startswith("##") else ""
+            body = [" ".join(rng.sample(sentences, 2)) for _ in range(rng.randint(3, 6))]
+            out.append("\n".join(([heading] if heading else []) + body))
+    return "\n\n".join(out)
+
+
+def run(args) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    with open(args.fixture, "r", encoding="utf-8") as f:
+        sentences = _sentences(json.load(f))
+
+    texts = [_initial_draft(rng, sentences, args.sections)]
+    for _ in range(args.revisions - 1):
+        if args.scenario == "edit":
+            texts.append(_edit(rng, texts[-1], sentences))
+        else:
+            texts.append(_regenerate(rng, texts[-1], sentences, args.keep))
+
+    # 저장: ReportRevisionService.record 와 같은 규칙 (직전 리비전 대비, since_snapshot 기준 스냅샷)
+    stored: List[Tuple[str, bytes]] = []
+    encode_ms: List[float] = []
+    since_snapshot = -1
+    for i, text in enumerate(texts):
+        started = time.perf_counter()
+        kind, data = revision_codec.encode_revision(texts[i - 1] if i else None, text, since_snapshot, args.snapshot_every)
+        encode_ms.append((time.perf_counter() - started) * 1000)
+        stored.append((kind, data))
+        since_snapshot = 0 if kind == revision_codec.SNAPSHOT else since_snapshot + 1
+
+    # 복원: 대상 이하 마지막 스냅샷부터 체인 적용 (ReportRevisionRepository.get_chain 과 같은 범위)
+    snapshots = [i for i, (kind, _) in enumerate(stored) if kind == revision_codec.SNAPSHOT]
+    reconstruct_ms: List[float] = []
+    chain_lengths: List[int] = []
+    mismatches = 0
+    targets = list(range(len(texts))) * args.repeat
+    rng.shuffle(targets)
+    for target in targets:
+        start = max(s for s in snapshots if s <= target)
+        started = time.perf_counter()
+        text = revision_codec.reconstruct(stored[start:target + 1])
+        reconstruct_ms.append((time.perf_counter() - started) * 1000)
+        chain_lengths.append(target - start)
+        if text != texts[target]:
+            mismatches += 1
+
+    raw_bytes = sum(len(t.encode("utf-8")) for t in texts)
+    zlib_full_bytes = sum(len(revision_codec.compress_text(t)) for t in texts)
+    stored_bytes = sum(len(data) for _, data in stored)
+    return {
+        "config": {
+            "scenario": args.scenario,
+            "revisions": args.revisions,
+            "snapshot_every": args.snapshot_every,
+            "sections": args.sections,
+            "keep": args.keep if args.scenario == "regenerate" else None,
+            "seed": args.seed,
+        },
+        "document": {
+            "avg_chars": round(sum(len(t) for t in texts) / len(texts)),
+            "avg_bytes": round(raw_bytes / len(texts)),
+        },
+        "storage": {
+            "raw_full_copies_bytes": raw_bytes,
+            "zlib_full_copies_bytes": zlib_full_bytes,
+            "stored_bytes": stored_bytes,
+            "snapshots": len(snapshots),
+            "deltas": len(stored) - len(snapshots),
+            "ratio_vs_raw": round(stored_bytes / raw_bytes, 4),
+            "ratio_vs_zlib": round(stored_bytes / zlib_full_bytes, 4),
+        },
+        "latency": {
+            "encode": _latency(encode_ms),
+            "reconstruct": _latency(reconstruct_ms),
+            "max_chain_deltas": max(chain_lengths),
+        },
+        "mismatches": mismatches,
+    }
+
+
+def main(args) -> int:
+    result = run(args)
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    return 0 if result["mismatches"] == 0 else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="보고서 리비전 delta 저장량/복원 지연 벤치마크")
+    parser.add_argument("--fixture", default=DEFAULT_FIXTURE)
+    parser.add_argument("--scenario", default="edit", choices=("edit", "regenerate"))
+    parser.add_argument("--revisions", type=int, default=100)
+    parser.add_argument("--snapshot-every", type=int, default=int(os.getenv("REPORT_REVISION_SNAPSHOT_EVERY", "10")))
+    parser.add_argument("--sections", type=int, default=8, help="초안 섹션 수 (문서 크기)")
+    parser.add_argument("--keep", type=float, default=0.6, help="regenerate 시 유지되는 문단 비율")
+    parser.add_argument("--repeat", type=int, default=3, help="리비전별 복원 측정 반복 횟수")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", default=None, help="결과 JSON 저장 경로")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,107 @@
+"""
+로컬 OpenAI 호환 스텁 서버 (/v1/chat/completions, 일반/스트리밍)
+
+실제 HTTP 경로(공유 커넥션 풀, 재시도, 타임아웃)를 OpenAI 없이 점검할 때 사용합니다.
+장애 주입: --fail-rate 비율로 --fail-status(기본 429, Retry-After 포함) 응답
+
+사용 예:
+    python benchmarks/stub_openai_server.py --port 8900 --latency-ms 500 --fail-rate 0.2
+    OPENAI_BASE_URL=http://localhost:8900/v1 OPENAI_API_KEY=stub uvicorn app.main:app --port 8007
+    curl localhost:8900/stats   # 수신 요청 수/최대 동시 요청 수/주입한 오류 수
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+def create_app(latency_ms: float, fail_rate: float, fail_status: int, chunks: int) -> FastAPI:
+    app = FastAPI(title="Stub OpenAI")
+    state = {"requests": 0, "in_flight": 0, "max_in_flight": 0, "failures": 0}
+
+    def _reply(body: dict) -> str:
+        prompt = "\n".join(str(m.get("content", "")) for m in body.get("messages", []))
+        digest = hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:12]
+        return f"## 1. 개요\n스텁 응답입니다. (prompt={digest}, {len(prompt)}자)\n"
+
+    @app.get("/stats")
+    def stats():
+        return state
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        state["requests"] += 1
+        if random.random() < fail_rate:
+            state["failures"] += 1
+            return JSONResponse(
+                {"error": {"message": "stub injected failure", "type": "rate_limit_error"}},
+                status_code=fail_status,
+                headers={"retry-after": "0.1"},
+            )
+
+        created = int(time.time())
+        text = _reply(body)
+        model = body.get("model", "stub")
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+
+        if not body.get("stream"):
+            try:
+                await asyncio.sleep(latency_ms / 1000)
+            finally:
+                state["in_flight"] -= 1
+            return {
+                "id": f"chatcmpl-stub-{created}",
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": len(text), "completion_tokens": len(text), "total_tokens": 2 * len(text)},
+            }
+
+        async def events():
+            try:
+                size = max(1, -(-len(text) // chunks))
+                for i in range(0, len(text), size):
+                    await asyncio.sleep(latency_ms / 1000 / chunks)
+                    delta = {"content": text[i:i + size]}
+                    if i == 0:
+                        delta["role"] = "assistant"
+                    chunk = {
+                        "id": f"chatcmpl-stub-{created}", "object": "chat.completion.chunk", "created": created,
+                        "model": model, "choices": [{"index": 0, "delta": delta, "finish_reason": None}],
+                    }
+                    yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+                done = {
+                    "id": f"chatcmpl-stub-{created}", "object": "chat.completion.chunk", "created": created,
+                    "model": model, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                }
+                yield f"data: {json.dumps(done)}\n\n"
+                yield "data: [DONE]\n\n"
+            finally:
+                state["in_flight"] -= 1
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로컬 OpenAI 호환 스텁 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--fail-status", type=int, default=429)
+    parser.add_argument("--chunks", type=int, default=20)
+    args = parser.parse_args()
+
+    import uvicorn
+    uvicorn.run(create_app(args.latency_ms, args.fail_rate, args.fail_status, args.chunks),
+                host=args.host, port=args.port, log_level="warning")
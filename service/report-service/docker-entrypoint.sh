@@ -0,0 +1,17 @@
+#!/bin/sh
+# report-service 컨테이너 시작: DB 마이그레이션(테이블/함수/인덱스, 반복 실행 안전) 후 서버 실행
+# - 성공하면 부팅 시 백그라운드 마이그레이션 생략 (RUN_DB_MIGRATIONS=0)
+# - 실패하면(DB 미준비 등) 서버는 그대로 시작하고 부팅 시 백그라운드로 다시 시도 (/ready 는 완료 전 503)
+# - SKIP_ENTRYPOINT_MIGRATION=1 이면 이 단계 생략 (별도 릴리스 단계에서 실행하는 환경)
+set -e
+
+if [ "${SKIP_ENTRYPOINT_MIGRATION:-0}" != "1" ]; then
+    if python -m app.domain.statement.report_migration; then
+        export RUN_DB_MIGRATIONS=0
+    else
+        echo "⚠️ report 마이그레이션 실패: 서비스 시작 후 백그라운드로 재시도" >&2
+        export RUN_DB_MIGRATIONS=1
+    fi
+fi
+
+exec "$@"
@@ -0,0 +1,35 @@
+"""
+bge-m3 → ONNX int8 임베더 생성 스크립트 (EMBEDDER=bge-m3-int8 용)
+
+필요 패키지(생성 시에만): torch, transformers, onnx, onnxruntime
+    pip install onnx onnxruntime
+    python export_onnx_embedder.py --out models/bge-m3-onnx
+
+생성 후 top-k 일치율/지연 확인:
+    python benchmarks/embedder_benchmark.py --candidate bge-m3-int8
+"""
+import argparse
+import logging
+import os
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="bge-m3 ONNX int8 내보내기")
+    parser.add_argument("--model", default="BAAI/bge-m3")
+    parser.add_argument("--out", default=None, help="출력 디렉토리 (기본 ONNX_EMBEDDER_DIR 또는 ./models/bge-m3-onnx)")
+    parser.add_argument("--opset", type=int, default=17)
+    parser.add_argument("--keep-fp32", action="store_true", help="중간 fp32 ONNX 보존")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    from app.domain.service.onnx_embedder import export_quantized
+    path = export_quantized(args.model, args.out, opset=args.opset, keep_fp32=args.keep_fp32)
+    print(path)
+
+
+if __name__ == "__main__":
+    main()
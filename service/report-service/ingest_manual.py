@@ -0,0 +1,60 @@
+"""
+ESG 매뉴얼 청크 일괄 색인 스크립트
+
+사용 예:
+    python ingest_manual.py chunks/esg_manual.jsonl --collection esg_manual
+    python ingest_manual.py chunks/ --force                    # 해시 비교 없이 전체 재색인
+    python ingest_manual.py chunks/ --qdrant-url :memory:      # 로컬 인메모리 모드로 점검
+
+중단되면 같은 명령으로 다시 실행하면 체크포인트 이후부터 이어서 진행합니다.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+from dotenv import load_dotenv
+
+# 환경변수 로드
+load_dotenv()
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ESG 매뉴얼 청크 일괄 색인")
+    parser.add_argument("source", help="청크 파일(.jsonl/.json) 또는 디렉토리")
+    parser.add_argument("--collection", default="esg_manual")
+    parser.add_argument("--checkpoint", default=None, help="체크포인트 파일 (기본: {source}.{collection}.checkpoint.json)")
+    parser.add_argument("--force", action="store_true", help="content_hash 비교 없이 전체 재색인")
+    parser.add_argument("--batch", type=int, default=None, help="임베딩 배치 크기 (기본 INGEST_EMBED_BATCH=64)")
+    parser.add_argument("--workers", type=int, default=None, help="업로드 워커 수 (기본 INGEST_UPLOAD_WORKERS=2)")
+    parser.add_argument("--qdrant-url", default=None, help="QDRANT_URL 덮어쓰기 (:memory: 가능)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    if args.qdrant_url:
+        os.environ["QDRANT_URL"] = args.qdrant_url
+
+    from app.domain.service.manual_ingest import (
+        ManualIngestor, COLLECTION_NAME_RE, DEFAULT_EMBED_BATCH, DEFAULT_UPLOAD_WORKERS,
+    )
+    from app.domain.service.rag_utils import get_qdrant_client
+
+    # 기본 체크포인트 경로에 컬렉션 이름이 들어가므로 API 와 같은 규칙으로 검증
+    if not COLLECTION_NAME_RE.fullmatch(args.collection):
+        parser.error(f"--collection 은 영문/숫자/_/- 만 허용됩니다: {args.collection!r}")
+    checkpoint = args.checkpoint or f"{args.source.rstrip('/')}.{args.collection}.checkpoint.json"
+    ingestor = ManualIngestor(
+        get_qdrant_client(),
+        args.collection,
+        embed_batch=args.batch or DEFAULT_EMBED_BATCH,
+        upload_workers=args.workers or DEFAULT_UPLOAD_WORKERS,
+    )
+    stats = ingestor.run(args.source, checkpoint_path=checkpoint, force=args.force)
+    print(json.dumps(stats, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()